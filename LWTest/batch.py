@@ -0,0 +1,246 @@
+# batch.py
+"""Runs a full ATP cycle for one test record without the GUI.
+
+configure -> link check -> readings -> persistence -> save, driven by the same collector modules
+as the main window but with no Qt widgets, so one machine can script many benches."""
+import logging
+import time
+from typing import Callable, Dict, List, Optional, Sequence, Tuple, Union
+
+from LWTest.collector.common.constants import ReadingType
+from LWTest.collector.configure import phaseangle, raw
+from LWTest.collector.configure.serial import ConfigureSerialNumbers, SerialNumberForm
+from LWTest.collector.read.electric import DataReader
+from LWTest.collector.read.operational import FirmwareVersionReader, ReportingDataReader
+from LWTest.collector.read.persistence import PersistenceComparator
+from LWTest.collector.session import CollectorSession, CollectorURLs, SessionScheduler
+from LWTest.collector.state import probes
+from LWTest.constants import lwt
+from LWTest.sensor import SensorLog
+from LWTest.spreadsheet import spreadsheet
+from LWTest.utilities import file_utils, misc, trace
+from LWTest.utilities.oscomp import QSettingsAdapter
+from LWTest.utilities.wait import WaitTimeout, wait_until
+from LWTest.web.interface import form
+from LWTest.web.interface.page import Page, Submit
+from LWTest.workers import link
+
+_logger = logging.getLogger(__name__)
+
+VOLTAGE_RANGES = {"high": DataReader.HIGH_RANGE, "low": DataReader.LOW_RANGE}
+
+
+class BatchError(Exception):
+    pass
+
+
+class BatchRun:
+    """'voltage' ("high" or "low") settles the test voltage when the readings can not,
+    without it an undetermined voltage stops the run.
+
+    The persistence step waits for the collector to be power cycled, by the operator or by
+    whatever switches the bench, then compares the advanced configuration readings."""
+    POLL_INTERVAL = lwt.TimeOut.LINK_PAGE_LOAD_INTERVAL.value
+
+    def __init__(self, record_path: str, session: Optional[CollectorSession] = None, *,
+                 voltage: Optional[str] = None, room_temperature: float = 21.7, check_persistence: bool = True):
+        self._record_path = record_path
+        self._session = session or CollectorSession(
+            record_path, password=QSettingsAdapter.value("main/config_password")
+        )
+        self._voltage = voltage
+        self._check_persistence = check_persistence
+
+        self.sensor_log.room_temperature = room_temperature
+
+    @property
+    def sensor_log(self) -> SensorLog:
+        return self._session.sensor_log
+
+    @property
+    def steps(self) -> List[Tuple[str, Callable[[], None]]]:
+        steps = [
+            ("configure", self._configure),
+            ("link check", self._check_links),
+            ("readings", self._take_readings),
+            ("persistence", self._verify_persistence),
+            ("save", self._save),
+        ]
+        return [step for step in steps if self._check_persistence or step[0] != "persistence"]
+
+    def run(self) -> bool:
+        self.sensor_log.create_all(spreadsheet.get_serial_numbers(self._record_path))
+        _logger.info(f"batch run of '{self._record_path}' on {self._session} "
+                     f"for sensors {self.sensor_log.get_serial_numbers_as_tuple()}")
+
+        name = ""
+        try:
+            for name, step in self.steps:
+                _logger.info(f"batch step: {name}")
+                with trace.span(name, "batch", record=self._record_path):
+                    step()
+        except BatchError as e:
+            _logger.error(f"batch run of '{self._record_path}' failed at {name}: {e}")
+            return False
+        finally:
+            self._session.close()
+
+        _logger.info(f"batch run of '{self._record_path}' finished")
+        return True
+
+    # -- steps ---
+
+    def _configure(self):
+        # the browser is only launched when an http configuration fails
+        urls, password, session = self._session.urls, self._session.password, self._session
+        serial_numbers = self.sensor_log.get_serial_numbers_as_list()
+        try:
+            SerialNumberForm(misc.ensure_six_numbers(serial_numbers), password, urls.configuration).configure()
+        except form.FormError as e:
+            _logger.warning(f"unable to configure the serial numbers over http ({e}), using the browser")
+            configured, error_msg = ConfigureSerialNumbers(
+                misc.ensure_six_numbers(serial_numbers), password, session.browser, urls.configuration
+            ).configure()
+            if not configured:
+                raise BatchError(error_msg)
+
+        verifier = link.SerialNumberUpdateVerifier(tuple(serial_numbers), urls.modem_status)
+        updated = []
+        # noinspection PyUnresolvedReferences
+        verifier.serial_numbers_updated.connect(lambda: updated.append(True))
+        verifier.verify()
+        if not updated:
+            raise BatchError("timed out verifying serial number update")
+
+        try:
+            raw.update_advanced_configuration(password, urls.temperature, urls.raw_configuration,
+                                              urls.voltage_ride_through)
+        except form.FormError as e:
+            _logger.warning(f"unable to update the advanced configuration over http ({e}), using the browser")
+            raw.do_advanced_configuration(session.browser, Page, [
+                Submit.create_submit_button_for_temperature_config(password),
+                Submit.create_submit_button_for_raw_config(password),
+                Submit.create_submit_button_for_voltage_ride_through(password)
+            ], urls.temperature, urls.raw_configuration, urls.voltage_ride_through)
+
+        try:
+            phaseangle.update_phase_angle(password, urls.configuration)
+        except form.FormError as e:
+            _logger.warning(f"unable to configure the correction angle over http ({e}), using the browser")
+            if not phaseangle.configure_phase_angle(urls.configuration, session.browser, Page,
+                                                    Submit.create_submit_button_for_phase_angle(password)):
+                raise BatchError("unable to configure the correction angle")
+
+    def _check_links(self):
+        poller = link.ModemStatusPoller(self._session.urls.modem_status)
+        # noinspection PyUnresolvedReferences
+        poller.polled.connect(self._record_rssi)
+
+        end_time = time.time() + lwt.TimeOut.LINK_CHECK.value
+        while (unlinked := self.sensor_log.unlinked) and time.time() < end_time:
+            poller.poll(tuple(unlinked))
+            if self.sensor_log.unlinked:
+                time.sleep(self.POLL_INTERVAL)
+
+        if not self.sensor_log.linked:
+            raise BatchError("no sensors linked")
+
+        if unlinked := self.sensor_log.unlinked:
+            _logger.warning(f"sensors {unlinked} did not link")
+
+        urls = self._session.urls
+        readers = (self._create_link_data_reader(FirmwareVersionReader(urls.software_upgrade), ReadingType.FIRMWARE),
+                   self._create_link_data_reader(ReportingDataReader(urls.sensor_data), ReadingType.REPORTING))
+        with self.sensor_log.transaction():
+            for serial_number in self.sensor_log.linked:
+                for reader in readers:
+                    reader.read(self.sensor_log[serial_number].phase, self._session.http_driver)
+
+    def _take_readings(self):
+        urls = self._session.urls
+        data_reader = DataReader(urls.sensor_data, urls.raw_configuration, self._resolve_undetermined_range)
+        received = []
+        # noinspection PyUnresolvedReferences
+        data_reader.readings.connect(self.sensor_log.save)
+        # noinspection PyUnresolvedReferences
+        data_reader.readings.connect(lambda _, kind: received.append(kind))
+        # noinspection PyUnresolvedReferences
+        data_reader.page_load_error.connect(lambda: received.append(None))
+
+        with self.sensor_log.transaction():
+            data_reader.read(self._session.http_driver)
+
+        if None in received:
+            raise BatchError("unable to retrieve readings")
+        if not received:
+            raise BatchError("unable to determine the test voltage, use --voltage")
+
+    def _verify_persistence(self):
+        url = self._session.urls.raw_configuration
+        reachable = probes.page_reachable(url, timeout=lwt.TimeOut.URL_REQUEST.value)
+
+        _logger.info("waiting for the collector to be power cycled")
+        self._wait_for(lambda: not reachable(), lwt.TimeOut.COLLECTOR_POWER_OFF_TIME.value,
+                       "the collector was not powered off")
+        self._wait_for(reachable, lwt.TimeOut.COLLECTOR_BOOT_WAIT_TIME.value, "the collector did not boot")
+
+        comparator = PersistenceComparator()
+        # noinspection PyUnresolvedReferences
+        comparator.persisted.connect(self.sensor_log.save)
+        comparator.compare(self.sensor_log.get_advanced_readings(), url, self._session.http_driver)
+
+    def _save(self):
+        high_refs, low_refs = self.sensor_log.references if self.sensor_log.have_references else ((), ())
+        log_file_path = file_utils.create_log_filename(self._record_path,
+                                                       self.sensor_log.get_serial_numbers_as_tuple())
+        # the results are written even when the log files can not be downloaded, either way in one save
+        with spreadsheet.XMLTestRecord(self._record_path) as record:
+            record.save_test_results(spreadsheet.package_test_results(self.sensor_log),
+                                     (self.sensor_log.room_temperature, high_refs, low_refs))
+            if (result := file_utils.download_log_files(log_file_path, url=self._session.urls.log_files)).success:
+                record.record_log_files_attached()
+
+        if not result.success:
+            raise BatchError(f"unable to download the log files: {result.error}")
+
+    # -- helpers ---
+
+    def _create_link_data_reader(self, reader, reading_type: ReadingType):
+        # noinspection PyUnresolvedReferences
+        reader.update.connect(
+            lambda phase, value: self.sensor_log.save(
+                value, reading_type, serial_number=self.sensor_log.get_sensor_by_phase(phase).serial_number
+            )
+        )
+        return reader
+
+    def _record_rssi(self, results: dict):
+        with self.sensor_log.transaction():
+            for serial_number, value in results.items():
+                self.sensor_log.save(value, ReadingType.RSSI, serial_number)
+
+    def _resolve_undetermined_range(self) -> Union[str, int]:
+        return VOLTAGE_RANGES.get(self._voltage, "QUIT")
+
+    def _wait_for(self, condition: Callable[[], bool], timeout: float, message: str):
+        try:
+            wait_until(condition, timeout, self.POLL_INTERVAL)
+        except WaitTimeout:
+            raise BatchError(message)
+
+
+def run_batches(record_paths: Sequence[str], collectors: Sequence[str] = (), **options) -> Dict[str, bool]:
+    """Runs a batch for each record in parallel, the n-th record on the n-th collector address.
+    Records without an address use the default collector. Returns each record's success."""
+    password = QSettingsAdapter.value("main/config_password")
+    sessions = [
+        CollectorSession(path, CollectorURLs.for_host(collectors[index]) if index < len(collectors) else None, password)
+        for index, path in enumerate(record_paths)
+    ]
+
+    def job(session: CollectorSession) -> bool:
+        with trace.session(session.name):
+            return BatchRun(session.name, session, **options).run()
+
+    results = SessionScheduler().run(sessions, job)
+    return {name: bool(result) for name, result in results.items()}
@@ -1,11 +1,25 @@
-def get_columns(driver):
-    return 6 if "phase 4" in driver.page_source.lower() else 3
+from typing import List, Optional
+
+from LWTest.utilities import trace
+
+# reads a property of every matched element inside the browser so a scrape costs one round trip
+_BULK_ATTRIBUTE_SCRIPT = "return Array.from(document.querySelectorAll(arguments[0]), e => e[arguments[1]]);"
 
 
 def get_elements(selector, driver):
     return driver.find_elements_by_css_selector(selector)
 
 
+def get_attribute_values(selector, attribute, driver) -> List[Optional[str]]:
+    """Returns the 'attribute' ('textContent', 'value', ...) of every element matching 'selector'."""
+    with trace.span("scrape", "dom", selector=selector):
+        if hasattr(driver, "execute_script"):
+            return driver.execute_script(_BULK_ATTRIBUTE_SCRIPT, selector, attribute)
+
+        # drivers that parse the page locally have no round trip to save
+        return [element.get_attribute(attribute) for element in get_elements(selector, driver)]
+
+
 def enter_constants(fields, value):
     for field in fields:
         set_field(field, value)
@@ -1,10 +1,18 @@
+from typing import Optional
+
+import requests
 from selenium import webdriver
 
 from LWTest.collector.common import helpers
 from LWTest.collector.configure.raw import _logger, PHASE_ANGLE_SELECTOR, _PHASE_ANGLE
+from LWTest.utilities import trace
+from LWTest.web.interface import form
 from LWTest.web.interface import page as webpage
 
+_CORRECTION_ANGLE_PREFIX = "correction_angle"
+
 
+@trace.traced("phase angle configuration", "configure")
 def configure_phase_angle(url: str, driver: webdriver.Chrome, page_loader, submit_button: webpage.Submit) -> bool:
     """Enters the Phase Angle displayed on the Yokogawa
     into the Correction Angle fields on the Configuration page."""
@@ -15,3 +23,27 @@ def configure_phase_angle(url: str, driver: webdriver.Chrome, page_loader, submi
     submit_button.click(driver)
 
     return True
+
+
+@trace.traced("phase angle update", "configure")
+def update_phase_angle(password: str, url: str, session: Optional[requests.Session] = None) -> bool:
+    """Sets the same Correction Angles as configure_phase_angle with one POST of the Configuration form.
+    Returns False when they already hold the Phase Angle and nothing was submitted.
+
+    Raises form.FormError when the form can not be read or submitted, the caller can fall back
+    to configure_phase_angle."""
+    configuration = form.fetch(url, session)
+    if not (names := configuration.names("text", _CORRECTION_ANGLE_PREFIX)):
+        raise form.FormError(f"no correction angle fields on '{url}'")
+
+    if not (changes := form.changed_fields(configuration.fields, {name: _PHASE_ANGLE for name in names})):
+        _logger.debug("phase angle correction factor already set")
+        return False
+
+    _logger.debug("setting phase angle correction factor")
+    for name, value in changes.items():
+        configuration.set(name, value)
+    configuration.set_password(password)
+    form.submit(configuration, session)
+
+    return True
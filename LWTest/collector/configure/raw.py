@@ -1,12 +1,16 @@
 import logging
-from time import sleep
-from typing import List
+from typing import Dict, List, Optional
 
+import requests
 from selenium import webdriver
 
 import LWTest.web.interface.page as webpage
 from LWTest.collector.common import helpers
+from LWTest.collector.state import probes
 from LWTest.constants import dom, lwt
+from LWTest.utilities import trace
+from LWTest.utilities.wait import WaitTimeout, wait_until
+from LWTest.web.interface import form
 
 _logger = logging.getLogger(__name__)
 
@@ -29,26 +33,43 @@ _PHASE_ANGLE = "25.8"
 _NUMBER_OF_VOLTAGE_TEMPERATURE_SCALE_FIELDS = 6
 _NUMBER_OF_FIELDS_TO_SKIP = 6
 
-
-def do_advanced_configuration(driver: webdriver.Chrome, page_loader, submit_buttons: List[webpage.Submit]) -> None:
+# raw configuration field name prefix -> value, one field per phase
+_RAW_CONFIGURATION_VALUES = (
+    ("scaleCurrent", _SCALE_CURRENT),
+    ("scaleVoltage", _SCALE_VOLTAGE),
+    ("scaleRaw", _SCALE_RAW_TEMP),
+    ("offsetRaw", _OFFSET_RAW_TEMP),
+    ("correctionAngle", _CORRECTION_ANGLE),
+    ("correctionVoltageScale", _CORRECTION_VOLTAGE_SCALE),
+    ("fault10k", _FAULT_10K),
+    ("fault25k", _FAULT_25K),
+)
+_CALIBRATION_FACTOR_NAME = "calib"
+
+
+@trace.traced("advanced configuration", "configure")
+def do_advanced_configuration(driver: webdriver.Chrome, page_loader, submit_buttons: List[webpage.Submit],
+                              temperature_url: str = lwt.URL_TEMPERATURE,
+                              raw_configuration_url: str = lwt.URL_RAW_CONFIGURATION,
+                              voltage_ride_through_url: str = lwt.URL_VOLTAGE_RIDE_THROUGH) -> None:
     temperature_button, raw_config_button, ride_through_button = submit_buttons
 
-    page_loader.get(lwt.URL_TEMPERATURE, driver)
+    page_loader.get(temperature_url, driver)
 
     # url, function, submit button
     operations = [
         [
-            lwt.URL_TEMPERATURE,
+            temperature_url,
             _set_temperature_configuration_values,
             temperature_button
         ],
         [
-            lwt.URL_RAW_CONFIGURATION,
+            raw_configuration_url,
             _set_raw_configuration_values,
             raw_config_button
         ],
         [
-            lwt.URL_VOLTAGE_RIDE_THROUGH,
+            voltage_ride_through_url,
             _set_collector_calibration_factor,
             ride_through_button
         ]
@@ -58,12 +79,82 @@ def do_advanced_configuration(driver: webdriver.Chrome, page_loader, submit_butt
         page_loader.get(url, driver)
         config_func(driver)
         submit_button.click(driver)
-        sleep(lwt.TimeOut.TIME_BETWEEN_CONFIGURATION_PAGES.value)
+        _wait_for_collector(url)
+
+
+@trace.traced("advanced configuration update", "configure")
+def update_advanced_configuration(password: str,
+                                  temperature_url: str = lwt.URL_TEMPERATURE,
+                                  raw_configuration_url: str = lwt.URL_RAW_CONFIGURATION,
+                                  voltage_ride_through_url: str = lwt.URL_VOLTAGE_RIDE_THROUGH,
+                                  session: Optional[requests.Session] = None) -> int:
+    """Sets the same constants as do_advanced_configuration over HTTP, reading each page first
+    and only submitting the pages holding a value that differs. Returns the number of pages submitted.
+
+    Raises form.FormError when a page can not be read or submitted, the caller can fall back
+    to do_advanced_configuration."""
+    pages = (
+        (temperature_url, _temperature_targets),
+        (raw_configuration_url, _raw_configuration_targets),
+        (voltage_ride_through_url, _calibration_factor_targets),
+    )
+
+    submitted = 0
+    for url, targets in pages:
+        page = form.fetch(url, session)
+        if not (changes := form.changed_fields(page.fields, targets(page))):
+            _logger.debug(f"'{url}' already configured")
+            continue
+
+        _logger.debug(f"updating {len(changes)} fields on '{url}'")
+        for name, value in changes.items():
+            page.set(name, value)
+        page.set_password(password)
+        form.submit(page, session)
+        submitted += 1
+
+        try:
+            with trace.span("wait for values to persist", "wait"):
+                wait_until(probes.values_persisted(url, changes, session),
+                           lwt.TimeOut.TIME_BETWEEN_CONFIGURATION_PAGES.value)
+        except WaitTimeout:
+            raise form.FormError(f"'{url}' did not save the new values")
+
+    return submitted
 
 
 # -- private module functions ---
 
 
+def _temperature_targets(page: form.Form) -> Dict[str, str]:
+    names = page.names("text")
+    targets = {name: _VOLTAGE_TEMPERATURE_SCALE for name in names[:_NUMBER_OF_VOLTAGE_TEMPERATURE_SCALE_FIELDS]}
+    targets.update({name: _REMAINING_TEMPERATURE_FIELDS_CONFIGURATION_VALUE
+                    for name in names[_NUMBER_OF_FIELDS_TO_SKIP:]})
+    return targets
+
+
+def _raw_configuration_targets(page: form.Form) -> Dict[str, str]:
+    return {name: value for prefix, value in _RAW_CONFIGURATION_VALUES for name in page.names("number", prefix)}
+
+
+def _calibration_factor_targets(page: form.Form) -> Dict[str, str]:
+    names = [name for name in page.names("text") if _CALIBRATION_FACTOR_NAME in name.lower()]
+    if not names:
+        raise form.FormError("no calibration factor field on the voltage ride through page")
+    return {names[0]: _VOLTAGE_RIDE_THROUGH_CALIBRATION_FACTOR}
+
+
+def _wait_for_collector(url: str) -> None:
+    # the collector is ready for the next page once it serves pages again after saving,
+    # TIME_BETWEEN_CONFIGURATION_PAGES is now only the longest it is given
+    try:
+        with trace.span("wait for collector", "wait"):
+            wait_until(probes.page_reachable(url), lwt.TimeOut.TIME_BETWEEN_CONFIGURATION_PAGES.value)
+    except WaitTimeout:
+        _logger.debug(f"collector still busy after submitting '{url}', going on")
+
+
 def _set_temperature_configuration_values(driver: webdriver.Chrome) -> None:
     _logger.debug("setting temperature constants")
     fields = driver.find_elements_by_css_selector(TEMPERATURE_SELECTOR)
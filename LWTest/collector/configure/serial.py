@@ -1,18 +1,36 @@
-from time import sleep
+import logging
+from typing import Optional
 
+import requests
 from selenium import webdriver
 
 import LWTest.constants.dom as dom
+from LWTest.collector.state import probes, topology
+from LWTest.utilities import trace
+from LWTest.utilities.wait import WaitTimeout, wait_until
+from LWTest.web.interface import form
 from LWTest.web.interface.page import Page
 
+_logger = logging.getLogger(__name__)
+
+# Configuration page input names: the serial number fields are listed in notes.txt, the frequency radio
+# and the voltage ride through checkbox are the inputs dom.configuration_frequency and dom.voltage_ride_through
+# locate. SerialNumberForm checks the live form has them before posting.
+SERIAL_NUMBER_PREFIX = "serial_num_"
+FREQUENCY_FIELD = "frequency"
+VOLTAGE_RIDE_THROUGH_FIELD = "singlephase"
+
 
 class ConfigureSerialNumbers:
+    SAVE_TIMEOUT = 5
+
     def __init__(self, serial_numbers, password, browser, url):
         self._serial_numbers = serial_numbers
         self._password = password
         self._browser: webdriver.Chrome = browser
         self._url = url
 
+    @trace.traced("serial number configuration", "configure")
     def configure(self):
         if (result := Page.get(self._url, self._browser)) == Page.SUCCESS:
             self._setup_collector()
@@ -31,7 +49,13 @@ class ConfigureSerialNumbers:
         self._select_60_hertz()
         self._disable_use_of_voltage_ride_through()
         self._submit_configuration()
-        sleep(1)
+        topology.invalidate(self._url)
+        try:
+            with trace.span("wait for configuration page", "wait"):
+                wait_until(probes.elements_show(self._browser, dom.serial_number_elements, self._serial_numbers),
+                           self.SAVE_TIMEOUT)
+        except WaitTimeout:
+            _logger.debug("the configuration page did not reload showing the serial numbers")
 
     def _disable_use_of_voltage_ride_through(self):
         vrt = self._browser.find_element_by_xpath(dom.voltage_ride_through)
@@ -50,3 +74,51 @@ class ConfigureSerialNumbers:
     def _submit_configuration(self):
         self._browser.find_element_by_xpath(dom.configuration_password).send_keys(self._password)
         self._browser.find_element_by_xpath(dom.configuration_save_changes).click()
+
+
+class SerialNumberForm:
+    """Configures the serial numbers with one POST of the Configuration form, no browser involved.
+
+    The form is read first so the fields LWTest leaves alone (correction angles...) are sent back
+    as they are, then read again until it shows the new serial numbers.
+
+    configure raises form.FormError when the form is not what it expects or the collector does not
+    save the serial numbers, the caller can fall back to ConfigureSerialNumbers."""
+    FREQUENCY = "60"  # value of the 60 Hz radio button, dom.configuration_frequency
+    SAVE_TIMEOUT = ConfigureSerialNumbers.SAVE_TIMEOUT
+
+    def __init__(self, serial_numbers, password, url, session: Optional[requests.Session] = None):
+        self._serial_numbers = serial_numbers
+        self._password = password
+        self._url = url
+        self._session = session
+
+    @trace.traced("serial number configuration", "configure")
+    def configure(self) -> None:
+        configuration = form.fetch(self._url, self._session)
+        serial_number_fields = configuration.names("text", SERIAL_NUMBER_PREFIX)
+        if len(serial_number_fields) != len(self._serial_numbers):
+            raise form.FormError(f"expected {len(self._serial_numbers)} serial number fields on '{self._url}', "
+                                 f"found {len(serial_number_fields)}")
+        for field, type_ in ((FREQUENCY_FIELD, "radio"), (VOLTAGE_RIDE_THROUGH_FIELD, "checkbox")):
+            if field not in configuration.names(type_):
+                raise form.FormError(f"no {type_} named '{field}' on '{self._url}'")
+
+        expected = dict(zip(serial_number_fields, self._serial_numbers))
+        for field, serial_number in expected.items():
+            configuration.set(field, serial_number)
+        configuration.set(FREQUENCY_FIELD, self.FREQUENCY)
+        configuration.uncheck(VOLTAGE_RIDE_THROUGH_FIELD)
+        configuration.set_password(self._password)
+
+        form.submit(configuration, self._session)
+
+        # the new serial numbers may change how many phases the collector shows
+        topology.invalidate(self._url)
+        try:
+            with trace.span("wait for serial numbers to persist", "wait"):
+                wait_until(probes.values_persisted(self._url, expected, self._session), self.SAVE_TIMEOUT)
+        except WaitTimeout:
+            raise form.FormError("the collector did not save the serial numbers")
+
+        _logger.info(f"configured serial numbers {self._serial_numbers}")
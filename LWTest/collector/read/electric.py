@@ -1,28 +1,44 @@
 from functools import partial
-from typing import Union, List
+from typing import Callable, List, Optional, Union
 
 from PyQt6.QtCore import QObject, pyqtSignal
-from PyQt6.QtWidgets import QMessageBox
 from selenium import webdriver
 
 import LWTest.utilities.misc as utils_misc
 import LWTest.constants.lwt_constants as lwt
 from LWTest.collector.common.constants import ADVANCED_CONFIG_SELECTOR, READING_SELECTOR, ReadingType
 from LWTest.collector.common import helpers
+from LWTest.collector.state import topology
+from LWTest.utilities import trace
+from LWTest.web.interface.httpdriver import HTTPDriver
 
 
-def _confirm(message, box_type=QMessageBox.question, title="") -> int:
-    return box_type(None, title, message, QMessageBox.Yes | QMessageBox.No, QMessageBox.No)
+def _confirm(message, box_type="question", title="") -> bool:
+    # imported here so headless runs never load the widgets
+    from PyQt6.QtWidgets import QMessageBox
+
+    buttons = QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No
+    answer = getattr(QMessageBox, box_type)(None, title, message, buttons, QMessageBox.StandardButton.No)
+    return answer == QMessageBox.StandardButton.Yes
 
 
 _confirm_high_range = partial(_confirm, "Unable to determine test voltage.\n\nIs test voltage set to 13800KV?")
 _confirm_continue = partial(
     _confirm,
     "Continuing will overwrite any existing entries for test voltage 13800KV.\n\nAre you sure?",
-    QMessageBox.warning
+    "warning"
 )
 
 
+def ask_operator_for_range() -> Union[str, int]:
+    if _confirm_high_range():
+        if not _confirm_continue():
+            return "QUIT"
+        return DataReader.HIGH_RANGE
+
+    return DataReader.LOW_RANGE
+
+
 class DataReader(QObject):
     page_load_error = pyqtSignal()
     readings = pyqtSignal(tuple, int)
@@ -32,33 +48,38 @@ class DataReader(QObject):
     _HIGH_REAL_POWER_THRESHOLD = 1_000_000.0
     _PERCENTAGE_HIGH_VOLTAGE_READINGS = 66.0
 
-    _HIGH_RANGE = 1
-    _UNDETERMINED_RANGE = 0
-    _LOW_RANGE = -1
+    HIGH_RANGE = 1
+    UNDETERMINED_RANGE = 0
+    LOW_RANGE = -1
 
-    def __init__(self, sensor_data_url: str, raw_config_url: str) -> None:
+    def __init__(self, sensor_data_url: str, raw_config_url: str,
+                 resolve_undetermined_range: Optional[Callable[[], Union[str, int]]] = None) -> None:
+        """'resolve_undetermined_range' decides the test voltage when the readings do not,
+        returning HIGH_RANGE, LOW_RANGE or "QUIT". By default the operator is asked."""
         super().__init__()
         self._sensor_data_url = sensor_data_url
         self._raw_configuration_url = raw_config_url
+        self._resolve_undetermined_range = resolve_undetermined_range or ask_operator_for_range
         self._columns = None
 
-    def read(self, driver: webdriver.Chrome):
+    @trace.traced("readings", "collector")
+    def read(self, driver: Union[webdriver.Chrome, HTTPDriver]):
         driver.get(self._sensor_data_url)
         if "Auto Update" not in driver.page_source:
             self.page_load_error.emit()
             return
 
-        self._columns = helpers.get_columns(driver)
-        readings = helpers.get_elements(READING_SELECTOR, driver)
+        self._columns = topology.phase_count(driver)
+        readings = helpers.get_attribute_values(READING_SELECTOR, "textContent", driver)
         voltage, current, power_factor, real_power = self._get_sensor_readings(readings, self._columns)
         real_power = DataReader._replace_real_power_readings_with_massaged_readings(real_power)
         temperature = DataReader._get_temperature_readings(readings, self._columns)
 
         readings_list_lists = [voltage, current, power_factor, real_power]
-        if (range_ := DataReader._resolve_undetermined_state(self._readings_range(readings_list_lists))) == "QUIT":
+        if (range_ := self._resolve_undetermined_state(self._readings_range(readings_list_lists))) == "QUIT":
             return
 
-        if range_ == self._HIGH_RANGE:
+        if range_ == self.HIGH_RANGE:
             self.readings.emit(tuple(voltage), ReadingType.HIGH_VOLTAGE)
             self.readings.emit(tuple(current), ReadingType.HIGH_CURRENT)
             self.readings.emit(tuple(power_factor), ReadingType.HIGH_POWER_FACTOR)
@@ -66,7 +87,7 @@ class DataReader(QObject):
         else:  # these readings gathered only when low voltage is dialed in
             driver.get(self._raw_configuration_url)
 
-            readings = helpers.get_elements(ADVANCED_CONFIG_SELECTOR, driver)
+            readings = helpers.get_attribute_values(ADVANCED_CONFIG_SELECTOR, "value", driver)
             scale_current, scale_voltage, correction_angle = DataReader._get_advanced_readings(
                 readings, self._columns
             )
@@ -95,7 +116,7 @@ class DataReader(QObject):
             [real_power_index, real_power_index + columns]
         ]
 
-        values = [DataReader._scrape_readings(readings, "textContent", start, stop)
+        values = [DataReader._scrape_readings(readings, start, stop)
                   for start, stop in reading_slice_indexes]
 
         voltage_list = values[0]
@@ -115,14 +136,12 @@ class DataReader(QObject):
             [correction_angle_index, correction_angle_index + columns]
         ]
 
-        return [DataReader._scrape_readings(readings, "value", start, stop)
+        return [DataReader._scrape_readings(readings, start, stop)
                 for start, stop in reading_slice_indexes]
 
     @staticmethod
     def _scrape_temperature_readings(readings, columns):
-        return DataReader._scrape_readings(
-            readings, "textContent", len(readings) - columns, len(readings)
-        )
+        return DataReader._scrape_readings(readings, len(readings) - columns, len(readings))
 
     @staticmethod
     def _get_advanced_readings(readings, columns: int):
@@ -172,28 +191,22 @@ class DataReader(QObject):
         total_readings = len(voltage) + len(current) + len(real_power)
         percentage = number_of_high_range_readings / total_readings * 100
         if percentage == 50.0:
-            return DataReader._UNDETERMINED_RANGE
+            return DataReader.UNDETERMINED_RANGE
         elif percentage > 50.0:
-            return DataReader._HIGH_RANGE
+            return DataReader.HIGH_RANGE
 
-        return DataReader._LOW_RANGE
+        return DataReader.LOW_RANGE
 
     @staticmethod
     def _replace_real_power_readings_with_massaged_readings(power_readings):
         return DataReader._massage_real_power_readings(power_readings)
 
-    @staticmethod
-    def _resolve_undetermined_state(range_) -> Union[str, int]:
-        if range_ == DataReader._UNDETERMINED_RANGE:
-            if _confirm_high_range() == QMessageBox.Yes:
-                if _confirm_continue() == QMessageBox.No:
-                    return "QUIT"
-                return DataReader._HIGH_RANGE
-            else:
-                return DataReader._LOW_RANGE
+    def _resolve_undetermined_state(self, range_) -> Union[str, int]:
+        if range_ == DataReader.UNDETERMINED_RANGE:
+            return self._resolve_undetermined_range()
 
         return range_
 
     @staticmethod
-    def _scrape_readings(readings, attribute: str, start: int, stop: int) -> List[str]:
-        return [value.get_attribute(attribute) for value in readings[start:stop]]
+    def _scrape_readings(readings: List[str], start: int, stop: int) -> List[str]:
+        return list(readings[start:stop])
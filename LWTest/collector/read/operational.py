@@ -7,6 +7,7 @@ from selenium.webdriver.common.by import By
 from selenium.webdriver.support import expected_conditions as ec
 from selenium.webdriver.support.ui import WebDriverWait
 
+from LWTest.collector.common import helpers
 from LWTest.constants import lwt
 
 
@@ -20,9 +21,10 @@ class Reader(QObject):
     URL = ""
     WAIT_TIME = 10
 
-    def __init__(self):
+    def __init__(self, url: str = ""):
         super().__init__()
         self._logger = logging.getLogger(__name__)
+        self._url = url or self.URL
 
     def read(self, phase: int, driver: webdriver.Chrome):
         return self._get_data(phase, driver)
@@ -34,16 +36,16 @@ class Reader(QObject):
 
     def _get_data(self, phase: int, driver: webdriver.Chrome):
         try:
-            elements = self._get_elements(self.SELECTOR, self.RANGE_, driver)
-            return elements[phase].get_attribute(self.ATTRIBUTE)
+            values = self._get_values(self.SELECTOR, self.RANGE_, driver)
+            return values[phase]
         except TimeoutException:
             return lwt.NO_DATA
 
-    def _get_elements(self, selector: str, range_: slice, driver: webdriver.Chrome):
-        driver.get(self.URL)
-        elements = WebDriverWait(driver, self.WAIT_TIME).until(
+    def _get_values(self, selector: str, range_: slice, driver: webdriver.Chrome):
+        driver.get(self._url)
+        WebDriverWait(driver, self.WAIT_TIME).until(
             ec.presence_of_all_elements_located((By.CSS_SELECTOR, selector)))
-        return elements[range_]
+        return helpers.get_attribute_values(selector, self.ATTRIBUTE, driver)[range_]
 
 
 class ReportingDataReader(Reader):
@@ -5,6 +5,8 @@ from selenium import webdriver
 
 from LWTest.collector.common import helpers
 from LWTest.collector.common.constants import ADVANCED_CONFIG_SELECTOR, ReadingType
+from LWTest.collector.state import topology
+from LWTest.utilities import trace
 
 
 class PersistenceComparator(QObject):
@@ -14,9 +16,10 @@ class PersistenceComparator(QObject):
     def __init__(self):
         super().__init__()
 
+    @trace.traced("persistence comparison", "collector")
     def compare(self, saved_readings, url: str, driver: webdriver.Chrome):
         driver.get(url)
-        columns = helpers.get_columns(driver)
+        columns = topology.phase_count(driver)
         # noinspection PyUnresolvedReferences
         self.persisted.emit(
             self._compare(
@@ -30,7 +33,7 @@ class PersistenceComparator(QObject):
 
     def _live_readings(self, sensor_count: int, driver: webdriver.Chrome):
         return self._reading_element_values(
-            helpers.get_elements(ADVANCED_CONFIG_SELECTOR, driver),
+            helpers.get_attribute_values(ADVANCED_CONFIG_SELECTOR, "value", driver),
             sensor_count
         )
 
@@ -53,8 +56,8 @@ class PersistenceComparator(QObject):
         return self._get_values(elements, start=count * 4, stop=count * 4 + count)
 
     @staticmethod
-    def _get_values(elements, *, start, stop):
-        return [reading.get_attribute("value") for reading in elements[start:stop]]
+    def _get_values(values, *, start, stop):
+        return list(values[start:stop])
 
     @staticmethod
     def _compare(saved_readings, live_readings) -> Tuple[str]:
@@ -0,0 +1,137 @@
+# session.py
+"""Everything needed to talk to one collector, so several collectors can be driven from one process."""
+import datetime
+import logging
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, NamedTuple, Optional, Sequence, TypeVar
+from urllib.parse import urlsplit
+
+from selenium import webdriver
+
+from LWTest.collector.state import topology
+from LWTest.constants import lwt
+from LWTest.sensor import SensorLog
+from LWTest.web.interface.browser import create_headless_browser
+from LWTest.web.interface.httpdriver import HTTPDriver
+
+_logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class CollectorURLs(NamedTuple):
+    configuration: str
+    modem_status: str
+    software_upgrade: str
+    upgrade_log: str
+    sensor_data: str
+    temperature: str
+    raw_configuration: str
+    calibrate: str
+    fault_current: str
+    voltage_ride_through: str
+    log_files: str
+    date_time: str
+
+    @classmethod
+    def default(cls) -> "CollectorURLs":
+        """The collector configured in lwt, the mock collector in TESTING_MODE."""
+        return cls(lwt.URL_CONFIGURATION, lwt.URL_MODEM_STATUS, lwt.URL_SOFTWARE_UPGRADE, lwt.URL_UPGRADE_LOG,
+                   lwt.URL_SENSOR_DATA, lwt.URL_TEMPERATURE, lwt.URL_RAW_CONFIGURATION, lwt.URL_CALIBRATE,
+                   lwt.URL_FAULT_CURRENT, lwt.URL_VOLTAGE_RIDE_THROUGH, lwt.URL_LOG_FILES, lwt.URL_DATE_TIME)
+
+    @classmethod
+    def for_host(cls, base_url: str) -> "CollectorURLs":
+        """The pages of a collector at 'base_url', e.g. 'http://192.168.3.1'."""
+        parts = urlsplit(base_url if "//" in base_url else f"http://{base_url}")
+        if not parts.netloc:
+            raise ValueError(f"invalid collector address: '{base_url}'")
+
+        root = f"{parts.scheme}://{parts.netloc}"
+        date = datetime.datetime.now()
+        log_file = f"{date.year}-{date.month:02d}-{date.day:02d}_UPDATER.txt"
+        return cls(
+            configuration=f"{root}/index.php/main/configuration",
+            modem_status=f"{root}/index.php/main/modem_status",
+            software_upgrade=f"{root}/index.php/upgrade",
+            upgrade_log=f"{root}/index.php/log_viewer/view/{log_file}",
+            sensor_data=f"{root}/index.php/main/sensordata",
+            temperature=f"{root}/index.php/main/Temperature",
+            raw_configuration=f"{root}/index.php/main/test",
+            calibrate=f"{root}/index.php/main/calibrate",
+            fault_current=f"{root}/index.php/main/viewdata/fault_current",
+            voltage_ride_through=f"{root}/index.php/snow_ctrl/config",
+            log_files=f"{root}/downloadLogs.php",
+            date_time=f"{root}/index.php/upgrade/date_and_time",
+        )
+
+
+class CollectorSession:
+    """Bundles a collector's URLs and configuration password with the drivers that talk to it
+    and the SensorLog of the sensors under test on it.
+
+    The HTTP driver shares the keep-alive connections of the session pool, each collector host
+    having its own. The headless browser is only launched when a step needs one.
+    A session is used by one thread at a time."""
+
+    def __init__(self, name: str, urls: Optional[CollectorURLs] = None, password: str = ""):
+        self.name = name
+        self.urls = urls or CollectorURLs.default()
+        self.password = password
+        self.sensor_log = SensorLog()
+        # the collector at this address may not be the one last seen there
+        topology.invalidate(self.urls.sensor_data)
+        self.http_driver = HTTPDriver(fallback=lambda: self.browser)
+        self._browser: Optional[webdriver.Chrome] = None
+
+    @property
+    def browser(self) -> webdriver.Chrome:
+        if self._browser is None:
+            self._browser = create_headless_browser()
+
+        return self._browser
+
+    def close(self) -> None:
+        if self._browser:
+            self._browser.quit()
+            self._browser = None
+
+        self.http_driver.quit()
+
+    def __repr__(self):
+        return f"CollectorSession({self.name!r}, {self.urls.configuration!r})"
+
+
+class SessionScheduler:
+    """Runs one job per collector session in parallel on a thread pool.
+
+    The work is I/O bound, page loads and waiting on the collectors, so threads scale with the
+    number of benches without the cost of extra processes."""
+
+    def __init__(self, max_workers: Optional[int] = None):
+        self._max_workers = max_workers
+
+    def run(self, sessions: Sequence[CollectorSession], job: Callable[[CollectorSession], T]) -> Dict[str, T]:
+        """Returns each session's result by session name. A job that raises is logged and its result is None.
+
+        Raises ValueError when two sessions share a name, one result would hide the other."""
+        if not sessions:
+            return {}
+
+        if duplicates := sorted({name for name, count in Counter(s.name for s in sessions).items() if count > 1}):
+            raise ValueError(f"collector session names must be unique, repeated: {duplicates}")
+
+        with ThreadPoolExecutor(max_workers=self._max_workers or len(sessions),
+                                thread_name_prefix="collector") as executor:
+            futures = {session.name: executor.submit(job, session) for session in sessions}
+
+        results = {}
+        for name, future in futures.items():
+            if (exc := future.exception()) is not None:
+                _logger.error(f"collector session '{name}' failed: {exc!r}")
+                results[name] = None
+            else:
+                results[name] = future.result()
+
+        return results
@@ -0,0 +1,49 @@
+# probes.py
+"""Conditions for wait.wait_until that ask the collector whether it is ready."""
+import logging
+from typing import Callable, Dict, Optional, Sequence
+
+import requests
+from selenium import webdriver
+
+from LWTest.collector.state.reachable import PageReachable
+from LWTest.web.interface import form
+
+_logger = logging.getLogger(__name__)
+
+Probe = Callable[[], bool]
+
+
+def page_reachable(url: str, timeout: float = 2.0) -> Probe:
+    """The collector serves 'url'."""
+    checker = PageReachable(url, timeout=timeout)
+    return lambda: checker.try_to_load() == PageReachable.REACHED
+
+
+def values_persisted(url: str, expected: Dict[str, str], session: Optional[requests.Session] = None) -> Probe:
+    """The form at 'url' shows the 'expected' field values, numbers compared by value."""
+
+    def probe() -> bool:
+        try:
+            return not form.changed_fields(form.fetch(url, session).fields, expected)
+        except form.FormError as e:
+            _logger.debug(f"values not readable yet: {e}")
+            return False
+
+    return probe
+
+
+def elements_show(driver: webdriver.Chrome, xpaths: Sequence[str], values: Sequence[str]) -> Probe:
+    """The browser's current page has loaded with 'values' in the elements at 'xpaths'."""
+
+    def probe() -> bool:
+        try:
+            if driver.execute_script("return document.readyState") != "complete":
+                return False
+            return all(driver.find_element_by_xpath(xpath).get_attribute("value") == value
+                       for xpath, value in zip(xpaths, values))
+        except Exception as e:  # the page is being replaced, its elements go stale
+            _logger.debug(f"page not ready yet: {e}")
+            return False
+
+    return probe
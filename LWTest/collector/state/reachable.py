@@ -3,6 +3,8 @@ import logging
 import requests
 from PyQt6.QtCore import QObject
 
+from LWTest.web.interface import sessionpool
+
 
 class PageReachable(QObject):
     REACHED: bool = True
@@ -10,15 +12,16 @@ class PageReachable(QObject):
 
     TIMEOUT = 10
 
-    def __init__(self, url: str):
+    def __init__(self, url: str, timeout: float = TIMEOUT):
         super().__init__()
         self._logger = logging.getLogger(__name__)
         self._url: str = url
+        self._timeout = timeout
 
     def try_to_load(self):
         msg = f"collector failed to serve: '{self._url}'"
         try:
-            if 200 == requests.get(self._url, timeout=self.TIMEOUT).status_code:
+            if 200 == sessionpool.get(self._url, timeout=self._timeout).status_code:
                 return self.REACHED
         except requests.exceptions.RequestException:
             msg = f"unable to reach collector: {self._url}"
@@ -1,11 +1,16 @@
 import logging
+import threading
 from datetime import datetime, timedelta
+from typing import Optional
+
+from PyQt6.QtCore import QObject, pyqtSignal
 
 from selenium import webdriver
 from selenium.webdriver.common.by import By
 
 import LWTest.constants.lwt_constants as lwt_const
 from LWTest.collector.state.reachable import PageReachable
+from LWTest.utilities import trace
 
 _DATE_AND_TIME_ELEMENT = "//*[@id='maindiv']/div[2]"
 _DATE_AND_TIME_INPUT_ELEMENT = "//*[@id='maindiv']/form/input[1]"
@@ -78,3 +83,55 @@ class Power:
     @property
     def is_off(self) -> bool:
         return not self.is_on
+
+
+class CollectorMonitor(QObject):
+    """Probes the collector from a background thread and signals when it comes online or goes offline.
+
+    While the collector is offline the probes back off exponentially, once it is online they settle
+    into a steady interval."""
+    online = pyqtSignal()
+    offline = pyqtSignal()
+
+    TIMEOUT: float = 2.0
+    INITIAL_BACKOFF: float = 0.5
+    MAXIMUM_BACKOFF: float = 8.0
+    ONLINE_INTERVAL: float = 5.0
+
+    def __init__(self, url: str = lwt_const.URL_DATE_TIME):
+        super().__init__()
+        self._logger = logging.getLogger(__name__)
+        self._checker = PageReachable(url, timeout=self.TIMEOUT)
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._is_online: Optional[bool] = None
+
+    @property
+    def is_online(self) -> bool:
+        return self._is_online is True
+
+    def start(self) -> None:
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="collector-monitor", daemon=True)
+            self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+
+    def _run(self) -> None:
+        backoff = self.INITIAL_BACKOFF
+        while not self._stop.is_set():
+            with trace.span("collector probe", "worker"):
+                reached = self._checker.try_to_load() == PageReachable.REACHED
+            if reached != self._is_online:
+                self._is_online = reached
+                self._logger.info(f"collector is {'online' if reached else 'offline'}")
+                # noinspection PyUnresolvedReferences
+                (self.online if reached else self.offline).emit()
+
+            if reached:
+                backoff = self.INITIAL_BACKOFF
+                self._stop.wait(self.ONLINE_INTERVAL)
+            else:
+                self._stop.wait(backoff)
+                backoff = min(backoff * 2, self.MAXIMUM_BACKOFF)
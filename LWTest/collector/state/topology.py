@@ -0,0 +1,65 @@
+# topology.py
+"""How many phases (sensor columns) a collector shows, 3 or 6.
+
+The count only changes when the serial numbers are configured, so it is found once per collector
+from the first page read and shared by every reader until invalidate() is called.
+
+The cache is keyed by collector host alone and nothing notices a different collector answering
+at the same address, so invalidate() is what keeps it correct. It is called after configuring the
+serial numbers, when a new test record is loaded and when a collector session starts."""
+import logging
+import threading
+from typing import Dict
+from urllib.parse import urlsplit
+
+_logger = logging.getLogger(__name__)
+
+THREE_PHASE = 3
+SIX_PHASE = 6
+
+# one header cell per phase column, labelled "Phase 1", "Phase 2"...;
+# counted inside the browser so neither the page nor its elements are transferred
+PHASE_HEADER_SELECTOR = "div.thead > div.tcell"
+_PHASE_HEADERS_SCRIPT = ("return Array.from(document.querySelectorAll(arguments[0]))"
+                         ".filter(cell => cell.textContent.trim().toLowerCase().startsWith('phase')).length;")
+
+_lock = threading.Lock()
+_phase_counts: Dict[str, int] = {}  # collector host -> phase count
+
+
+def _host(url: str) -> str:
+    parts = urlsplit(url)
+    return f"{parts.scheme}://{parts.netloc}"
+
+
+def phase_count(driver) -> int:
+    """The phase count of the collector whose page 'driver' has loaded."""
+    host = _host(driver.current_url)
+    with _lock:
+        if (count := _phase_counts.get(host)) is not None:
+            return count
+
+    headers = _count_phase_headers(driver)
+    count = SIX_PHASE if headers > THREE_PHASE else THREE_PHASE
+    if headers:
+        # otherwise the page did not load properly, try again on the next one
+        with _lock:
+            _phase_counts[host] = count
+        _logger.debug(f"'{host}' shows {count} phases")
+
+    return count
+
+
+def invalidate(url: str) -> None:
+    """Forgets the phase count of the collector serving 'url', call after configuring its serial numbers."""
+    with _lock:
+        _phase_counts.pop(_host(url), None)
+
+
+def _count_phase_headers(driver) -> int:
+    if hasattr(driver, "execute_script"):
+        return int(driver.execute_script(_PHASE_HEADERS_SCRIPT, PHASE_HEADER_SELECTOR))
+
+    # drivers that parse the page locally already hold its source
+    return sum(cell.get_attribute("textContent").strip().lower().startswith("phase")
+               for cell in driver.find_elements_by_css_selector(PHASE_HEADER_SELECTOR))
@@ -1,37 +1,18 @@
-import logging
 import time
-from typing import List
 
 from PyQt6 import QtGui
 from PyQt6.QtCore import QObject, QThread, QTimer, Qt, pyqtSignal
 from PyQt6.QtWidgets import QDialog, QLabel, QProgressBar, QPushButton, QVBoxLayout
 
-from LWTest.collector.common.constants import ReadingType
 from LWTest.constants import lwt_constants
 from LWTest.sensor import SensorLog
-from LWTest.workers.link import LinkChecker
-
-_logger = logging.getLogger(__name__)
-_quit_checking = False
-
-
-class Worker(QObject):
-    update = pyqtSignal(str, int, str)
-    finished = pyqtSignal()
-
-    def __init__(self):
-        super(Worker, self).__init__()
-
-    def do_work(self, serial_number: str, checker: LinkChecker):
-        _logger.info(f"checking sensor {serial_number} link status")
-        value = rssi if (rssi := checker.check(serial_number)) else "NA"
-        # noinspection PyUnresolvedReferences
-        self.update.emit(value, ReadingType.RSSI, serial_number)
+from LWTest.workers.link import ModemStatusPoller
 
 
 class Signals(QObject):
-    update = pyqtSignal(str, int, str)
+    update = pyqtSignal(dict)  # serial number -> rssi for every sensor checked in one poll
     finished = pyqtSignal()
+    poll = pyqtSignal(tuple)
 
 
 class RSSIDialog(QDialog):
@@ -45,8 +26,20 @@ class RSSIDialog(QDialog):
         self._parent = parent
         self.signals = Signals()
         self._sensor_log = sensor_log
-        self._threads: List[QThread] = []
         self._timeout = time.time() + lwt_constants.TimeOut.LINK_CHECK.value
+        self._poll_in_progress = False
+
+        # one poller on one thread serves every unlinked sensor
+        self._thread = QThread()
+        self._poller = ModemStatusPoller(lwt_constants.URL_MODEM_STATUS)
+        self._poller.moveToThread(self._thread)
+        # noinspection PyUnresolvedReferences
+        self.signals.poll.connect(self._poller.poll)
+        # noinspection PyUnresolvedReferences
+        self._poller.polled.connect(self._update)
+        # noinspection PyUnresolvedReferences
+        self._thread.finished.connect(self._poller.deleteLater)
+        self._thread.start()
 
         self.main_layout = QVBoxLayout()
 
@@ -75,66 +68,29 @@ class RSSIDialog(QDialog):
         self.timer.start(1000)
 
     def closeEvent(self, a0: QtGui.QCloseEvent) -> None:
-        for thread in self._threads:
-            try:
-                if thread.isRunning():
-                    thread.quit()
-                    thread.wait()
-            except RuntimeError:
-                continue
+        self.timer.stop()
+        if self._thread.isRunning():
+            self._thread.quit()
+            self._thread.wait()
 
         a0.accept()
 
     def _close(self):
         self.close()
 
-    def _create_thread(self, serial_number: str):
-        thread = QThread()
-        worker = Worker()
-        worker.moveToThread(thread)
-        # noinspection PyUnresolvedReferences
-        thread.started.connect(
-            lambda: worker.do_work(
-                serial_number, LinkChecker(lwt_constants.URL_MODEM_STATUS)
-            )
-        )
-        # noinspection PyUnresolvedReferences
-        worker.update.connect(self._update)
-        # noinspection PyUnresolvedReferences
-        worker.finished.connect(thread.quit)
-        # noinspection PyUnresolvedReferences
-        worker.finished.connect(worker.deleteLater)
-        # noinspection PyUnresolvedReferences
-        thread.finished.connect(thread.deleteLater)
-        return thread
-
-    def _start_threads(self, serial_numbers):
-        self._threads.clear()
-        self._threads = [self._create_thread(serial_number)
-                         for serial_number in serial_numbers]
-        for thread in self._threads:
-            thread.start()
-
     def _check_link_status(self):
         if (serial_numbers := self._sensor_log.unlinked) and time.time() < self._timeout:
-            if not self._check_for_running_threads():
-                self._start_threads(serial_numbers)
+            if not self._poll_in_progress:
+                self._poll_in_progress = True
+                # noinspection PyUnresolvedReferences
+                self.signals.poll.emit(tuple(serial_numbers))
         else:
             self.timer.stop()
             # noinspection PyUnresolvedReferences
             self.signals.finished.emit()
             self.close()
 
-    def _check_for_running_threads(self):
-        for thread in self._threads:
-            try:
-                if thread.isRunning():
-                    return True
-            except RuntimeError:
-                continue
-
-        return False
-
-    def _update(self, value: str, reading_type: ReadingType, serial_number: str):
+    def _update(self, results: dict):
+        self._poll_in_progress = False
         # noinspection PyUnresolvedReferences
-        self.signals.update.emit(value, reading_type, serial_number)
+        self.signals.update.emit(results)
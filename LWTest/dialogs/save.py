@@ -1,20 +1,20 @@
-from PyQt6.QtCore import Qt, QTimer
+from PyQt6.QtCore import QObject, Qt, QThreadPool, QTimer, pyqtSignal
 from pathlib import Path
 
-from PyQt6.QtWidgets import QDialog, QVBoxLayout, QLabel, QHBoxLayout, QMessageBox
+from PyQt6.QtWidgets import QDialog, QVBoxLayout, QLabel, QHBoxLayout, QMessageBox, QProgressBar
 
 from LWTest.spreadsheet import spreadsheet as spreadsheet
-from LWTest.spreadsheet.constants import PhaseReadingsCells, phases_cells
-from LWTest.utilities import file_utils, oscomp
+from LWTest.utilities import file_utils, oscomp, returns
 from LWTest.utilities.oscomp import OSBrand
+from LWTest.workers.save import StageWorker
 
 
 class SaveDialog(QDialog):
-    _DATA_IN_SPREADSHEET_ORDER = ("high_voltage", "high_current", "high_power_factor", "high_real_power",
-                                  "low_voltage", "low_current", "low_power_factor", "low_real_power",
-                                  "scale_current", "scale_voltage", "correction_angle", "persists",
-                                  "firmware_version", "reporting_data", "rssi", "calibrated",
-                                  "temperature", "fault_current")
+    class Signals(QObject):
+        download_progress = pyqtSignal(object)  # file_utils.DownloadProgress
+
+    _STAGE_SPREADSHEET = "spreadsheet"
+    _STAGE_LOG_FILES = "log files"
 
     def __init__(self, parent, spreadsheet_path: str, log_file_path: Path, sensors: iter, references):
         super().__init__(parent)
@@ -24,6 +24,12 @@ class SaveDialog(QDialog):
         self._log_file_path = log_file_path
         self._sensors = sensors
         self._references = references
+        # results and the log-files-attached flag are applied in memory and written once, after the download
+        self._test_record = spreadsheet.XMLTestRecord(spreadsheet_path)
+        self._results = {}
+        self.signals = self.Signals()
+        # noinspection PyUnresolvedReferences
+        self.signals.download_progress.connect(self._update_download_progress)
 
         layout = QVBoxLayout(self)
 
@@ -47,48 +53,80 @@ class SaveDialog(QDialog):
 
         self._bottom_layout.addWidget(self._sub_label, alignment=Qt.AlignmentFlag.AlignHCenter)
 
+        self._download_label = QLabel("", self)
+        self._download_label.setFont(font)
+        self._top_layout.addWidget(self._download_label, alignment=Qt.AlignmentFlag.AlignHCenter)
+
         layout.addLayout(self._bottom_layout)
 
+        self._progress = QProgressBar(self)
+        self._progress.setStyleSheet("QProgressBar {min-height: 10px; max-height: 10px}")
+        self._progress.setMaximum(2)
+        self._progress.setTextVisible(False)
+        layout.addWidget(self._progress)
+
         self.setLayout(layout)
 
-        QTimer().singleShot(500, self._save_data)
+        # starts as soon as the event loop is running the dialog
+        QTimer.singleShot(0, self._save_data)
 
-    def _package_data(self):
-        data_sets = []
-        data = []
-        for index, unit in enumerate(self._sensors):
-            for field in self._DATA_IN_SPREADSHEET_ORDER:
-                data.append(unit.__getattribute__(field))
+    def _save_data(self):
+        # The two stages run one after the other on purpose. Whether the log files are attached is
+        # recorded in the spreadsheet, so it can only be written once the download has finished, and
+        # writing it once keeps the xlsm patched a single time. The readings are applied in memory
+        # now, the file write after the download is short next to the download itself.
+        self._test_record.open()
+        self._test_record.save_test_results(spreadsheet.package_test_results(self._sensors), self._references)
+
+        self._main_label.setText("Downloading log files from the collector.")
+        self._start_stage(
+            self._STAGE_LOG_FILES,
+            # noinspection PyUnresolvedReferences
+            lambda: file_utils.download_log_files(self._log_file_path, self.signals.download_progress.emit)
+        )
 
-            phase_cells = PhaseReadingsCells(*phases_cells[index])
-            data_packet = list(zip(phase_cells, data))
-            data_sets.append(data_packet)
-            data = []
+    def _write_test_record(self, log_files_attached: bool) -> returns.Result:
+        with self._test_record:
+            if log_files_attached:
+                self._test_record.record_log_files_attached()
 
-        return data_sets
+        return returns.Result(True, True)
 
-    def _save_data(self):
-        if self._do_save():
-            self._main_label.setText("Downloading log files from the collector.")
-            QTimer.singleShot(1000, self._save_log_files)
-        else:
-            self.reject()
+    def _start_stage(self, stage: str, job):
+        worker = StageWorker(stage, job)
+        worker.signals.finished.connect(self._stage_finished)
+        QThreadPool.globalInstance().start(worker)
+
+    def _stage_finished(self, stage: str, result: returns.Result):
+        self._results[stage] = result
+        self._progress.setValue(len(self._results))
+        self._sub_label.setText(", ".join(f"{name}: {'done' if r.success else 'failed'}"
+                                          for name, r in self._results.items()))
+
+        if stage == self._STAGE_LOG_FILES:
+            # the readings are saved even when the log files could not be downloaded
+            self._main_label.setText("Saving sensor data to spreadsheet.")
+            self._start_stage(self._STAGE_SPREADSHEET, lambda: self._write_test_record(result.success))
+            return
 
-    def _do_save(self):
-        result = spreadsheet.save_test_results(self._spreadsheet_path, self._package_data(), self._references)
         if not result.success:
-            self._report_failure("A problem occurred while saving readings to the spreadsheet", result.error)
-            return False
-        return True
-
-    def _save_log_files(self):
-        if not (result := file_utils.download_log_files(self._log_file_path)).success:
-            self._report_failure("An error occurred trying to download the log files.", result.error)
-            self.reject()
+            self._fail("A problem occurred while saving readings to the spreadsheet", result)
+        elif not (log_files_result := self._results[self._STAGE_LOG_FILES]).success:
+            self._fail("An error occurred trying to download the log files.", log_files_result)
         else:
-            spreadsheet.record_log_files_attached(self._spreadsheet_path)
             self.accept()
 
+    def _update_download_progress(self, progress: file_utils.DownloadProgress):
+        received = progress.bytes_received / 1024
+        total = f" of {progress.total_bytes / 1024:.0f}" if progress.total_bytes else ""
+        self._download_label.setText(
+            f"Log files: {received:.0f}{total} KiB at {progress.bytes_per_second / 1024:.1f} KiB/s"
+        )
+
+    def _fail(self, message: str, result: returns.Result):
+        self._report_failure(message, result.error)
+        self.reject()
+
     def _report_failure(self, message, detail_text):
         msg_box = QMessageBox(
             QMessageBox.warning, "LWTest - Saving Log Files", message, QMessageBox.StandardButton.Ok, self
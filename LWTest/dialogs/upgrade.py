@@ -1,3 +1,5 @@
+import logging
+
 from PyQt6.QtCore import pyqtSignal, Qt, QTimer, QSettings
 from PyQt6.QtWidgets import QDialog, QVBoxLayout, QLabel, QProgressBar
 from selenium.common.exceptions import WebDriverException
@@ -69,6 +71,14 @@ class UpgradeDialog(QDialog):
                 "/Users/charles/PycharmProjects/LWTest/LWTest/resources/firmware/firmware-0x0075.zip")
             self.browser.find_element_by_xpath(dom.upgrade_password).send_keys(
                 settings.value('main/config_password'))
+
+            # only what the collector logs after the click belongs to this upgrade
+            try:
+                self.worker.follow_log_from_end()
+            except Exception as error:
+                # the worker then follows the log from when it starts
+                logging.getLogger(__name__).debug(f"unable to read the upgrade log before upgrading: {error}")
+
             self.browser.find_element_by_xpath(dom.upgrade_button).click()
 
             self.thread_starter(self.worker)
@@ -1,11 +1,12 @@
 import logging
+from concurrent.futures import Future, ThreadPoolExecutor
 from pathlib import Path
 from typing import Optional
 
 from PyQt6 import QtGui
 from PyQt6.QtCore import QObject, QReadWriteLock, QSettings, QSize, QThreadPool, QTimer, Qt, pyqtSignal
-from PyQt6.QtGui import QBrush, QCloseEvent, QIcon
-from PyQt6.QtWidgets import QApplication, QDialog, QDoubleSpinBox, QMainWindow, QMessageBox, QTableWidgetItem, \
+from PyQt6.QtGui import QCloseEvent, QIcon
+from PyQt6.QtWidgets import QApplication, QDialog, QDoubleSpinBox, QMainWindow, QMessageBox, \
     QToolBar, QVBoxLayout, QWidget
 from selenium import webdriver
 from selenium.webdriver.common.by import By
@@ -16,12 +17,13 @@ from LWTest import document
 from LWTest import getrefs, save, sensor, web
 from LWTest.collector.common.constants import ReadingType
 from LWTest.collector.configure import raw
-from LWTest.collector.configure.serial import ConfigureSerialNumbers
+from LWTest.collector.configure.serial import ConfigureSerialNumbers, SerialNumberForm
 from LWTest.collector.read.electric import DataReader
 from LWTest.collector.read.operational import FirmwareVersionReader, \
     ReportingDataReader
 from LWTest.collector.read.persistence import PersistenceComparator
-from LWTest.collector.state.state import DateTimeSynchronizer, Power
+from LWTest.collector.state import topology
+from LWTest.collector.state.state import CollectorMonitor, DateTimeSynchronizer
 from LWTest.common.flags.flags import FlagsEnum, flags
 from LWTest.constants import lwt
 from LWTest.dialogs.countdown import CountDownDialog
@@ -33,11 +35,14 @@ from LWTest.gui import theme
 from LWTest.gui.main_window import sensortable
 from LWTest.gui.main_window.create_menus import MenuHelper
 from LWTest.gui.main_window.menu_help_handlers import menu_help_about_handler
-from LWTest.gui.main_window.tablemodelview import SensorTableViewUpdater
-from LWTest.gui.widgets import LWTTableWidget
+from LWTest.gui.main_window.tablemodelview import SensorTableModel
+from LWTest.gui.widgets import LWTTableView
 from LWTest.spreadsheet import spreadsheet
-from LWTest.utilities import file_utils, misc
+from LWTest.utilities import file_utils, misc, trace
 from LWTest.utilities.oscomp import QSettingsAdapter
+from LWTest.web.interface import form, sessionpool
+from LWTest.web.interface.browser import create_headless_browser
+from LWTest.web.interface.httpdriver import HTTPDriver
 from LWTest.web.interface.page import Page
 from LWTest.workers import link, upgrade
 
@@ -75,7 +80,6 @@ class MainWindow(QMainWindow):
         self.threads = []
         # self.thread_pool = QThreadPool.globalInstance()
         self.sensor_log = sensor.SensorLog()
-        self.sensor_log.changed.connect(self._update_table)
         self.firmware_upgrade_in_progress = False
         self.link_activity_string = ""
 
@@ -86,7 +90,9 @@ class MainWindow(QMainWindow):
         self.lock = QReadWriteLock()
 
         self.browser: Optional[webdriver.Chrome] = None
-        self.headless_driver: webdriver.Chrome = self._get_headless_browser()
+        # Chrome is launched in the background, see headless_driver
+        self._headless_driver_future: Optional[Future] = None
+        self.http_driver = HTTPDriver(fallback=lambda: self.headless_driver)
 
         self.spreadsheet_file_name: str = ""
         self.room_temp: QDoubleSpinBox = QDoubleSpinBox(self)
@@ -104,6 +110,7 @@ class MainWindow(QMainWindow):
         # end of Menu Stuff
 
         self.sensor_table = None
+        self.sensor_table_model: Optional[SensorTableModel] = None
         self._setup_sensor_table()
         self._create_toolbar()
 
@@ -118,14 +125,46 @@ class MainWindow(QMainWindow):
 
         self.setCentralWidget(self.panel)
 
+        self.collector_monitor = CollectorMonitor()
+        self._collector_search_box: Optional[QMessageBox] = None
+        self._collector_offline_box: Optional[QMessageBox] = None
+        self._date_time_synchronized = False
+
         self.sensor_link_timer = QTimer()
         self.sensor_link_check_end_time = None
 
         QTimer.singleShot(1500, self._startup)
 
+    @property
+    def headless_driver(self) -> webdriver.Chrome:
+        """Waits for the background launch of the headless driver to finish, starting it if need be."""
+        return self._warm_up_headless_driver().result()
+
+    def _warm_up_headless_driver(self) -> Future:
+        if self._headless_driver_future is None:
+            executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="headless-driver")
+            self._headless_driver_future = executor.submit(self._get_headless_browser)
+            executor.shutdown(wait=False)
+
+        return self._headless_driver_future
+
     def _startup(self):
-        # check to see if the collector is responsive
+        # launch Chrome while the collector is being checked
+        self._warm_up_headless_driver()
+
+        self._collector_search_box = self._show_information_dialog(
+            "Searching for collector", button=False, open_=True
+        )
+        self.collector_monitor.online.connect(self._handle_collector_online)
+        self.collector_monitor.offline.connect(self._handle_collector_offline)
+        self.collector_monitor.start()
 
+    def _handle_collector_offline(self):
+        self.statusBar().showMessage("The collector appears to be offline.")
+        if self._date_time_synchronized:
+            return
+
+        # still searching at startup, let the operator give up
         text = """
         <h3><span style='color: #F40009;'>The collector appears to be offline.</span></h3>
         Check the following:</br>
@@ -134,20 +173,30 @@ class MainWindow(QMainWindow):
             <li>ethernet cable is connected</li>
         </ul>
         """
+        self._close_collector_search_boxes()
+        self._collector_offline_box = QMessageBox(
+            QMessageBox.Icon.Question, "Searching for collector...", text, QMessageBox.StandardButton.Cancel, self
+        )
+        # buttonClicked is only emitted by the operator, not when the box is closed on reconnecting
+        self._collector_offline_box.buttonClicked.connect(lambda _: self.close())
+        self._collector_offline_box.open()
 
-        mb = self._show_information_dialog("Searching for collector", button=False, open_=True)
-        power = Power()
-        while power.is_off:
-            if QMessageBox.question(self,
-                                    "Searching for collector...",
-                                    text,
-                                    QMessageBox.StandardButton.Retry, QMessageBox.StandardButton.Cancel
-                                    ) == QMessageBox.StandardButton.Cancel:
-                mb.close()
-                self.close()
-                return
-        mb.close()
+    def _handle_collector_online(self):
+        self._close_collector_search_boxes()
+        self.statusBar().showMessage("Collector online.", 5000)
+
+        if not self._date_time_synchronized:
+            self._date_time_synchronized = True
+            QTimer.singleShot(0, self._synchronize_date_time)
+
+    def _close_collector_search_boxes(self):
+        for box in (self._collector_search_box, self._collector_offline_box):
+            if box:
+                box.close()
 
+        self._collector_search_box = self._collector_offline_box = None
+
+    def _synchronize_date_time(self):
         # check data and time on the collector
         mb = self._show_information_dialog("Synchronizing Date and Time", button=False, open_=True)
 
@@ -159,7 +208,10 @@ class MainWindow(QMainWindow):
 
     def closeEvent(self, closing_event: QCloseEvent):
         if self.document.can_discard(parent=self):
+            self.collector_monitor.stop()
             self._close_browser()
+            sessionpool.close()
+            trace.save()
             _logger.debug("program terminated")
             closing_event.accept()
         else:
@@ -224,6 +276,8 @@ class MainWindow(QMainWindow):
         if self.document.can_discard(parent=self):
             serial_numbers = spreadsheet.get_serial_numbers(filename)
             sensor_log.create_all(serial_numbers)
+            # a new record is usually tested on a different collector
+            topology.invalidate(lwt.URL_SENSOR_DATA)
             self._setup_sensor_table(rows=len(serial_numbers))
             self._update_table()
             return True
@@ -233,34 +287,44 @@ class MainWindow(QMainWindow):
     def _setup_sensor_table(self, rows=6):
         if self.sensor_table:
             self.panel_layout.removeWidget(self.sensor_table)
+            self.sensor_table.deleteLater()
 
-        self.sensor_table = LWTTableWidget(self.panel)
+        self.sensor_table = LWTTableView(self.panel)
         self.panel_layout.addWidget(self.sensor_table)
         self.sensor_table.signals.double_clicked.connect(
             self._table_item_double_clicked
         )
         self.sensor_table.setAlternatingRowColors(True)
         self.sensor_table.setPalette(theme.sensor_table_palette)
-        self._table_view_updater = SensorTableViewUpdater(lambda: self.sensor_log.room_temperature)
+        # one model for the life of the window, it stays connected to the sensor log
+        if self.sensor_table_model is None:
+            self.sensor_table_model = SensorTableModel(self.sensor_log, rows, self)
+        else:
+            self.sensor_table_model.reset_rows(rows)
         sensortable.setup_table(
             self,
             self.sensor_table,
+            self.sensor_table_model,
             self._manually_override_calibration_result,
-            self._manually_override_fault_current_result,
-            rows
+            self._manually_override_fault_current_result
         )
 
     @flags(set_=[FlagsEnum.SERIALS])
     def _handle_action_configure_serial_numbers(self, _: bool):
         serial_numbers = self.sensor_log.get_serial_numbers_as_list()
-        configurator = ConfigureSerialNumbers(
-            misc.ensure_six_numbers(serial_numbers),
-            QSettingsAdapter().value("main/config_password"),
-            self.headless_driver,
-            lwt.URL_CONFIGURATION
-        )
+        password = QSettingsAdapter().value("main/config_password")
+        try:
+            SerialNumberForm(misc.ensure_six_numbers(serial_numbers), password, lwt.URL_CONFIGURATION).configure()
+            result, error_msg = True, ""
+        except form.FormError as e:
+            _logger.warning(f"unable to configure the serial numbers over http ({e}), using the browser")
+            result, error_msg = ConfigureSerialNumbers(
+                misc.ensure_six_numbers(serial_numbers),
+                password,
+                self.headless_driver,
+                lwt.URL_CONFIGURATION
+            ).configure()
 
-        result, error_msg = configurator.configure()
         if result:
             QTimer.singleShot(0, lambda: self._start_serial_update_verifier(serial_numbers))
         else:
@@ -294,12 +358,13 @@ class MainWindow(QMainWindow):
         rssi_dialog.signals.finished.connect(lambda: QTimer.singleShot(0, self._get_sensor_link_data))
         rssi_dialog.open()
 
-    def _rssi_update(self, value, reading_type, serial_number):
-        self.sensor_log.save(value, reading_type, serial_number)
-        self._update_table()
+    def _rssi_update(self, results: dict):
+        with self.sensor_log.transaction():
+            for serial_number, value in results.items():
+                self.sensor_log.save(value, ReadingType.RSSI, serial_number)
 
     def _handle_action_upgrade_sensor(self):
-        phase = self.sensor_table.currentRow()
+        phase = self.sensor_table.currentIndex().row()
 
         if not self.firmware_upgrade_in_progress:
             self.firmware_upgrade_in_progress = True
@@ -329,9 +394,7 @@ class MainWindow(QMainWindow):
 
     def _upgrade_successful(self, serial_number):
         self.firmware_upgrade_in_progress = False
-        phase = self._get_sensor_phase(serial_number)
-        self.sensor_log.record_firmware_version(phase, lwt.LATEST_FIRMWARE_VERSION_NUMBER)
-        self._update_table()
+        self.sensor_log.save(lwt.LATEST_FIRMWARE_VERSION_NUMBER, ReadingType.FIRMWARE, serial_number)
 
         self._show_information_dialog("Sensor firmware successfully upgraded.")
 
@@ -349,12 +412,16 @@ class MainWindow(QMainWindow):
         msg_box = self._show_information_dialog("Setting Advanced Config constants", button=False, open_=True)
 
         password = QSettings().value("main/config_password")
-        submit_buttons = [
-            web.interface.page.Submit.create_submit_button_for_temperature_config(password),
-            web.interface.page.Submit.create_submit_button_for_raw_config(password),
-            web.interface.page.Submit.create_submit_button_for_voltage_ride_through(password)
-        ]
-        raw.do_advanced_configuration(self.headless_driver, Page, submit_buttons)
+        try:
+            raw.update_advanced_configuration(password)
+        except form.FormError as e:
+            _logger.warning(f"unable to update the advanced configuration over http ({e}), using the browser")
+            submit_buttons = [
+                web.interface.page.Submit.create_submit_button_for_temperature_config(password),
+                web.interface.page.Submit.create_submit_button_for_raw_config(password),
+                web.interface.page.Submit.create_submit_button_for_voltage_ride_through(password)
+            ]
+            raw.do_advanced_configuration(self.headless_driver, Page, submit_buttons)
 
         msg_box.close()
 
@@ -434,12 +501,11 @@ class MainWindow(QMainWindow):
         driver = self.headless_driver
         readers = self._get_sensor_link_data_readers()
 
-        for serial_number in serial_numbers:
-            phase = self._get_sensor_phase(serial_number)
-            for reader in readers:
-                self._get_sensor_link_data_actual(phase, reader, driver)
-
-        self._update_table()
+        with self.sensor_log.transaction():
+            for serial_number in serial_numbers:
+                phase = self._get_sensor_phase(serial_number)
+                for reader in readers:
+                    self._get_sensor_link_data_actual(phase, reader, driver)
 
     @staticmethod
     def _get_sensor_link_data_actual(phase: int, reader, driver: webdriver.Chrome):
@@ -454,7 +520,7 @@ class MainWindow(QMainWindow):
         data_reader.readings.connect(self.sensor_log.save)
         data_reader.readings.connect(lambda values, kind: self._enable_persistence_check(kind))
         data_reader.page_load_error.connect(self._handle_take_readings_page_load_error)
-        data_reader.read(self._get_browser())
+        data_reader.read(self._get_reading_driver())
 
         self.document(document.DocumentState.DIRTY)
 
@@ -470,6 +536,18 @@ class MainWindow(QMainWindow):
             self.browser.quit()
             self.browser = None
 
+        if self._headless_driver_future:
+            # a driver still launching is shut down as soon as it is up
+            self._headless_driver_future.add_done_callback(self._quit_launched_driver)
+            self._headless_driver_future = None
+
+        self.http_driver.quit()
+
+    @staticmethod
+    def _quit_launched_driver(future: Future):
+        if future.exception() is None:
+            future.result().quit()
+
     @staticmethod
     def _can_save(changes: document.Document):
         return changes.is_dirty
@@ -489,12 +567,16 @@ class MainWindow(QMainWindow):
 
         return self.browser
 
+    def _get_reading_driver(self):
+        # 'selenium' reads through the visible browser, anything else uses the HTTP engine
+        if QSettingsAdapter.value("main/reading_engine") == "selenium":
+            return self._get_browser()
+
+        return self.http_driver
+
     @staticmethod
     def _get_headless_browser():
-        _logger.info("created headless driver")
-        options = webdriver.ChromeOptions()
-        options.add_argument("headless=True")
-        return webdriver.Chrome(executable_path=LWTest.constants.CHROMEDRIVER_PATH, options=options)
+        return create_headless_browser()
 
     def _handle_action_about(self):
         menu_help_about_handler(parent=self)
@@ -531,7 +613,6 @@ class MainWindow(QMainWindow):
     def _manually_override_calibration_result(self, result, index):
         serial_number = self.sensor_log.get_sensor_by_phase(index).serial_number
         self.sensor_log.save(result, ReadingType.CALIBRATED, serial_number=serial_number)
-        self._update_table()
 
     def _manually_override_fault_current_result(self, result, index):
         serial_number = self.sensor_log.get_sensor_by_phase(index).serial_number
@@ -541,10 +622,6 @@ class MainWindow(QMainWindow):
         self.settings.setValue("geometry/mainwindow/width", self.width())
         self.settings.setValue("geometry/mainwindow/height", self.height())
 
-    def _set_sensor_table_widget_item_background(self, color: QBrush, row: int, col: int):
-        item: QTableWidgetItem = self.sensor_table.item(row, col)
-        item.setBackground(color)
-
     @staticmethod
     def _start_worker(worker):
         QThreadPool.globalInstance().start(worker)
@@ -608,9 +685,7 @@ class MainWindow(QMainWindow):
         result_map[result]()
 
     def _update_table(self):
-        _logger.info("updating table")
-        self._table_view_updater.update_from_model(self.sensor_log.get_sensors(), self.sensor_table)
-        _logger.info("finished updating table")
+        self.sensor_table_model.refresh()
 
     def _wait_for_collector_to_boot(self):
         pbm = PersistenceBootMonitorDialog(self)
@@ -1,56 +1,50 @@
 from typing import Callable
 
-from PyQt6.QtWidgets import QTableWidget, QComboBox, QHeaderView
-
-import LWTest.gui.main_window.helper as helper
-from LWTest.constants import lwt
-
-
-def setup_table(parent, table: QTableWidget, calibrated_override: Callable,
-                fault_current_override: Callable, rows=6):
-    headers = ["Serial Number", "\t\t\t\t\t\tRSSI\t\t\t\t\t\t", "Firmware", "Reporting Data",
-               "Calibration",
-               "\t\t\t\t\t\t13.8K\t\t\t\t\t\t", "\t\t\t\t120A\t\t\t\t", "Power Factor", "Real Power",
-               "\t\t\t\t\t\t7.2K\t\t\t\t\t\t", "\t\t\t\t\t60A\t\t\t\t\t", "Power Factor", "Real Power",
-               "Scale Current", "Scale Voltage", "Correction Angle", "\t\tPersists\t\t\t\t",
-               "Temperature", "Fault Current"]
-
-    table.clear()
-    table.setRowCount(rows)
-    table.setColumnCount(len(headers))
-    table.setHorizontalHeaderLabels(headers)
-    table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.ResizeToContents)
-    table.verticalHeader().setSectionResizeMode(QHeaderView.ResizeMode.ResizeToContents)
-    table.horizontalHeader().setStretchLastSection(True)
+from PyQt6.QtCore import QModelIndex
+from PyQt6.QtWidgets import QComboBox, QStyledItemDelegate, QTableView
 
-    # for index, number in enumerate(serial_numbers):
-    for index in range(rows):
-        item = helper.create_item()
-        item.setFlags(item.flags() | helper.Qt.ItemFlag.ItemIsSelectable)
-        table.setItem(index, 0, item)
+from LWTest.gui.main_window.tablemodelview import COMBO_BOX_COLUMNS, SensorTableModel
 
-        # Four stock QTableWidgetItems
-        for column in range(lwt.TableColumn.SERIAL_NUMBER.value, lwt.TableColumn.REPORTING.value + 1):
-            item = helper.create_item("---")
-            table.setItem(index, column, item)
 
-        # A "custom" cellWidget
-        cal_combo = QComboBox(parent)
-        cal_combo.insertItems(0, ["NA", "Pass", "Fail"])
-        # noinspection PyUnresolvedReferences
-        cal_combo.currentTextChanged.connect(lambda text, index_=index: calibrated_override(text, index_))
-        table.setCellWidget(index, lwt.TableColumn.CALIBRATION.value, cal_combo)
+class ResultComboBoxDelegate(QStyledItemDelegate):
+    """Shows a "NA"/"Pass"/"Fail" combo box that reports the operator's choice to 'override'."""
+    _RESULTS = ["NA", "Pass", "Fail"]
 
-        # Thirteen more stock QTableWidgetItems
-        for column in range(lwt.TableColumn.HIGH_VOLTAGE.value, lwt.TableColumn.TEMPERATURE.value + 1):
-            item = helper.create_item("---")
-            table.setItem(index, column, item)
+    def __init__(self, override: Callable, parent=None):
+        super().__init__(parent)
+        self._override = override
 
-        fault_combo = QComboBox(parent)
-        fault_combo.insertItems(0, ["NA", "Pass", "Fail"])
+    def createEditor(self, parent, option, index: QModelIndex) -> QComboBox:
+        combo = QComboBox(parent)
+        combo.insertItems(0, self._RESULTS)
         # noinspection PyUnresolvedReferences
-        fault_combo.currentTextChanged.connect(lambda text, index_=index: fault_current_override(text, index_))
-        table.setCellWidget(index, lwt.TableColumn.FAULT_CURRENT.value, fault_combo)
+        combo.currentTextChanged.connect(lambda text, row=index.row(): self._override(text, row))
+        return combo
+
+    def setEditorData(self, editor: QComboBox, index: QModelIndex) -> None:
+        result = index.data()
+        # only the operator's choices are reported, not updates coming from the model
+        editor.blockSignals(True)
+        editor.setCurrentIndex(self._RESULTS.index(result) if result in self._RESULTS else 0)
+        editor.blockSignals(False)
+
+    def setModelData(self, editor, model, index) -> None:
+        # results are recorded through 'override', the model is updated from the sensor log
+        pass
+
 
-    table.setCurrentCell(0, 0)
+def setup_table(parent, table: QTableView, model: SensorTableModel, calibrated_override: Callable,
+                fault_current_override: Callable):
+    table.setModel(model)
+
+    for column, override in zip(COMBO_BOX_COLUMNS, (calibrated_override, fault_current_override)):
+        table.setItemDelegateForColumn(column, ResultComboBoxDelegate(override, parent))
+        for row in range(model.rowCount()):
+            table.openPersistentEditor(model.index(row, column))
+
+    # size once, sizing to contents on every change relays out the whole table
+    table.horizontalHeader().setStretchLastSection(True)
     table.resizeColumnsToContents()
+    table.resizeRowsToContents()
+
+    table.setCurrentIndex(model.index(0, 0))
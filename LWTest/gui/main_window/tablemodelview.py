@@ -1,16 +1,13 @@
 import logging
 from collections import namedtuple
-from typing import Tuple, Callable, Union
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Type, Union
 
-from PyQt6.QtGui import QBrush
-from PyQt6.QtWidgets import QTableWidgetItem, QApplication
+from PyQt6.QtCore import QAbstractTableModel, QModelIndex, Qt
 
 import LWTest.gui.brushes as brushes
-from LWTest.constants import lwt_constants as lwt
 from LWTest.constants.lwt_constants.sensor_table_columns import TableColumn as tc
 from LWTest.constants.lwt_constants.tolerance import Tolerance as tol
-from LWTest.gui.widgets import LWTTableWidget
-from LWTest.sensor import Sensor
+from LWTest.sensor import MISSING, SensorChange, SensorLog
 
 WordMatch = namedtuple("WordMatch", "word")
 ReadingLimits = namedtuple("ReadingLimits", "lower upper")
@@ -46,10 +43,11 @@ class WordMatchValidator(Validator):
 class FloatValidator(Validator):
     @staticmethod
     def validate(reading, limits: ReadingLimits) -> str:
-        if FloatValidator.is_na(reading):
-            return reading
+        """'reading' is the value parsed by the Sensor."""
+        if reading is MISSING:
+            return "NA"
 
-        return "IN" if limits.lower < float(reading.replace(",", "")) < limits.upper else "OUT"
+        return "IN" if limits.lower < reading < limits.upper else "OUT"
 
 
 validators_by_column = {
@@ -80,87 +78,159 @@ validators_by_column = {
 }
 
 
-class CellLocation:
-    def __init__(self, row: int, col: int):
-        assert row >= 0, f"invalid row {row}, must be 0 or greater"
-        assert col >= 0, f"invalid col {col}, must be 0 or greater"
+HEADERS = (
+    "Serial Number", "\t\t\t\t\t\tRSSI\t\t\t\t\t\t", "Firmware", "Reporting Data", "Calibration",
+    "\t\t\t\t\t\t13.8K\t\t\t\t\t\t", "\t\t\t\t120A\t\t\t\t", "Power Factor", "Real Power",
+    "\t\t\t\t\t\t7.2K\t\t\t\t\t\t", "\t\t\t\t\t60A\t\t\t\t\t", "Power Factor", "Real Power",
+    "Scale Current", "Scale Voltage", "Correction Angle", "\t\tPersists\t\t\t\t", "Temperature", "Fault Current"
+)
 
-        self._row = row
-        self._col = col
+COMBO_BOX_COLUMNS = (tc.CALIBRATION.value, tc.FAULT_CURRENT.value)
 
-    @property
-    def row(self):
-        return self._row
+
+class ValidationEngine:
+    """Compiles validators_by_column and the room temperature reference into per-column checks
+    that return the verdicts for a whole column of readings at once.
+
+    Verdicts are cached by (reading, limits), only the temperature limits depend on the reference."""
+    _CACHE_SIZE = 4096
+
+    def __init__(self, temperature_reference: float):
+        self._checks: Dict[int, Tuple[Type[Validator], Any]] = {
+            column: (entry[0], entry[1]) for column, entry in validators_by_column.items()
+            if entry[0] is not None and column not in COMBO_BOX_COLUMNS
+        }
+        self._verdicts: Dict[Tuple[Any, Any], str] = {}
+        self._temperature_reference: Optional[float] = None
+        self.set_temperature_reference(temperature_reference)
 
     @property
-    def col(self):
-        return self._col
+    def temperature_reference(self) -> float:
+        return self._temperature_reference
+
+    def set_temperature_reference(self, reference: float) -> bool:
+        """Returns whether the temperature limits changed."""
+        if reference == self._temperature_reference:
+            return False
+
+        self._temperature_reference = reference
+        limits = ReadingLimits(reference - tol.TEMPERATURE_DELTA.value, reference + tol.TEMPERATURE_DELTA.value)
+        self._checks[tc.TEMPERATURE.value] = (FloatValidator, limits)
+        return True
+
+    def validate(self, column: int, reading) -> str:
+        return self.validate_column(column, (reading,))[0]
+
+    def validate_column(self, column: int, readings: Sequence) -> List[str]:
+        if (check := self._checks.get(column)) is None:
+            return ["NA"] * len(readings)
+
+        validator, limits = check
+        verdicts = self._verdicts
+        if len(verdicts) > self._CACHE_SIZE:
+            verdicts.clear()
 
+        result = []
+        for reading in readings:
+            if (verdict := verdicts.get((reading, limits))) is None:
+                verdict = verdicts[(reading, limits)] = validator.validate(reading, limits)
+            result.append(verdict)
 
-class SensorTableViewUpdater:
+        return result
+
+
+class SensorTableModel(QAbstractTableModel):
+    """Presents the SensorLog to the sensor table.
+
+    Each cell's text and verdict are cached, refresh() re-evaluates them and
+    emits dataChanged only for the cells that actually changed."""
     _DATA_IN_TABLE_ORDER = (
         "serial_number", "rssi", "firmware_version", "reporting_data", "calibrated", "high_voltage",
         "high_current", "high_power_factor", "high_real_power", "low_voltage", "low_current",
         "low_power_factor", "low_real_power", "scale_current", "scale_voltage",
         "correction_angle", "persists", "temperature", "fault_current"
     )
+    _CHANGED_ROLES = [Qt.ItemDataRole.DisplayRole, Qt.ItemDataRole.BackgroundRole]
 
-    def __init__(self, get_temp_ref: Callable):
+    def __init__(self, sensor_log: SensorLog, rows=6, parent=None):
+        super().__init__(parent)
         self._logger = logging.getLogger(__name__)
-        self._get_temp_ref = get_temp_ref
-
-    def update_from_model(self, sensors: Tuple[Sensor, ...], table: LWTTableWidget) -> None:
-        for row, sensor in enumerate(sensors):
-            for column in range(lwt.TableColumn.SERIAL_NUMBER.value, lwt.TableColumn.FAULT_CURRENT.value + 1):
-                if column == lwt.TableColumn.FAULT_CURRENT.value:
-                    self._update_combo_box(CellLocation(row, lwt.TableColumn.FAULT_CURRENT.value),
-                                           sensor.fault_current, table)
-                elif column == lwt.TableColumn.CALIBRATION.value:
-                    self._update_combo_box(CellLocation(row, lwt.TableColumn.CALIBRATION.value),
-                                           sensor.calibrated, table)
-                else:
-                    reading = getattr(sensor, self._DATA_IN_TABLE_ORDER[column])
-                    self._logger.debug(f"reading to be placed at ({row}, {column}): {reading}")
-                    table.item(row, column).setText(reading)
-                    validated_item = self._validate_reading(reading, row, column, table)
-                    table.setItem(row, column, validated_item)
-
-    @staticmethod
-    def _update_combo_box(cell_location: CellLocation, text: str, table) -> None:
-        def _determine_index(result: str) -> int:
-            indexes = {"Pass": 1, "Fail": 2}
-            return indexes.get(result, 0)  # defaults to "NA"
-
-        table.cellWidget(cell_location.row, cell_location.col).setCurrentIndex(_determine_index(text))
-
-    def _validate_reading(self, reading, row: int, column: int, table) -> QTableWidgetItem:
-        """Validates reading and returns a new QTableWidgetItem
-        with its background colored to indicate pass or fail."""
-        assert tc.SERIAL_NUMBER.value <= column <= tc.FAULT_CURRENT.value, f"invalid column: {column} not in range"
-        validator, limits = validators_by_column[column]
-        if validator:
-            if column == tc.TEMPERATURE.value:
-                brush = self._get_temperature_brush(reading, validator, float(self._get_temp_ref()))
-            else:
-                brush = validator.get_brush(validator.validate(reading, limits))
-
-            highlighted_item = self._create_highlighted_item(brush, table.item(row, column))
-            return highlighted_item
-        else:
-            # need to clone item when returning existing QTableWidgetItem
-            # or else the following error is printed
-            # "QTableWidget: cannot insert an item that is already owned by another QTableWidget"
-            return table.item(row, column).clone()
-
-    @staticmethod
-    def _get_temperature_brush(reading, validator, temp_ref: float) -> QBrush:
-        limits = ReadingLimits(temp_ref - tol.TEMPERATURE_DELTA.value, temp_ref + tol.TEMPERATURE_DELTA.value)
-        pass_fail = validator.validate(reading, limits)
-        return validator.get_brush(pass_fail)
-
-    @staticmethod
-    def _create_highlighted_item(color: QBrush, item: QTableWidgetItem) -> QTableWidgetItem:
-        """Clones item and changes its background color to indicate pass or fail."""
-        new_item = item.clone()
-        new_item.setBackground(color)
-        return new_item
+        self._sensor_log = sensor_log
+        self._engine = ValidationEngine(float(sensor_log.room_temperature))
+        self._sensor_log.sensors_changed.connect(self._apply_changes)
+        self._sensor_log.room_temperature_changed.connect(self._apply_temperature_reference)
+        self._cells: List[List[Tuple[str, str]]] = [[("", "NA")] * len(HEADERS) for _ in range(rows)]
+        self.refresh()
+
+    def rowCount(self, parent=QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self._cells)
+
+    def columnCount(self, parent=QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(HEADERS)
+
+    def data(self, index: QModelIndex, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+
+        text, verdict = self._cells[index.row()][index.column()]
+        if role in (Qt.ItemDataRole.DisplayRole, Qt.ItemDataRole.EditRole):
+            return text
+        if role == Qt.ItemDataRole.BackgroundRole and verdict != "NA":
+            return Validator.get_brush(verdict)
+        if role == Qt.ItemDataRole.TextAlignmentRole:
+            return Qt.AlignmentFlag.AlignCenter
+
+        return None
+
+    def headerData(self, section: int, orientation: Qt.Orientation, role=Qt.ItemDataRole.DisplayRole):
+        if role == Qt.ItemDataRole.DisplayRole and orientation == Qt.Orientation.Horizontal:
+            return HEADERS[section]
+
+        return super().headerData(section, orientation, role)
+
+    def flags(self, index: QModelIndex) -> Qt.ItemFlag:
+        if index.column() == tc.SERIAL_NUMBER.value:
+            return Qt.ItemFlag.ItemIsEnabled | Qt.ItemFlag.ItemIsSelectable
+
+        return Qt.ItemFlag.ItemIsEnabled
+
+    def reset_rows(self, rows: int) -> None:
+        """Starts over with 'rows' rows for a newly loaded set of sensors."""
+        self.beginResetModel()
+        self._cells = [[("", "NA")] * len(HEADERS) for _ in range(rows)]
+        self.endResetModel()
+        self.refresh()
+
+    def refresh(self) -> None:
+        for column in range(len(HEADERS)):
+            self._update_column(column)
+
+    def _apply_changes(self, changes: Tuple[SensorChange, ...]) -> None:
+        for change in changes:
+            unit = self._sensor_log[change.serial_number]
+            if unit.phase < len(self._cells) and change.field in self._DATA_IN_TABLE_ORDER:
+                column = self._DATA_IN_TABLE_ORDER.index(change.field)
+                verdict = self._engine.validate(column, unit.parsed(change.field))
+                self._store(unit.phase, column, (change.new, verdict))
+
+    def _apply_temperature_reference(self, reference: str) -> None:
+        if self._engine.set_temperature_reference(float(reference)):
+            self._update_column(tc.TEMPERATURE.value)
+
+    def _update_column(self, column: int) -> None:
+        """Re-evaluates every cell of the column, the empty rows after the last sensor included."""
+        name = self._DATA_IN_TABLE_ORDER[column]
+        sensors = self._sensor_log.get_sensors()[:len(self._cells)]
+        texts = [getattr(unit, name) for unit in sensors]
+        verdicts = self._engine.validate_column(column, [unit.parsed(name) for unit in sensors])
+
+        empty = ("", "NA") if column == tc.SERIAL_NUMBER.value else ("---", "NA")
+        for row in range(len(self._cells)):
+            self._store(row, column, (texts[row], verdicts[row]) if row < len(sensors) else empty)
+
+    def _store(self, row: int, column: int, cell: Tuple[str, str]) -> None:
+        if cell != self._cells[row][column]:
+            self._cells[row][column] = cell
+            index = self.index(row, column)
+            # noinspection PyUnresolvedReferences
+            self.dataChanged.emit(index, index, self._CHANGED_ROLES)
@@ -1,9 +1,9 @@
 from PyQt6 import QtGui
 from PyQt6.QtCore import QObject, Qt, pyqtSignal
-from PyQt6.QtWidgets import QTableWidget
+from PyQt6.QtWidgets import QTableView
 
 
-class LWTTableWidget(QTableWidget):
+class LWTTableView(QTableView):
     class Signals(QObject):
         double_clicked = pyqtSignal(int)
 
@@ -1,37 +1,84 @@
 # sensor.py
 import logging
-from dataclasses import dataclass, field
+from contextlib import contextmanager
 from functools import singledispatchmethod
-from typing import List, Optional, Tuple, cast
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple, Union, cast
 
 from PyQt6.QtCore import QObject, pyqtSignal
 
 from LWTest.collector.common.constants import ReadingType
 
 
-@dataclass
+class _Missing:
+    """Marks a numeric reading that has not been taken or could not be parsed."""
+    __slots__ = ()
+
+    def __bool__(self):
+        return False
+
+    def __repr__(self):
+        return "MISSING"
+
+
+MISSING = _Missing()
+
+NUMERIC_FIELDS = frozenset((
+    "rssi", "high_voltage", "high_current", "high_power_factor", "high_real_power", "low_voltage", "low_current",
+    "low_power_factor", "low_real_power", "scale_current", "scale_voltage", "correction_angle", "temperature"
+))
+TEXT_FIELDS = ("result", "firmware_version", "reporting_data", "calibrated", "fault_current", "persists")
+
+
+def parse_reading(text: str) -> Union[float, _Missing]:
+    try:
+        return float(text.replace(",", ""))
+    except (AttributeError, ValueError):
+        return MISSING
+
+
+class _NumericReading:
+    """Keeps the reading's text as scraped and the value parsed from it, parsing once when it is set."""
+
+    def __set_name__(self, owner, name):
+        self._text_slot = f"_{name}_text"
+        self._value_slot = f"_{name}_value"
+
+    def __get__(self, instance, owner=None):
+        if instance is None:
+            return self
+        return getattr(instance, self._text_slot)
+
+    def __set__(self, instance, text: str):
+        setattr(instance, self._text_slot, text)
+        setattr(instance, self._value_slot, parse_reading(text))
+
+    def value(self, instance) -> Union[float, _Missing]:
+        return getattr(instance, self._value_slot)
+
+
 class Sensor:
-    _phase: int
-    _serial_number: str
-    result: str = field(init=False, default="NA")
-    rssi: str = field(init=False, default="NA")
-    firmware_version: str = field(init=False, default="NA")
-    reporting_data: str = field(init=False, default="NA")
-    calibrated: str = field(init=False, default="NA")
-    high_voltage: str = field(init=False, default="NA")
-    high_current: str = field(init=False, default="NA")
-    high_power_factor: str = field(init=False, default="NA")
-    high_real_power: str = field(init=False, default="NA")
-    low_voltage: str = field(init=False, default="NA")
-    low_current: str = field(init=False, default="NA")
-    low_power_factor: str = field(init=False, default="NA")
-    low_real_power: str = field(init=False, default="NA")
-    scale_current: str = field(init=False, default="NA")
-    scale_voltage: str = field(init=False, default="NA")
-    correction_angle: str = field(init=False, default="NA")
-    temperature: str = field(init=False, default="NA")
-    fault_current: str = field(init=False, default="NA")
-    persists: str = field(init=False, default="NA")
+    __slots__ = ("_phase", "_serial_number") + TEXT_FIELDS + \
+                tuple(f"_{name}_{kind}" for name in sorted(NUMERIC_FIELDS) for kind in ("text", "value"))
+
+    rssi = _NumericReading()
+    high_voltage = _NumericReading()
+    high_current = _NumericReading()
+    high_power_factor = _NumericReading()
+    high_real_power = _NumericReading()
+    low_voltage = _NumericReading()
+    low_current = _NumericReading()
+    low_power_factor = _NumericReading()
+    low_real_power = _NumericReading()
+    scale_current = _NumericReading()
+    scale_voltage = _NumericReading()
+    correction_angle = _NumericReading()
+    temperature = _NumericReading()
+
+    def __init__(self, phase: int, serial_number: str):
+        self._phase = phase
+        self._serial_number = serial_number
+        for name in TEXT_FIELDS + tuple(NUMERIC_FIELDS):
+            setattr(self, name, "NA")
 
     @property
     def advance_readings(self) -> Tuple[str, ...]:
@@ -39,10 +86,8 @@ class Sensor:
 
     @property
     def linked(self):
-        try:
-            return int(self.rssi) in [-i for i in range(120)]
-        except ValueError:
-            return False
+        rssi = self.value("rssi")
+        return rssi is not MISSING and rssi.is_integer() and -120 < rssi <= 0
 
     @property
     def phase(self):
@@ -56,8 +101,16 @@ class Sensor:
     def reporting(self):
         return self.reporting_data == "Pass"
 
-    def __setattr__(self, key, value):
-        object.__setattr__(self, key, value)
+    def value(self, name: str) -> Union[float, _Missing]:
+        """Returns the parsed value of a numeric reading."""
+        return getattr(Sensor, name).value(self)
+
+    def parsed(self, name: str) -> Union[float, _Missing, str]:
+        """Returns the parsed value of a numeric reading or the text of any other."""
+        return self.value(name) if name in NUMERIC_FIELDS else getattr(self, name)
+
+    def __repr__(self):
+        return f"Sensor({self._phase!r}, {self._serial_number!r})"
 
 
 _sensor_attributes = {
@@ -82,14 +135,30 @@ _sensor_attributes = {
 }
 
 
+class SensorChange(NamedTuple):
+    serial_number: str
+    field: str
+    old: Any
+    new: Any
+
+
 class SensorLog(QObject):
+    """Records the test results of each sensor.
+
+    Every write that changes a value is announced through 'sensors_changed' as a tuple of SensorChange.
+    Writes made inside a transaction() are coalesced and announced once, when the outermost transaction ends.
+    'changed' is emitted alongside for listeners that only need to know that something changed."""
     changed = pyqtSignal()
+    sensors_changed = pyqtSignal(tuple)
+    room_temperature_changed = pyqtSignal(str)
 
     def __init__(self):
         super().__init__()
         self._logger = logging.getLogger(__name__)
         self._log_by_serial_number = {}
         self._log_by_phase = {}
+        self._transaction_depth = 0
+        self._pending_changes: Dict[Tuple[str, str], SensorChange] = {}
         self._room_temperature: str = "21.7"
         self._high_voltage_reference = ("", "", "", "")
         self._low_voltage_reference = ("", "", "", "")
@@ -120,6 +189,8 @@ class SensorLog(QObject):
     def room_temperature(self, value: float):
         self._room_temperature = f"{value:.1f}"
         self._logger.debug(f"room temperature reference set to: {self._room_temperature}")
+        # noinspection PyUnresolvedReferences
+        self.room_temperature_changed.emit(self._room_temperature)
 
     @property
     def unlinked(self):
@@ -149,14 +220,23 @@ class SensorLog(QObject):
         return tuple(cast(Sensor, sensor) for sensor in self._log_by_serial_number.values())
 
     def record_calibration_results(self, result: str, index: int):
-        self.get_sensor_by_phase(index).calibrated = result
-        # noinspection PyUnresolvedReferences
-        self.changed.emit()
+        with self.transaction():
+            self._set(self.get_sensor_by_phase(index), "calibrated", result)
 
     def record_fault_current_results(self, result: str, index: int):
-        self.get_sensor_by_phase(index).fault_current = result
-        # noinspection PyUnresolvedReferences
-        self.changed.emit()
+        with self.transaction():
+            self._set(self.get_sensor_by_phase(index), "fault_current", result)
+
+    @contextmanager
+    def transaction(self):
+        """Announces all the changes made in the block with a single notification."""
+        self._transaction_depth += 1
+        try:
+            yield self
+        finally:
+            self._transaction_depth -= 1
+            if self._transaction_depth == 0:
+                self._notify()
 
     @singledispatchmethod
     def save(self, values, kind, _: str = ""):
@@ -170,18 +250,35 @@ class SensorLog(QObject):
     def _(self, value: str, reading_type: ReadingType, serial_number: str = ""):
         assert serial_number != "", "missing serial_number"
 
-        unit: Sensor = self._log_by_serial_number[serial_number]
-        setattr(unit, _sensor_attributes[reading_type], value)
-        # 'change' signal is not emitted here for performance reasons
-        self._logger.debug(f"set sensor({unit.serial_number}).{_sensor_attributes[reading_type]} = {value}")
+        with self.transaction():
+            self._set(self._log_by_serial_number[serial_number], _sensor_attributes[reading_type], value)
 
     def _save(self, values, attribute):
-        for index, unit in enumerate(self):
-            if unit.linked:
-                setattr(unit, attribute, values[index])
-                self._logger.debug(f"set sensor({unit.serial_number}).{attribute} = {values[index]}")
-        # noinspection PyUnresolvedReferences
-        self.changed.emit()
+        with self.transaction():
+            for index, unit in enumerate(self):
+                if unit.linked:
+                    self._set(unit, attribute, values[index])
+
+    def _set(self, unit: Sensor, attribute: str, value) -> None:
+        old = getattr(unit, attribute)
+        setattr(unit, attribute, value)
+        self._logger.debug(f"set sensor({unit.serial_number}).{attribute} = {value}")
+
+        key = (unit.serial_number, attribute)
+        if pending := self._pending_changes.get(key):
+            old = pending.old
+        self._pending_changes[key] = SensorChange(unit.serial_number, attribute, old, value)
+
+    def _notify(self):
+        # a value written back to what it was is no change at all
+        changes = tuple(change for change in self._pending_changes.values() if change.old != change.new)
+        self._pending_changes.clear()
+
+        if changes:
+            # noinspection PyUnresolvedReferences
+            self.sensors_changed.emit(changes)
+            # noinspection PyUnresolvedReferences
+            self.changed.emit()
 
     # "private" interface
     def _append(self, sensor: Sensor):
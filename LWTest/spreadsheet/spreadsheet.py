@@ -2,21 +2,22 @@
 import contextlib
 import datetime
 import logging
-import sys
 from pathlib import Path
-from typing import Tuple, Optional
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
 
 import openpyxl
 from openpyxl.workbook.workbook import Worksheet as openpyxlWorksheet, Workbook
+from openpyxl.worksheet.protection import SheetProtection
 from openpyxl.worksheet.worksheet import Worksheet
 
 import LWTest.utilities.misc
 import LWTest.utilities.time
-from LWTest.spreadsheet import constants
-from LWTest.utilities import returns
+from LWTest.sensor import MISSING, Sensor
+from LWTest.spreadsheet import constants, xmlpatch
+from LWTest.utilities import returns, trace
 
 
-def rssi_conversion(value: str):
+def rssi_conversion(value: Union[str, float]):
     try:
         return int(value)
     except ValueError:
@@ -28,9 +29,165 @@ _CONVERSIONS = [float, float, float, int,
                 float, float, float, str,
                 str, str, rssi_conversion, str, float, str]
 
+_DATA_IN_SPREADSHEET_ORDER = ("high_voltage", "high_current", "high_power_factor", "high_real_power",
+                              "low_voltage", "low_current", "low_power_factor", "low_real_power",
+                              "scale_current", "scale_voltage", "correction_angle", "persists",
+                              "firmware_version", "reporting_data", "rssi", "calibrated",
+                              "temperature", "fault_current")
+
+
+class TestRecord:
+    """An ATR workbook held in memory so several updates cost one load and one save.
+
+    Used as a context manager the workbook is written back on a clean exit, and only if it was changed.
+    """
+
+    def __init__(self, path: str):
+        self._path = path
+        self._workbook: Optional[Workbook] = None
+        self._modified = False
+
+    @property
+    def path(self) -> str:
+        return self._path
+
+    @property
+    def worksheet(self) -> openpyxlWorksheet:
+        assert self._workbook is not None, "test record is not open"
+        return _get_worksheet_from_workbook(self._workbook)
+
+    def open(self) -> "TestRecord":
+        if self._workbook is None:
+            self._workbook = _open_workbook(self._path)
+            self._modified = False
+
+        return self
+
+    def save(self) -> None:
+        assert self._workbook is not None, "test record is not open"
+        self._workbook.save(self._path)
+        self._modified = False
+
+    def close(self) -> None:
+        if self._workbook:
+            self._workbook.close()
+            self._workbook = None
+
+    def get_serial_numbers(self) -> Tuple[str]:
+        return _extract_serial_numbers_from_worksheet(self.worksheet)
+
+    def enter_serial_numbers(self, serial_numbers) -> None:
+        _enter_serial_numbers_in_worksheet(serial_numbers, self.worksheet)
+        self._modified = True
+
+    def save_test_results(self, data_sets, references) -> None:
+        worksheet = self.worksheet
+        temperature_reference, high_references, low_references = references
+
+        _save_reference_data(worksheet, temperature_reference, high_references, low_references)
+        _save_test_data(data_sets, worksheet)
+        _save_admin_data(worksheet)
+        _protect_worksheet(worksheet)
+        self._modified = True
+
+    def record_log_files_attached(self) -> None:
+        worksheet = self.worksheet
+        for cell in constants.LOG_FILE_CELLS:
+            worksheet[cell] = str('Yes')
+        self._modified = True
+
+    def __enter__(self) -> "TestRecord":
+        return self.open()
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        try:
+            if exc_type is None and self._modified:
+                self.save()
+        finally:
+            self.close()
+
+
+class _BufferedCell:
+    __slots__ = ("value",)
+
+    def __init__(self):
+        self.value = None
+
+
+class _CellBuffer:
+    """Stands in for the worksheet, collecting the cells written to it."""
+
+    def __init__(self):
+        self.cells: Dict[str, _BufferedCell] = {}
+        self.protection = SheetProtection()
+
+    def __getitem__(self, reference: str) -> _BufferedCell:
+        return self.cells.setdefault(reference, _BufferedCell())
+
+    def __setitem__(self, reference: str, value) -> None:
+        self[reference].value = value
+
+
+class XMLTestRecord(TestRecord):
+    """A TestRecord that saves by patching the worksheet XML inside the .xlsm.
+
+    Only the written cells and the sheet protection change, every other part of the file
+    is copied as is. Packages the patcher can not handle are saved with openpyxl instead.
+    """
+
+    def __init__(self, path: str):
+        super().__init__(path)
+        self._buffer: Optional[_CellBuffer] = None
+
+    @property
+    def worksheet(self) -> _CellBuffer:
+        assert self._buffer is not None, "test record is not open"
+        return self._buffer
+
+    def open(self) -> "XMLTestRecord":
+        if self._buffer is None:
+            self._buffer = _CellBuffer()
+            self._modified = False
+
+        return self
+
+    @trace.traced("spreadsheet save", "spreadsheet")
+    def save(self) -> None:
+        values = {reference: cell.value for reference, cell in self.worksheet.cells.items()}
+        protection = self.worksheet.protection
+        password_hash = protection.password if protection.sheet else None
+
+        try:
+            xmlpatch.patch_workbook(self._path, constants.WORKSHEET_NAME, values, password_hash)
+        except xmlpatch.PatchError as e:
+            logging.getLogger(__name__).debug(f"unable to patch '{self._path}' ({e}), saving with openpyxl")
+            self._save_with_openpyxl(values, protection.sheet)
+
+        self._modified = False
+
+    def close(self) -> None:
+        self._buffer = None
+
+    def get_serial_numbers(self) -> Tuple[str]:
+        with TestRecord(self._path) as record:
+            return record.get_serial_numbers()
+
+    def _save_with_openpyxl(self, values, protect: bool) -> None:
+        record = TestRecord(self._path).open()
+        try:
+            worksheet = record.worksheet
+            for reference, value in values.items():
+                worksheet[reference].value = value
+            if protect:
+                _protect_worksheet(worksheet)
+            record.save()
+        finally:
+            record.close()
+
 
 def create_test_record(serial_numbers, path: str):
-    _enter_serial_numbers_in_worksheet(serial_numbers, _get_worksheet_from_workbook(path), path)
+    with XMLTestRecord(path) as record:
+        record.enter_serial_numbers(serial_numbers)
 
 
 def get_serial_numbers(path: str) -> Tuple[str]:
@@ -46,48 +203,48 @@ def get_serial_numbers(path: str) -> Tuple[str]:
             a tuple of strings representing sensor serial numbers
     """
 
-    return _extract_serial_numbers_from_worksheet(_get_worksheet_from_workbook(path))
+    with TestRecord(path) as record:
+        return record.get_serial_numbers()
 
 
-def save_test_results(path, data_sets, references) -> returns.Result:
-    worksheet = _get_worksheet_from_workbook(path)
-    temperature_reference, high_references, low_references = references
+def package_test_results(sensors: Iterable[Sensor]) -> List[List[Tuple[str, Any]]]:
+    """Pairs each sensor's readings with the cells of its phase, ready for save_test_results."""
+    data_sets = []
+    for index, unit in enumerate(sensors):
+        phase_cells = constants.PhaseReadingsCells(*constants.phases_cells[index])
+        # numeric readings were parsed when they were recorded
+        data_sets.append(list(zip(phase_cells, (unit.parsed(field) for field in _DATA_IN_SPREADSHEET_ORDER))))
 
-    _save_reference_data(worksheet, temperature_reference, high_references, low_references)
-    _save_test_data(data_sets, worksheet)
-    _save_admin_data(worksheet)
-    _protect_worksheet(worksheet)
-    _save_workbook(path)
+    return data_sets
+
+
+def save_test_results(path, data_sets, references) -> returns.Result:
+    with XMLTestRecord(path) as record:
+        record.save_test_results(data_sets, references)
 
     return returns.Result(True, True)
 
 
 def record_log_files_attached(workbook_path: str):
-    worksheet = _get_worksheet_from_workbook(workbook_path)
-    for cell in constants.LOG_FILE_CELLS:
-        worksheet[cell] = str('Yes')
-
-    _save_workbook(workbook_path)
+    with XMLTestRecord(workbook_path) as record:
+        record.record_log_files_attached()
 
 
 # -------------------
 # private interface -
 # -------------------
-_workbook: Optional[Workbook] = None
-
-
 def _convert_reading_for_spreadsheet(reading, conversion):
+    if isinstance(reading, str):
+        reading = LWTest.utilities.misc.normalize_reading(reading)
+
     with contextlib.suppress(ValueError):
-        return conversion(LWTest.utilities.misc.normalize_reading(reading))
+        return conversion(reading)
 
 
-def _enter_serial_numbers_in_worksheet(serial_numbers, worksheet: openpyxlWorksheet, path: str):
+def _enter_serial_numbers_in_worksheet(serial_numbers, worksheet: openpyxlWorksheet):
     for index, serial_number in enumerate(serial_numbers):
         worksheet[constants.SERIAL_LOCATIONS[index]].value = int(serial_numbers[index])
 
-    _save_workbook(path)
-    _close_workbook()
-
 
 def _extract_serial_numbers_from_worksheet(worksheet: openpyxlWorksheet) -> Tuple[str]:
     logger = logging.getLogger(__name__)
@@ -95,52 +252,35 @@ def _extract_serial_numbers_from_worksheet(worksheet: openpyxlWorksheet) -> Tupl
     serial_numbers = [str(worksheet[serial_location].value) for serial_location in constants.SERIAL_LOCATIONS
                       if str(worksheet[serial_location].value) != 'None']
 
-    _close_workbook()
-
     logger.debug(f"Extracted serial numbers: {serial_numbers}")
 
     return tuple(serial_numbers)
 
 
-def _open_workbook(filename: str):
-    global _workbook
+@trace.traced("spreadsheet load", "spreadsheet")
+def _open_workbook(filename: str) -> Workbook:
     logger = logging.getLogger(__name__)
 
     try:
         # read_only=False, keep_vba=True prevent Excel from thinking the spreadsheet has been corrupted
-        _workbook = openpyxl.load_workbook(filename=filename, read_only=False, keep_vba=True)
+        return openpyxl.load_workbook(filename=filename, read_only=False, keep_vba=True)
     except FileNotFoundError:
         logger.debug("spreadsheet not found")
         LWTest.utilities.misc.print_exception_info()
-        sys.exit(1)
+        raise
     except RuntimeError as e:
         LWTest.utilities.misc.print_exception_info()
         raise RuntimeError from e
 
 
-def _get_worksheet_from_workbook(path) -> openpyxlWorksheet:
-    global _workbook
+def _get_worksheet_from_workbook(workbook: Workbook) -> openpyxlWorksheet:
     logger = logging.getLogger(__name__)
 
     try:
-        _open_workbook(path)
-        return _workbook[constants.WORKSHEET_NAME]
+        return workbook[constants.WORKSHEET_NAME]
     except KeyError:
         logger.debug(f"Worksheet '{constants.WORKSHEET_NAME}' does not exist. Check the spelling in config.txt.")
-        sys.exit(1)
-
-
-def _save_workbook(path):
-    _workbook.save(path)
-    _close_workbook()
-
-
-def _close_workbook():
-    global _workbook
-
-    if _workbook:
-        _workbook.close()
-        _workbook = None
+        raise
 
 
 def _protect_worksheet(worksheet):
@@ -179,7 +319,8 @@ def _save_reference_data(worksheet, temperature_reference, high_references, low_
 def _save_test_data(data_sets, worksheet):
     for data_set in data_sets:
         for index, (location, reading) in enumerate(data_set):
-            if not reading or reading == 'NA':
+            # 0.0 is a reading, only skip what was never read
+            if reading is MISSING or reading in ('', 'NA'):
                 continue
 
             _save_data_to_cell(
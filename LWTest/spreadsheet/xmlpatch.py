@@ -0,0 +1,224 @@
+# spreadsheet/xmlpatch.py
+"""Writes cell values straight into one worksheet's XML inside an .xlsx/.xlsm package.
+
+Apart from flagging the workbook for a full recalculation on load, every other member of the package
+(VBA project, styles, the other sheets...) is copied through untouched.
+Raises PatchError for anything it does not handle so the caller can fall back to openpyxl.
+"""
+import datetime
+import math
+import os
+import posixpath
+import re
+import shutil
+import tempfile
+import zipfile
+from typing import Any, Dict, List, Optional, Tuple
+from xml.etree import ElementTree
+from xml.sax.saxutils import escape
+
+from openpyxl.utils.cell import column_index_from_string, coordinate_from_string
+from openpyxl.utils.datetime import to_excel
+
+_MAIN_NS = "http://schemas.openxmlformats.org/spreadsheetml/2006/main"
+_REL_NS = "http://schemas.openxmlformats.org/officeDocument/2006/relationships"
+_PACKAGE_REL_NS = "http://schemas.openxmlformats.org/package/2006/relationships"
+
+_SHEET_DATA_REGEX = re.compile(r"<sheetData\s*/>|<sheetData>(.*?)</sheetData>", re.S)
+_ROW_REGEX = re.compile(r"<row\b([^>]*?)(?:/>|>(.*?)</row>)", re.S)
+_CELL_REGEX = re.compile(r"<c\b([^>]*?)(?:/>|>(.*?)</c>)", re.S)
+# attribute values are kept in their escaped form and written back as they were read
+_ATTRIBUTE_REGEX = re.compile(r'([\w:]+)="([^"]*)"')
+_SHEET_PROTECTION_REGEX = re.compile(r"<sheetProtection\b([^>]*?)/>")
+_SHEET_CALC_PR_REGEX = re.compile(r"<sheetCalcPr\b[^>]*?/>")
+_CALC_PR_REGEX = re.compile(r"<calcPr\b([^>]*?)/>")
+# calcPr follows these in CT_Workbook
+_CALC_PR_ANCHOR_REGEX = re.compile(r"</(?:sheets|functionGroups|externalReferences|definedNames)>|"
+                                   r"<(?:functionGroups|externalReferences|definedNames)\b[^>]*?/>")
+_WORKBOOK_MEMBER = "xl/workbook.xml"
+
+
+class PatchError(Exception):
+    pass
+
+
+def patch_workbook(path: str, sheet_name: str, values: Dict[str, Any], password_hash: Optional[str] = None) -> None:
+    """Sets each 'values' cell of 'sheet_name' and, if a password hash is given, protects the sheet."""
+    with zipfile.ZipFile(path) as source:
+        sheet_member = _find_sheet_member(source, sheet_name)
+        if "xl/calcChain.xml" in source.namelist() and _overwrites_formula(source.read(sheet_member), values):
+            raise PatchError("overwriting formula cells requires rebuilding the calculation chain")
+
+        patched = patch_sheet_xml(source.read(sheet_member).decode("utf-8"), values, password_hash)
+        # cached formula results still reflect the old inputs, so have Excel/LibreOffice recalculate on open
+        workbook = force_full_calculation(source.read(_WORKBOOK_MEMBER).decode("utf-8"))
+
+        directory = os.path.dirname(os.path.abspath(path))
+        handle, temporary_path = tempfile.mkstemp(suffix=".tmp", dir=directory)
+        os.close(handle)
+        try:
+            with zipfile.ZipFile(temporary_path, "w") as target:
+                for info in source.infolist():
+                    if info.filename == sheet_member:
+                        target.writestr(info, patched.encode("utf-8"))
+                    elif info.filename == _WORKBOOK_MEMBER:
+                        target.writestr(info, workbook.encode("utf-8"))
+                    else:
+                        target.writestr(info, source.read(info))
+            shutil.copymode(path, temporary_path)
+        except BaseException:
+            os.remove(temporary_path)
+            raise
+
+    os.replace(temporary_path, path)
+
+
+def patch_sheet_xml(xml: str, values: Dict[str, Any], password_hash: Optional[str] = None) -> str:
+    if not (match := _SHEET_DATA_REGEX.search(xml)):
+        raise PatchError("worksheet has no sheetData element")
+
+    rows = _parse_rows(match.group(1) or "")
+    for reference, value in values.items():
+        column, row_number = coordinate_from_string(reference)
+        attributes, cells = rows.setdefault(row_number, ({"r": str(row_number)}, {}))
+        # spans is only a load hint and may no longer cover the row's cells
+        attributes.pop("spans", None)
+        column_number = column_index_from_string(column)
+        cells[column_number] = _cell_xml(f"{column}{row_number}", value, cells.get(column_number))
+
+    sheet_data = "<sheetData>" + "".join(_row_xml(attributes, cells) for _, (attributes, cells) in
+                                         sorted(rows.items())) + "</sheetData>"
+    xml = xml[:match.start()] + sheet_data + xml[match.end():]
+
+    if password_hash is not None:
+        xml = _protect(xml, password_hash)
+
+    return xml
+
+
+def force_full_calculation(xml: str) -> str:
+    """Sets fullCalcOnLoad on the workbook's calcPr element, adding the element if it is missing."""
+    if match := _CALC_PR_REGEX.search(xml):
+        attributes = dict(_ATTRIBUTE_REGEX.findall(match.group(1)))
+        start, end = match.span()
+    else:
+        anchors = list(_CALC_PR_ANCHOR_REGEX.finditer(xml))
+        if not anchors:
+            raise PatchError("workbook has no sheets element")
+        attributes = {}
+        start = end = anchors[-1].end()
+
+    attributes["fullCalcOnLoad"] = "1"
+    calc_pr = "<calcPr" + "".join(f' {name}="{value}"' for name, value in attributes.items())
+    return xml[:start] + calc_pr + "/>" + xml[end:]
+
+
+# -- private module functions ---
+
+
+def _find_sheet_member(package: zipfile.ZipFile, sheet_name: str) -> str:
+    try:
+        workbook = ElementTree.fromstring(package.read("xl/workbook.xml"))
+        relationships = ElementTree.fromstring(package.read("xl/_rels/workbook.xml.rels"))
+    except KeyError as e:
+        raise PatchError("not a spreadsheetml package") from e
+
+    for sheet in workbook.iter(f"{{{_MAIN_NS}}}sheet"):
+        if sheet.get("name") == sheet_name:
+            relationship_id = sheet.get(f"{{{_REL_NS}}}id")
+            break
+    else:
+        raise PatchError(f"worksheet '{sheet_name}' does not exist")
+
+    for relationship in relationships.iter(f"{{{_PACKAGE_REL_NS}}}Relationship"):
+        if relationship.get("Id") == relationship_id:
+            target = relationship.get("Target")
+            if target.startswith("/"):
+                return target.lstrip("/")
+            return posixpath.normpath(posixpath.join("xl", target))
+
+    raise PatchError(f"worksheet '{sheet_name}' has no relationship")
+
+
+def _overwrites_formula(xml: bytes, values: Dict[str, Any]) -> bool:
+    text = xml.decode("utf-8")
+    for reference in values:
+        if (cell := re.search(rf'<c\b[^>]*\br="{reference}"[^>]*>(.*?)</c>', text, re.S)) and "<f" in cell.group(1):
+            return True
+
+    return False
+
+
+def _parse_rows(sheet_data: str) -> Dict[int, Tuple[Dict[str, str], Dict[int, str]]]:
+    rows = {}
+    position = 0
+    for row in _ROW_REGEX.finditer(sheet_data):
+        if sheet_data[position:row.start()].strip():
+            raise PatchError("unexpected content in sheetData")
+        position = row.end()
+
+        attributes = dict(_ATTRIBUTE_REGEX.findall(row.group(1)))
+        if "r" not in attributes:
+            raise PatchError("row without a row number")
+
+        cells = {}
+        for cell in _CELL_REGEX.finditer(row.group(2) or ""):
+            reference = dict(_ATTRIBUTE_REGEX.findall(cell.group(1))).get("r")
+            if reference is None:
+                raise PatchError("cell without a reference")
+            cells[column_index_from_string(coordinate_from_string(reference)[0])] = cell.group(0)
+
+        rows[int(attributes["r"])] = (attributes, cells)
+
+    if sheet_data[position:].strip():
+        raise PatchError("unexpected content in sheetData")
+
+    return rows
+
+
+def _row_xml(attributes: Dict[str, str], cells: Dict[int, str]) -> str:
+    opening = "<row" + "".join(f' {name}="{value}"' for name, value in attributes.items())
+    if not cells:
+        return opening + "/>"
+
+    return opening + ">" + "".join(cell for _, cell in sorted(cells.items())) + "</row>"
+
+
+def _cell_xml(reference: str, value: Any, existing: Optional[str]) -> str:
+    attributes: List[Tuple[str, str]] = [("r", reference)]
+    if existing and (style := re.search(r'\bs="(\d+)"', existing.split(">", 1)[0])):
+        attributes.append(("s", style.group(1)))
+
+    if value is None:
+        content = ""
+    elif isinstance(value, bool):
+        attributes.append(("t", "b"))
+        content = f"<v>{int(value)}</v>"
+    elif isinstance(value, (int, float)):
+        if isinstance(value, float) and not math.isfinite(value):
+            raise PatchError(f"can not store {value} in {reference}")
+        content = f"<v>{value!r}</v>" if isinstance(value, float) else f"<v>{value}</v>"
+    elif isinstance(value, (datetime.date, datetime.datetime)):
+        content = f"<v>{to_excel(value)!r}</v>"
+    elif isinstance(value, str):
+        attributes.append(("t", "inlineStr"))
+        content = f'<is><t xml:space="preserve">{escape(value)}</t></is>'
+    else:
+        raise PatchError(f"unsupported value type {type(value).__name__} for {reference}")
+
+    opening = "<c" + "".join(f' {name}="{value_}"' for name, value_ in attributes)
+    return opening + (f">{content}</c>" if content else "/>")
+
+
+def _protect(xml: str, password_hash: str) -> str:
+    if match := _SHEET_PROTECTION_REGEX.search(xml):
+        attributes = dict(_ATTRIBUTE_REGEX.findall(match.group(1)))
+        start, end = match.span()
+    else:
+        attributes = {}
+        anchor = _SHEET_CALC_PR_REGEX.search(xml)
+        start = end = anchor.end() if anchor else xml.index("</sheetData>") + len("</sheetData>")
+
+    attributes.update(password=password_hash, sheet="1")
+    protection = "<sheetProtection" + "".join(f' {name}="{value}"' for name, value in attributes.items())
+    return xml[:start] + protection + "/>" + xml[end:]
@@ -1,21 +1,114 @@
-from typing import Tuple
+import logging
+import os
+import time
+import zipfile
+from typing import Callable, NamedTuple, Optional, Tuple
 
-import shutil
-import urllib.request
 from pathlib import Path
 
+import requests
+
 import LWTest.utilities.returns as returns
 from LWTest.constants import lwt
+from LWTest.utilities import trace
+from LWTest.web.interface import sessionpool
 
+_logger = logging.getLogger(__name__)
 
-def download_log_files(path: Path) -> returns.Result:
-    try:
-        with urllib.request.urlopen(lwt.URL_LOG_FILES) as response, open(path.as_posix(), 'wb') as out_file:
-            shutil.copyfileobj(response, out_file)
-    except Exception as e:
-        return returns.Result(False, None, str(e))
+_CHUNK_SIZE = 64 * 1024
+_DOWNLOAD_ATTEMPTS = 3
+_RETRY_BACKOFF = 0.5  # seconds before resuming an interrupted download, doubled after each attempt
+_READ_TIMEOUT = 30
+_PROGRESS_INTERVAL = 0.25
+
+
+class DownloadProgress(NamedTuple):
+    bytes_received: int
+    total_bytes: Optional[int]  # None when the server does not send a length
+    bytes_per_second: float
+
+
+@trace.traced("log download", "http")
+def download_log_files(path: Path, progress: Optional[Callable[[DownloadProgress], None]] = None,
+                       url: str = lwt.URL_LOG_FILES) -> returns.Result:
+    """Downloads the collector's log files zip to 'path'.
+
+    The zip is streamed to '<path>.part', resuming with a Range request if the transfer drops,
+    and only renamed to 'path' once it passes an integrity check.
+    On success Result.value is the average transfer rate in bytes per second."""
+    partial = path.with_name(path.name + ".part")
+    resumed = partial.exists() and partial.stat().st_size > 0
+
+    error = None
+    for attempt in range(_DOWNLOAD_ATTEMPTS):
+        try:
+            rate = _download(url, partial, progress)
+        except (requests.exceptions.RequestException, OSError) as e:
+            _logger.debug(f"log file download interrupted: {e}")
+            error = e
+            if attempt + 1 < _DOWNLOAD_ATTEMPTS:
+                time.sleep(_RETRY_BACKOFF * 2 ** attempt)
+            continue
+
+        if _is_valid_zip(partial):
+            os.replace(partial, path)
+            _logger.info(f"downloaded log files to '{path}' at {rate / 1024:.1f} KiB/s")
+            return returns.Result(True, rate)
+
+        partial.unlink()
+        error = "the downloaded log files are corrupt"
+        if not resumed:
+            break
+
+        # the partial file was left over from an earlier log file zip, start over
+        resumed = False
+
+    return returns.Result(False, None, str(error))
 
-    return returns.Result(True, None)
+
+def _download(url: str, partial: Path, progress: Optional[Callable[[DownloadProgress], None]]) -> float:
+    offset = partial.stat().st_size if partial.exists() else 0
+    headers = {"Range": f"bytes={offset}-"} if offset else {}
+
+    with sessionpool.get(url, headers=headers, stream=True,
+                         timeout=(lwt.TimeOut.URL_REQUEST.value, _READ_TIMEOUT)) as response:
+        if response.status_code == 416:  # the partial file is already complete
+            return 0.0
+
+        response.raise_for_status()
+        if response.status_code != 206:
+            offset = 0
+
+        length = response.headers.get("Content-Length")
+        total = offset + int(length) if length is not None else None
+
+        received = offset
+        start = last_report = time.monotonic()
+        with open(partial, "ab" if offset else "wb") as out_file:
+            for chunk in response.iter_content(chunk_size=_CHUNK_SIZE):
+                out_file.write(chunk)
+                received += len(chunk)
+
+                if progress and (now := time.monotonic()) - last_report >= _PROGRESS_INTERVAL:
+                    last_report = now
+                    progress(DownloadProgress(received, total, (received - offset) / (now - start)))
+
+        rate = (received - offset) / max(time.monotonic() - start, 1e-6)
+        if progress:
+            progress(DownloadProgress(received, total, rate))
+
+        if total is not None and received < total:
+            raise requests.exceptions.ChunkedEncodingError(f"connection closed after {received} of {total} bytes")
+
+        return rate
+
+
+def _is_valid_zip(path: Path) -> bool:
+    try:
+        with zipfile.ZipFile(path) as archive:
+            return archive.testzip() is None
+    except (zipfile.BadZipFile, OSError):
+        return False
 
 
 def _create_serial_string(prefix: str, serial_numbers: Tuple[str, ...]) -> str:
@@ -0,0 +1,166 @@
+# utilities/trace.py
+"""Timing spans around the hot paths: page loads, scrapes, configuration submits, spreadsheet I/O
+and the worker loops.
+
+Tracing is off unless enabled ('TRACE' on the command line), and a disabled span costs one
+flag check. An enabled run is saved as Chrome trace-event JSON, open it in chrome://tracing or
+https://ui.perfetto.dev, with a summary of where the time went written to the log.
+
+    with trace.span("page load", "http", url=url):
+        ...
+
+    @trace.traced("spreadsheet save", "spreadsheet")
+    def save(...):
+"""
+import contextlib
+import datetime
+import functools
+import json
+import logging
+import threading
+import time
+from collections import defaultdict
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+_logger = logging.getLogger(__name__)
+
+_MAIN_SESSION = "LWTest"
+
+_enabled = False
+_lock = threading.Lock()
+_events: List[dict] = []
+_sessions: Dict[str, int] = {_MAIN_SESSION: 1}  # session name -> trace process id
+_threads: Dict[Tuple[int, int], str] = {}  # (process id, thread id) -> thread name
+_local = threading.local()
+
+
+class _Span:
+    __slots__ = ("_name", "_category", "_args", "_start")
+
+    def __init__(self, name: str, category: str, args: dict):
+        self._name = name
+        self._category = category
+        self._args = args
+
+    def __enter__(self):
+        self._start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *_):
+        end = time.perf_counter_ns()
+        thread = threading.current_thread()
+        pid = _sessions.get(getattr(_local, "session", _MAIN_SESSION), 1)
+        event = {
+            "name": self._name, "cat": self._category, "ph": "X",
+            "ts": self._start / 1000, "dur": (end - self._start) / 1000, "pid": pid, "tid": thread.ident,
+        }
+        if self._args:
+            event["args"] = {key: str(value) for key, value in self._args.items()}
+
+        with _lock:
+            _events.append(event)
+            _threads[(pid, thread.ident)] = thread.name
+
+
+_NULL_SPAN = contextlib.nullcontext()
+
+
+def enable(enabled: bool = True) -> None:
+    global _enabled
+    _enabled = enabled
+
+
+def is_enabled() -> bool:
+    return _enabled
+
+
+def span(name: str, category: str = "", **args):
+    """Times the with block. 'args' are shown with the span in the trace viewer."""
+    if not _enabled:
+        return _NULL_SPAN
+
+    return _Span(name, category, args)
+
+
+def traced(name: Optional[str] = None, category: str = ""):
+    """Decorator timing every call of the function."""
+
+    def decorator(function):
+        label = name or function.__qualname__
+
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            if not _enabled:
+                return function(*args, **kwargs)
+
+            with _Span(label, category, {}):
+                return function(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+@contextlib.contextmanager
+def session(name: str):
+    """Groups the spans of this thread under 'name', one track per collector session in the viewer."""
+    with _lock:
+        _sessions.setdefault(name, len(_sessions) + 1)
+
+    previous = getattr(_local, "session", _MAIN_SESSION)
+    _local.session = name
+    try:
+        yield
+    finally:
+        _local.session = previous
+
+
+def reset() -> None:
+    with _lock:
+        _events.clear()
+        _threads.clear()
+        for name in list(_sessions)[1:]:
+            del _sessions[name]
+
+
+def events() -> List[dict]:
+    with _lock:
+        return list(_events)
+
+
+def export(path: Path) -> None:
+    """Writes the spans recorded so far as Chrome trace-event JSON."""
+    with _lock:
+        metadata = [{"name": "process_name", "ph": "M", "pid": pid, "args": {"name": name}}
+                    for name, pid in _sessions.items()]
+        metadata += [{"name": "thread_name", "ph": "M", "pid": pid, "tid": tid, "args": {"name": name}}
+                     for (pid, tid), name in _threads.items()]
+        document = {"traceEvents": metadata + _events, "displayTimeUnit": "ms"}
+
+    path.write_text(json.dumps(document))
+
+
+def summary() -> str:
+    """A table of the recorded spans by category and name, most total time first."""
+    durations = defaultdict(list)
+    for event in events():
+        durations[(event["cat"], event["name"])].append(event["dur"] / 1000)
+
+    lines = [f"{'category':<14}{'span':<36}{'count':>7}{'total ms':>12}{'mean ms':>10}{'max ms':>10}"]
+    for (category, name), values in sorted(durations.items(), key=lambda item: -sum(item[1])):
+        lines.append(f"{category:<14}{name:<36}{len(values):>7}{sum(values):>12.1f}"
+                     f"{sum(values) / len(values):>10.1f}{max(values):>10.1f}")
+
+    return "\n".join(lines)
+
+
+def save(directory: Path = Path(".")) -> Optional[Path]:
+    """Exports the trace to 'directory' and logs the summary. Does nothing if tracing is off."""
+    if not _enabled or not _events:
+        return None
+
+    path = directory / f"trace-{datetime.datetime.now():%Y%m%d-%H%M%S}.json"
+    export(path)
+    _logger.info(f"saved trace to '{path}'\n{summary()}")
+    return path
@@ -0,0 +1,32 @@
+# utilities/wait.py
+"""Waits for a state instead of for a time.
+
+    wait_until(probes.page_reachable(url), timeout=30)
+
+polls the condition every 'interval' seconds and returns its first truthy result, so a step
+goes on as soon as the collector is ready and only the slowest case pays the whole timeout."""
+import time
+from typing import Callable, TypeVar
+
+T = TypeVar("T")
+
+POLL_INTERVAL = 0.1
+
+
+class WaitTimeout(Exception):
+    pass
+
+
+def wait_until(condition: Callable[[], T], timeout: float, interval: float = POLL_INTERVAL, message: str = "") -> T:
+    """Raises WaitTimeout if the condition is still false after 'timeout' seconds.
+    The condition is always tried at least once, even with no time to wait."""
+    deadline = time.monotonic() + timeout
+    while True:
+        if result := condition():
+            return result
+
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            raise WaitTimeout(message or f"condition not met within {timeout} seconds")
+
+        time.sleep(min(interval, remaining))
@@ -0,0 +1,218 @@
+# authentication.py
+"""Logs in to a collector once and shares its session cookie.
+
+The cookie is cached per collector host and handed to the pooled HTTP sessions, to any other
+requests.Session used with the host and to every browser that navigates there, so the headless
+driver, the visible browser and the HTTP clients all ride on one login.
+
+An expired or missing login shows up as a redirect to the login page (or a 401/403), that is
+when the collector is logged in to again. The collector can also serve the login form in place
+of the page asked for with a 200, so a page holding the login form's user name field counts too."""
+import logging
+import os
+import re
+import threading
+import weakref
+from collections import namedtuple
+from typing import Dict, Optional
+from urllib.parse import urlsplit
+
+import requests
+from selenium import webdriver
+
+from LWTest.web.interface import form, sessionpool
+
+_logger = logging.getLogger(__name__)
+
+# the login form's user name field, dom.LOGIN_USERNAME_FIELD, no other collector page has one
+LOGIN_FORM_SELECTOR = "input#username"
+_LOGIN_FORM_REGEX = re.compile(r"""<input\b[^>]*\bid\s*=\s*["']?username["'\s/>]""", re.IGNORECASE)
+
+Credentials = namedtuple("Credentials", "user_name password")
+_credentials = Credentials(
+    user_name=os.getenv("LWTESTADMIN"),
+    password=os.getenv("LWTESTADMINPASSWORD")
+)
+
+
+class LoginError(Exception):
+    pass
+
+
+def credentials() -> Credentials:
+    """The collector login, from the LWTESTADMIN and LWTESTADMINPASSWORD environment variables."""
+    return _credentials
+
+
+def is_login_url(url: str) -> bool:
+    return "login" in urlsplit(url).path.lower()
+
+
+def is_login_page(page_source: str) -> bool:
+    return bool(_LOGIN_FORM_REGEX.search(page_source))
+
+
+def is_login_response(response: requests.Response) -> bool:
+    if response.status_code in (401, 403):
+        return True
+
+    if is_login_url(response.url):
+        return bool(response.history)
+
+    return "html" in response.headers.get("Content-Type", "") and is_login_page(response.text)
+
+
+def on_login_page(driver: webdriver.Chrome) -> bool:
+    """The browser shows the login form, whether it was sent to the login page or served the form in place."""
+    return is_login_url(driver.current_url) or bool(driver.find_elements_by_css_selector(LOGIN_FORM_SELECTOR))
+
+
+def _host(url: str) -> str:
+    parts = urlsplit(url)
+    return f"{parts.scheme}://{parts.netloc}"
+
+
+class SessionManager:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._host_locks: Dict[str, threading.Lock] = {}
+        self._cookies: Dict[str, Dict[str, str]] = {}  # host -> session cookies
+        self._generations: Dict[str, int] = {}  # host -> logins so far, a new cookie each time
+        # browser -> host -> generation of its cookie, forgotten along with the browser
+        self._browsers: "weakref.WeakKeyDictionary[webdriver.Chrome, Dict[str, int]]" = weakref.WeakKeyDictionary()
+
+    def get(self, url: str, session: Optional[requests.Session] = None, **kwargs) -> requests.Response:
+        """GET 'url' as a logged in user, logging in first if the collector asks for it."""
+        session = session or sessionpool.session(url)
+        kwargs.setdefault("timeout", sessionpool.TIMEOUT)
+        host = _host(url)
+
+        generation = self._apply_to_session(session, host)
+        response = session.get(url, **kwargs)
+        if not is_login_response(response):
+            return response
+
+        self._login(session, host, response, generation)
+        response = session.get(url, **kwargs)
+        if is_login_response(response):
+            raise LoginError(f"the collector at '{host}' did not accept the login")
+
+        return response
+
+    def browser_get(self, driver: webdriver.Chrome, url: str) -> bool:
+        """Navigates 'driver' to 'url' with the shared login. Sends the browser to 'url' as is
+        when no login can be made over HTTP, returns False when it is left on the login form."""
+        if not hasattr(driver, "add_cookie"):
+            # an HTTPDriver, it logs in on its own
+            driver.get(url)
+            return True
+
+        host = _host(url)
+        if _host(driver.current_url or "") == host:
+            # cookies can only be given to a browser that is on the collector's site
+            self._apply_to_browser(driver, host)
+
+        driver.get(url)
+        if is_login_url(url) or not on_login_page(driver):
+            return True
+
+        try:
+            self.get(url)
+        except (LoginError, form.FormError, requests.exceptions.RequestException) as e:
+            _logger.debug(f"unable to log in over http: {e}")
+            return False
+
+        self._apply_to_browser(driver, host)
+        driver.get(url)
+        return not on_login_page(driver)
+
+    def adopt_browser_login(self, driver: webdriver.Chrome, url: str) -> None:
+        """Shares the login 'driver' made through the login form when none could be made over HTTP,
+        so the HTTP clients and the other browsers do not have to log in again."""
+        host = _host(url)
+        hostname = urlsplit(host).hostname
+        cookies = {cookie["name"]: cookie["value"] for cookie in driver.get_cookies()
+                   if hostname.endswith(cookie.get("domain", hostname).lstrip("."))}
+        if not cookies:
+            return
+
+        with self._lock:
+            generation = self._generations.get(host, 0) + 1
+            self._cookies[host] = cookies
+            self._generations[host] = generation
+            self._browsers.setdefault(driver, {})[host] = generation
+
+        _logger.info(f"sharing the browser's login to the collector at '{host}'")
+
+    # -- helpers ---
+
+    def _host_lock(self, host: str) -> threading.Lock:
+        with self._lock:
+            return self._host_locks.setdefault(host, threading.Lock())
+
+    def _apply_to_session(self, session: requests.Session, host: str) -> int:
+        with self._lock:
+            cookies = dict(self._cookies.get(host, {}))
+            generation = self._generations.get(host, 0)
+
+        hostname = urlsplit(host).hostname
+        for name, value in cookies.items():
+            if not any(cookie.name == name and cookie.value == value for cookie in session.cookies):
+                session.cookies.set(name, value, domain=hostname, path="/")
+
+        return generation
+
+    def _apply_to_browser(self, driver: webdriver.Chrome, host: str) -> None:
+        with self._lock:
+            cookies = dict(self._cookies.get(host, {}))
+            generation = self._generations.get(host, 0)
+
+            if not cookies or self._browsers.get(driver, {}).get(host) == generation:
+                return
+
+        for name, value in cookies.items():
+            driver.add_cookie({"name": name, "value": value, "path": "/"})
+        with self._lock:
+            self._browsers.setdefault(driver, {})[host] = generation
+
+    def _login(self, session: requests.Session, host: str, response: requests.Response, generation: int):
+        with self._host_lock(host):
+            with self._lock:
+                logged_in_meanwhile = self._generations.get(host, 0) != generation
+
+            if logged_in_meanwhile:
+                # another client already logged in again, its cookie will do
+                self._apply_to_session(session, host)
+                return
+
+            if (login_form := form.Form.parse(response.text, response.url)) is None:
+                raise LoginError(f"no login form at '{response.url}'")
+
+            login = credentials()
+            login_form.set("username", login.user_name or "")
+            login_form.set_password(login.password or "")
+            form.submit(login_form, session)
+
+            hostname = urlsplit(host).hostname
+            cookies = {cookie.name: cookie.value for cookie in session.cookies
+                       if hostname.endswith(cookie.domain.lstrip("."))}
+            with self._lock:
+                self._cookies[host] = cookies
+                self._generations[host] = generation + 1
+
+            _logger.info(f"logged in to the collector at '{host}'")
+
+
+_manager = SessionManager()
+
+
+def get(url: str, session: Optional[requests.Session] = None, **kwargs) -> requests.Response:
+    return _manager.get(url, session, **kwargs)
+
+
+def browser_get(driver: webdriver.Chrome, url: str) -> bool:
+    return _manager.browser_get(driver, url)
+
+
+def adopt_browser_login(driver: webdriver.Chrome, url: str) -> None:
+    _manager.adopt_browser_login(driver, url)
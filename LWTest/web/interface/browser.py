@@ -0,0 +1,15 @@
+import logging
+
+from selenium import webdriver
+
+from LWTest.constants.lwt_constants.driver import CHROMEDRIVER_PATH
+
+_logger = logging.getLogger(__name__)
+
+
+def create_headless_browser() -> webdriver.Chrome:
+    options = webdriver.ChromeOptions()
+    options.add_argument("headless=True")
+    driver = webdriver.Chrome(executable_path=CHROMEDRIVER_PATH, options=options)
+    _logger.info("created headless driver")
+    return driver
@@ -0,0 +1,138 @@
+# form.py
+"""Submits collector forms over HTTP the way a browser would, without a browser.
+
+A Form is read from the page it is on, so fields LWTest does not set are sent back unchanged,
+then the fields to change are set and the whole form goes in one POST."""
+import logging
+from typing import Dict, List, Optional, Sequence, Tuple
+from urllib.parse import urljoin
+
+import requests
+
+from LWTest.web.interface import httpdriver, sessionpool
+
+_logger = logging.getLogger(__name__)
+
+_UNSUBMITTED_INPUT_TYPES = frozenset(("submit", "button", "reset", "image", "file"))
+
+
+class FormError(Exception):
+    pass
+
+
+class Form:
+    def __init__(self, action: str, method: str, fields: Dict[str, str],
+                 password_field: Optional[str] = None, submit: Optional[Tuple[str, str]] = None,
+                 inputs: Sequence[Tuple[str, str]] = ()):
+        self.action = action
+        self.method = method
+        self.fields = fields
+        self.password_field = password_field
+        self.inputs = list(inputs)  # (name, type) of every named input, in page order
+        self._submit = submit
+
+    @classmethod
+    def parse(cls, page_source: str, url: str) -> Optional["Form"]:
+        """The first form on the page, None if there is none. 'url' is where the page came from."""
+        if not (forms := httpdriver.select(httpdriver.parse_html(page_source), "form")):
+            return None
+
+        node = forms[0]
+        fields, password_field, submit, inputs = {}, None, None, []
+        for element in node.iter():
+            name = element.attributes.get("name")
+            if element.tag == "input":
+                type_ = element.attributes.get("type", "text").lower()
+                if type_ == "password" and password_field is None:
+                    password_field = name
+                if not name:
+                    continue
+                inputs.append((name, type_))
+                if type_ == "submit" and submit is None:
+                    submit = (name, element.attributes.get("value", ""))
+                if type_ in _UNSUBMITTED_INPUT_TYPES:
+                    continue
+                if type_ in ("checkbox", "radio") and "checked" not in element.attributes:
+                    continue
+                fields[name] = element.attributes.get("value", "on" if type_ == "checkbox" else "")
+            elif element.tag == "select" and name:
+                options = httpdriver.select(element, "option")
+                selected = [option for option in options if "selected" in option.attributes] or options[:1]
+                if selected:
+                    fields[name] = selected[0].attributes.get("value", selected[0].text_content.strip())
+            elif element.tag == "textarea" and name:
+                fields[name] = element.text_content
+
+        action = urljoin(url, node.attributes.get("action") or url)
+        return cls(action, node.attributes.get("method", "get").lower(), fields, password_field, submit, inputs)
+
+    def names(self, type_: str, prefix: str = "") -> List[str]:
+        """The names of the inputs of 'type_' starting with 'prefix', in page order."""
+        return [name for name, input_type in self.inputs if input_type == type_ and name.startswith(prefix)]
+
+    def set(self, name: str, value: str) -> None:
+        self.fields[name] = value
+
+    def uncheck(self, name: str) -> None:
+        self.fields.pop(name, None)
+
+    def set_password(self, password: str) -> None:
+        if self.password_field is None:
+            raise FormError("the form has no password field")
+        self.fields[self.password_field] = password
+
+    @property
+    def data(self) -> List[Tuple[str, str]]:
+        data = list(self.fields.items())
+        if self._submit:
+            data.append(self._submit)
+        return data
+
+
+def changed_fields(current: Dict[str, str], targets: Dict[str, str]) -> Dict[str, str]:
+    """The 'targets' whose values differ from the 'current' ones, numbers compared by value ("0" == "0.0")."""
+    return {name: value for name, value in targets.items() if not _same_value(current.get(name), value)}
+
+
+def _same_value(current: Optional[str], target: str) -> bool:
+    if current is None:
+        return False
+
+    try:
+        return float(current) == float(target)
+    except ValueError:
+        return current.strip() == target
+
+
+def fetch(url: str, session: Optional[requests.Session] = None) -> Form:
+    """Loads the form on the page at 'url', logging in first if the collector asks for it."""
+    from LWTest.web.interface import authentication
+
+    try:
+        response = authentication.get(url, session)
+    except authentication.LoginError as e:
+        raise FormError(str(e)) from e
+    except requests.exceptions.RequestException as e:
+        raise FormError(f"unable to load '{url}': {e}") from e
+
+    if response.status_code != 200 or (form := Form.parse(response.text, response.url or url)) is None:
+        raise FormError(f"no form found at '{url}' (status {response.status_code})")
+
+    return form
+
+
+def submit(form: Form, session: Optional[requests.Session] = None) -> requests.Response:
+    session = session or sessionpool.session(form.action)
+    try:
+        if form.method == "post":
+            response = session.post(form.action, data=form.data, timeout=sessionpool.TIMEOUT)
+        else:
+            response = session.get(form.action, params=form.data, timeout=sessionpool.TIMEOUT)
+    except requests.exceptions.RequestException as e:
+        raise FormError(f"unable to submit to '{form.action}': {e}") from e
+
+    if response.status_code >= 400:
+        raise FormError(f"'{form.action}' rejected the form (status {response.status_code})")
+
+    return response
+
@@ -0,0 +1,288 @@
+import logging
+import re
+from html.parser import HTMLParser
+from typing import Callable, Dict, List, Optional
+
+import requests
+from selenium import webdriver
+from selenium.webdriver.common.by import By
+
+from LWTest.utilities import trace
+from LWTest.web.interface import authentication
+
+_VOID_ELEMENTS = frozenset(
+    ("area", "base", "br", "col", "embed", "hr", "img", "input", "link", "meta", "param", "source", "track", "wbr")
+)
+
+_ATTRIBUTE_PATTERN = r"\[\s*([\w-]+)\s*(?:([\^$*]?=)\s*(?:'([^']*)'|\"([^\"]*)\"|([^\]\s]+))\s*)?\]"
+_COMPOUND_TOKEN_REGEX = re.compile(
+    r"(?P<tag>^[\w*]+)|\.(?P<cls>[\w-]+)|#(?P<id>[\w-]+)|"
+    rf"(?P<attr>{_ATTRIBUTE_PATTERN})|:not\((?P<neg>[^)]*)\)"
+)
+_ATTRIBUTE_REGEX = re.compile(_ATTRIBUTE_PATTERN)
+
+
+class HTMLNode:
+    """A parsed element that answers the subset of the WebElement interface used by the readers."""
+
+    def __init__(self, tag: str, attributes: Dict[str, str], parent: Optional["HTMLNode"]):
+        self.tag = tag
+        self.attributes = attributes
+        self.parent = parent
+        self.children: list = []
+
+    @property
+    def classes(self) -> List[str]:
+        return self.attributes.get("class", "").split()
+
+    @property
+    def text_content(self) -> str:
+        return "".join(child if isinstance(child, str) else child.text_content for child in self.children)
+
+    def get_attribute(self, name: str) -> Optional[str]:
+        if name == "textContent":
+            return self.text_content
+
+        if name == "value" and self.tag == "input":
+            return self.attributes.get("value", "")
+
+        return self.attributes.get(name)
+
+    def iter(self):
+        for child in self.children:
+            if isinstance(child, HTMLNode):
+                yield child
+                yield from child.iter()
+
+    def __repr__(self):
+        return f"HTMLNode({self.tag!r}, {self.attributes!r})"
+
+
+class _DocumentBuilder(HTMLParser):
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.root = HTMLNode("#document", {}, None)
+        self._current = self.root
+
+    def handle_starttag(self, tag, attrs):
+        node = HTMLNode(tag, {name: value if value is not None else "" for name, value in attrs}, self._current)
+        self._current.children.append(node)
+        if tag not in _VOID_ELEMENTS:
+            self._current = node
+
+    def handle_startendtag(self, tag, attrs):
+        node = HTMLNode(tag, {name: value if value is not None else "" for name, value in attrs}, self._current)
+        self._current.children.append(node)
+
+    def handle_endtag(self, tag):
+        # tolerate unbalanced markup by closing back to the nearest matching open element
+        node = self._current
+        while node is not self.root and node.tag != tag:
+            node = node.parent
+
+        if node is not self.root:
+            self._current = node.parent
+
+    def handle_data(self, data):
+        self._current.children.append(data)
+
+
+class _AttributeTest:
+    def __init__(self, name: str, operator: Optional[str], value: Optional[str]):
+        self._name = name
+        self._operator = operator
+        self._value = value
+
+    def matches(self, node: HTMLNode) -> bool:
+        if self._name not in node.attributes:
+            return False
+
+        actual = node.attributes[self._name]
+        if self._operator is None:
+            return True
+        if self._operator == "=":
+            return actual == self._value
+        if self._operator == "^=":
+            return actual.startswith(self._value)
+        if self._operator == "$=":
+            return actual.endswith(self._value)
+
+        return self._value in actual
+
+
+class _CompoundSelector:
+    def __init__(self, text: str):
+        self.tag: Optional[str] = None
+        self.classes: List[str] = []
+        self.id: Optional[str] = None
+        self.tests: List[_AttributeTest] = []
+        self.negations: List[_CompoundSelector] = []
+
+        position = 0
+        while position < len(text):
+            match = _COMPOUND_TOKEN_REGEX.match(text, position)
+            if match is None or match.end() == position:
+                raise ValueError(f"unsupported css selector: '{text}'")
+
+            if match["tag"]:
+                self.tag = None if match["tag"] == "*" else match["tag"].lower()
+            elif match["cls"]:
+                self.classes.append(match["cls"])
+            elif match["id"]:
+                self.id = match["id"]
+            elif match["attr"]:
+                self.tests.append(_attribute_test(match["attr"]))
+            else:
+                self.negations.append(_CompoundSelector(match["neg"].strip()))
+
+            position = match.end()
+
+    def matches(self, node: HTMLNode) -> bool:
+        if self.tag and node.tag != self.tag:
+            return False
+        if self.id and node.attributes.get("id") != self.id:
+            return False
+        if self.classes and not set(self.classes).issubset(node.classes):
+            return False
+        if not all(test.matches(node) for test in self.tests):
+            return False
+
+        return not any(negation.matches(node) for negation in self.negations)
+
+
+def _attribute_test(text: str) -> _AttributeTest:
+    name, operator, single, double, bare = _ATTRIBUTE_REGEX.match(text).groups()
+    value = next((v for v in (single, double, bare) if v is not None), None)
+    return _AttributeTest(name, operator, value)
+
+
+class CSSSelector:
+    """Compiled form of the small CSS subset the collector scrapes use:
+    type, class, id and attribute selectors, :not() and the child and descendant combinators."""
+
+    def __init__(self, selector: str):
+        self.selector = selector
+        self._steps = []  # (combinator, compound) pairs, evaluated right to left
+
+        combinator = " "
+        for token in re.split(r"\s*(>)\s*|\s+", selector.strip()):
+            if token is None or token == "":
+                continue
+            if token == ">":
+                combinator = ">"
+                continue
+            self._steps.append((combinator, _CompoundSelector(token)))
+            combinator = " "
+
+        if not self._steps:
+            raise ValueError(f"empty css selector: '{selector}'")
+
+    def matches(self, node: HTMLNode) -> bool:
+        return self._matches_from(node, len(self._steps) - 1)
+
+    def _matches_from(self, node: HTMLNode, index: int) -> bool:
+        combinator, compound = self._steps[index]
+        if not compound.matches(node):
+            return False
+        if index == 0:
+            return True
+
+        if combinator == ">":
+            return node.parent is not None and self._matches_from(node.parent, index - 1)
+
+        ancestor = node.parent
+        while ancestor is not None:
+            if self._matches_from(ancestor, index - 1):
+                return True
+            ancestor = ancestor.parent
+
+        return False
+
+
+class HTTPDriver:
+    """Fetches collector pages over HTTP and parses them natively.
+
+    Answers the subset of the webdriver.Chrome interface used by the readers
+    (get, page_source, find_elements...) so it can be passed wherever they expect a driver.
+
+    Without a session of its own it uses the shared keep-alive sessions in sessionpool,
+    either way logging in with the shared collector login.
+
+    Locators other than css selectors are answered by the browser 'fallback' returns,
+    loaded with the same page."""
+    TIMEOUT = 10
+
+    def __init__(self, session: Optional[requests.Session] = None, timeout: float = TIMEOUT,
+                 fallback: Optional[Callable[[], webdriver.Chrome]] = None):
+        self._logger = logging.getLogger(__name__)
+        self._session = session
+        self._timeout = timeout
+        self._fallback = fallback
+        self._document: Optional[HTMLNode] = None
+        self._selections: Dict[str, List[HTMLNode]] = {}
+        self.current_url = ""
+        self.page_source = ""
+        self.status_code = 0
+
+    def get(self, url: str) -> None:
+        self.current_url = url
+        self._document = None
+        self._selections.clear()
+
+        try:
+            with trace.span("page load", "http", url=url):
+                response = authentication.get(url, self._session, timeout=self._timeout)
+                self.status_code = response.status_code
+                self.page_source = response.text
+        except (requests.exceptions.RequestException, authentication.LoginError) as exc:
+            # mirror Chrome, which shows an error page rather than raising
+            self._logger.debug(f"unable to load '{url}': {exc}")
+            self.status_code = 0
+            self.page_source = ""
+
+    def find_elements(self, by: str = By.CSS_SELECTOR, value: str = "") -> List[HTMLNode]:
+        if by != By.CSS_SELECTOR:
+            return self._find_elements_with_browser(by, value)
+
+        if value not in self._selections:
+            selector = CSSSelector(value)
+            self._selections[value] = [node for node in self._get_document().iter() if selector.matches(node)]
+
+        return list(self._selections[value])
+
+    def find_elements_by_css_selector(self, selector: str) -> List[HTMLNode]:
+        return self.find_elements(By.CSS_SELECTOR, selector)
+
+    def quit(self) -> None:
+        # the pooled sessions outlive the driver
+        if self._session is not None:
+            self._session.close()
+
+    def _find_elements_with_browser(self, by: str, value: str) -> list:
+        if self._fallback is None:
+            raise NotImplementedError(f"HTTPDriver only supports css selectors, not '{by}'")
+
+        browser = self._fallback()
+        if browser.current_url != self.current_url:
+            authentication.browser_get(browser, self.current_url)
+        self._logger.debug(f"finding '{by}' {value!r} with the browser")
+
+        return browser.find_elements(by, value)
+
+    def _get_document(self) -> HTMLNode:
+        if self._document is None:
+            self._document = parse_html(self.page_source)
+
+        return self._document
+
+
+def parse_html(text: str) -> HTMLNode:
+    builder = _DocumentBuilder()
+    builder.feed(text)
+    builder.close()
+    return builder.root
+
+
+def select(document: HTMLNode, selector: str) -> List[HTMLNode]:
+    css = CSSSelector(selector)
+    return [node for node in document.iter() if css.matches(node)]
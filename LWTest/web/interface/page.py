@@ -1,5 +1,4 @@
 import logging
-import os
 from collections import namedtuple
 
 from selenium import webdriver
@@ -7,17 +6,14 @@ from selenium.common.exceptions import WebDriverException
 
 import LWTest.web.interface.htmlelements as html
 from LWTest.constants import dom
+from LWTest.utilities import trace
+from LWTest.web.interface import authentication
+from LWTest.web.interface.authentication import credentials
 
 _LOGIN_USERNAME_FIELD = '//*[@id="username"]'
 _LOGIN_PASSWORD_FIELD = '//*[@id="password"]'
 _LOGIN_BUTTON = '/html/body/div/div/form/p[3]/input'
 
-Credentials = namedtuple("Credentials", "user_name password")
-_credentials = Credentials(
-    user_name=os.getenv("LWTESTADMIN"),
-    password=os.getenv("LWTESTADMINPASSWORD")
-)
-
 LoginFields = namedtuple("LoginFields", "user_name password submit_button")
 _login_fields = LoginFields(
     user_name=html.HTMLTextInput(html.CSSXPath(_LOGIN_USERNAME_FIELD)),
@@ -29,7 +25,7 @@ _login_fields = LoginFields(
 class _Login:
     def __init__(self):
         self.__logger = logging.getLogger(__name__)
-        self.__credentials = _credentials
+        self.__credentials = credentials()
         self.__login_fields = _login_fields
         self.__logger.debug("created instance of Login class")
 
@@ -53,7 +49,8 @@ class Page:
         logger = logging.getLogger(__name__)
 
         try:
-            driver.get(url)
+            with trace.span("page load", "browser", url=url):
+                logged_in = authentication.browser_get(driver, url)
         except WebDriverException as exc:
             # this exception appears to be raised only when the webserver is not running
             logger.exception(exc)
@@ -69,9 +66,14 @@ class Page:
             logger.debug(f"Chromedriver encountered an error loading page '{url}'")
             return Page.SERVER_ERROR
 
-        if "login" in driver.page_source.lower():
-            Page._login(driver)
-            driver.get(url)
+        # the shared login was not accepted, log in with the browser instead
+        if not logged_in:
+            with trace.span("login", "browser", url=url):
+                Page._login(driver)
+                driver.get(url)
+
+            if not authentication.on_login_page(driver):
+                authentication.adopt_browser_login(driver, url)
 
         return Page.SUCCESS
 
@@ -110,6 +112,7 @@ class Submit:
         self._password_field = password_field
         self._submit_selector = submit_selector
 
+    @trace.traced("submit", "browser")
     def click(self, driver: webdriver.Chrome):
         self._password_field.fill(self._password, driver)
         self._submit_selector.click(driver)
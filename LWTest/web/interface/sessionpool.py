@@ -0,0 +1,108 @@
+# sessionpool.py
+"""Keep-alive HTTP sessions shared by every requests-based collector client.
+
+One requests.Session per collector host, so the modem status, upgrade log, reachability and
+log download polls reuse open connections instead of connecting for every request.
+Each host gets at most CONNECTIONS_PER_HOST connections, extra requests wait for a free one.
+
+Idempotent requests are retried on a dropped connection or a 502/503/504, but never on a
+failed connect: an unreachable collector has to be reported quickly, and every poller already
+tries again on its own schedule."""
+import logging
+import threading
+from typing import Dict, Optional, Tuple, Union
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from LWTest.constants import lwt
+
+_logger = logging.getLogger(__name__)
+
+CONNECTIONS_PER_HOST = 4
+TIMEOUT = (lwt.TimeOut.URL_REQUEST.value, 20)  # connect, read
+RETRIES = 2
+RETRY_BACKOFF = 0.1
+
+
+def _create_retry_policy(retries: int) -> Retry:
+    return Retry(total=retries, connect=0, read=retries, status=retries, backoff_factor=RETRY_BACKOFF,
+                 status_forcelist=(502, 503, 504), allowed_methods=frozenset(("GET", "HEAD")),
+                 raise_on_status=False)
+
+
+class SessionPool:
+    def __init__(self, connections_per_host: int = CONNECTIONS_PER_HOST,
+                 timeout: Union[float, Tuple[float, float]] = TIMEOUT, retries: int = RETRIES):
+        self._connections_per_host = connections_per_host
+        self._timeout = timeout
+        self._retries = retries
+        self._sessions: Dict[str, requests.Session] = {}
+        self._lock = threading.Lock()
+
+    def session(self, url: str) -> requests.Session:
+        """The shared session for the host serving 'url'."""
+        parts = urlsplit(url)
+        host = f"{parts.scheme}://{parts.netloc}"
+
+        with self._lock:
+            if (session := self._sessions.get(host)) is None:
+                session = self._sessions[host] = self._create_session()
+                _logger.debug(f"created http session for '{host}'")
+
+        return session
+
+    def get(self, url: str, **kwargs) -> requests.Response:
+        kwargs.setdefault("timeout", self._timeout)
+        return self.session(url).get(url, **kwargs)
+
+    def post(self, url: str, data=None, **kwargs) -> requests.Response:
+        kwargs.setdefault("timeout", self._timeout)
+        return self.session(url).post(url, data=data, **kwargs)
+
+    def close(self) -> None:
+        with self._lock:
+            sessions, self._sessions = self._sessions, {}
+
+        for session in sessions.values():
+            session.close()
+
+    def _create_session(self) -> requests.Session:
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self._connections_per_host, pool_block=True,
+                              max_retries=_create_retry_policy(self._retries))
+        session = requests.Session()
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        return session
+
+
+_pool: Optional[SessionPool] = None
+_pool_lock = threading.Lock()
+
+
+def pool() -> SessionPool:
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = SessionPool()
+
+    return _pool
+
+
+def get(url: str, **kwargs) -> requests.Response:
+    return pool().get(url, **kwargs)
+
+
+def post(url: str, data=None, **kwargs) -> requests.Response:
+    return pool().post(url, data, **kwargs)
+
+
+def session(url: str) -> requests.Session:
+    return pool().session(url)
+
+
+def close() -> None:
+    """Closes every pooled connection, the next request opens new ones."""
+    pool().close()
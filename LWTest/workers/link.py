@@ -9,6 +9,8 @@ from PyQt6.QtCore import QObject, pyqtSignal, QMutex
 
 from LWTest.collector.common.constants import ReadingType
 from LWTest.constants import lwt
+from LWTest.utilities import trace
+from LWTest.web.interface import sessionpool
 
 _serial_number_regex = re.compile(r"\s*\d{7}")
 linked_regex = r"\s*\d{7}\s*\d{7}\s*\d{7}\s*-?\d{2}"
@@ -22,9 +24,10 @@ class ModemStatusPageLoader:
     def page(self):
         return self._get_page()
 
+    @trace.traced("modem status", "http")
     def _get_page(self):
         try:
-            page = requests.get(self.__url, timeout=20)
+            page = sessionpool.get(self.__url)
             if page.status_code != 200:
                 page = None
         except requests.exceptions.ConnectTimeout:
@@ -39,17 +42,18 @@ class SerialNumberUpdateVerifier(QObject):
     serial_numbers_updated = pyqtSignal()
     timed_out = pyqtSignal()
 
-    def __init__(self, serial_numbers: Tuple[str]):
+    def __init__(self, serial_numbers: Tuple[str], url: str = lwt.URL_MODEM_STATUS):
         super().__init__()
         self._serial_numbers = serial_numbers
-        self._page_loader = ModemStatusPageLoader(lwt.URL_MODEM_STATUS)
+        self._page_loader = ModemStatusPageLoader(url)
         self._timeout = 180
 
+    @trace.traced("serial number update", "worker")
     def verify(self):
         end_time = time.time() + self._timeout
         while time.time() < end_time:
-            page = self._page_loader.page
-            if page.status_code != 200:
+            # the loader returns None for anything but a 200
+            if (page := self._page_loader.page) is None:
                 return
 
             if len(_extract_sensor_record_from_page(page.text, self._serial_numbers)) == len(self._serial_numbers):
@@ -62,9 +66,9 @@ class SerialNumberUpdateVerifier(QObject):
         self.timed_out.emit()
 
 
-class LinkChecker:
-    time_to_sleep = lwt.TimeOut.LINK_PAGE_LOAD_INTERVAL.value
-    timeout = lwt.TimeOut.LINK_CHECK.value
+class ModemStatusPoller(QObject):
+    """Loads the modem status page once per poll and reports the RSSI of every requested sensor."""
+    polled = pyqtSignal(dict)  # serial number -> rssi, "NA" if the sensor has not linked
 
     def __init__(self, url: str):
         super().__init__()
@@ -72,21 +76,18 @@ class LinkChecker:
         self._logger = logging.getLogger(__name__)
         self._page_loader = ModemStatusPageLoader(url)
 
-    def check(self, serial_number: str):
+    def poll(self, serial_numbers: tuple):
+        self._logger.info(f"checking link status of sensors {serial_numbers}")
         page = self._page_loader.page
-        number, rssi = self._process_sensor_records(_extract_sensor_record_from_page(page.text, (serial_number,)))
-        if number:
-            return rssi
-
-        return None
+        text = page.text if page else ""
 
-    @staticmethod
-    def _process_sensor_records(records):
-        for record in records:
+        results = {serial_number: lwt.NO_DATA for serial_number in serial_numbers}
+        for record in _extract_sensor_record_from_page(text, serial_numbers):
             if len(record) > 3:
-                return record[0], record[3]
+                results[record[0]] = record[3]
 
-        return None, None
+        # noinspection PyUnresolvedReferences
+        self.polled.emit(results)
 
 
 #
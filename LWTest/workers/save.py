@@ -0,0 +1,32 @@
+import logging
+from typing import Callable
+
+from PyQt6.QtCore import QObject, QRunnable, pyqtSignal
+
+from LWTest.utilities import returns, trace
+
+
+class StageWorker(QRunnable):
+    """Runs one stage of the save pipeline off the GUI thread and reports its result."""
+
+    class Signals(QObject):
+        finished = pyqtSignal(str, object)  # stage name, returns.Result
+
+    def __init__(self, stage: str, job: Callable[[], returns.Result]):
+        super().__init__()
+        self._logger = logging.getLogger(__name__)
+        self.signals = self.Signals()
+        self.stage = stage
+        self._job = job
+
+    def run(self):
+        self._logger.debug(f"starting save stage '{self.stage}'")
+        try:
+            with trace.span(f"save stage {self.stage}", "worker"):
+                result = self._job()
+        except Exception as exc:
+            self._logger.exception(f"save stage '{self.stage}' failed", exc_info=exc)
+            result = returns.Result(False, None, str(exc))
+
+        # noinspection PyUnresolvedReferences
+        self.signals.finished.emit(self.stage, result)
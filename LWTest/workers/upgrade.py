@@ -1,18 +1,116 @@
 import logging
+import os
+import re
 from time import sleep
+from typing import List, Optional
 
 from PyQt6.QtCore import QRunnable, QObject, pyqtSignal
 
 from LWTest.constants import lwt
+from LWTest.utilities import trace
+from LWTest.utilities.wait import WaitTimeout, wait_until
 
 if lwt.TESTING_MODE:
     import tests.mock.requests.requests as requests
+    _get = requests.get
 else:
     import requests
+    from LWTest.web.interface import sessionpool
+    _get = sessionpool.get
 
 _trigger_words = ['updating', 'entering', 'erasing', 'beginning', 'seg#', 'transfer', 'last']
 
 
+class LogTailError(Exception):
+    pass
+
+
+class LogTail:
+    """Follows a growing log file, returning only the complete lines appended since the previous read.
+
+    Uses HTTP Range requests while the server honors them. When it answers with the full file instead,
+    the new lines are found by diffing against the previous copy."""
+
+    def __init__(self, url: str, timeout: float = lwt.TimeOut.URL_REQUEST.value):
+        self._url = url
+        self._timeout = timeout
+        self._offset = 0  # start of the first line not yet returned
+        self._use_range = True
+        self._previous: bytes = b""
+
+    def seek_to_end(self) -> None:
+        """Skips what the log holds now, read_new_lines then returns only the lines appended later.
+
+        Reads the whole file once, so the copy kept for servers that ignore Range requests is current."""
+        page = _get(self._url, timeout=self._timeout)
+        if page.status_code != 200:
+            raise LogTailError(f"server returned status {page.status_code}")
+
+        self._previous = page.content
+        self._offset = len(page.content)
+
+    def read_new_lines(self) -> List[str]:
+        headers = {"Range": f"bytes={self._offset}-"} if self._use_range and self._offset else {}
+        page = _get(self._url, timeout=self._timeout, headers=headers)
+
+        if page.status_code == 206:
+            # keep the full copy current in case the server stops honoring Range requests
+            self._previous = self._previous[:self._offset] + page.content
+            return self._consume(page.content, 0, self._offset)
+
+        if page.status_code == 416:
+            if self._length(page) >= self._offset:  # nothing past the offset yet
+                self._previous = self._previous[:self._offset]
+                return []
+
+            # the log was rotated or truncated, read the new one from its start
+            self._offset = 0
+            self._previous = b""
+            return self.read_new_lines()
+
+        if page.status_code != 200:
+            raise LogTailError(f"server returned status {page.status_code}")
+
+        if headers:
+            self._use_range = False
+
+        return self._consume_full_copy(page.content)
+
+    def _length(self, refused) -> int:
+        """The log's length as given by a 416 answer's Content-Range, or by reading the whole file."""
+        match = re.fullmatch(r"bytes \*/(\d+)", refused.headers.get("Content-Range", ""))
+        if match:
+            return int(match.group(1))
+
+        page = _get(self._url, timeout=self._timeout)
+        if page.status_code != 200:
+            raise LogTailError(f"server returned status {page.status_code}")
+
+        return len(page.content)
+
+    def _consume_full_copy(self, content: bytes) -> List[str]:
+        common = len(os.path.commonprefix([self._previous, content]))
+        self._previous = content
+
+        if common >= self._offset:
+            start = self._offset
+        else:
+            # content we already returned was replaced, start over from the line where it changed
+            start = content.rfind(b"\n", 0, common) + 1
+
+        self._offset = start
+        return self._consume(content, start, 0)
+
+    def _consume(self, content: bytes, start: int, base: int) -> List[str]:
+        """Returns the complete lines in content[start:], base is the file position of content[0]."""
+        end = content.rfind(b"\n") + 1
+        if end <= start:
+            return []
+
+        self._offset = base + end
+        return content[start:end].decode(errors="replace").splitlines()
+
+
 class UpgradeWorker(QRunnable):
     class Signals(QObject):
         exception = pyqtSignal(str)
@@ -26,40 +124,53 @@ class UpgradeWorker(QRunnable):
         self.signals = self.Signals()
         self.serial_number = serial_number
         self.url = url
+        self._log: Optional[LogTail] = None
 
-    def run(self):
-        sleep(lwt.TimeOut.WAIT_FOR_COLLECTOR_TO_START_UPDATING_LOG_FILE.value)
+    def follow_log_from_end(self) -> None:
+        """Skips what the upgrade log holds now, call before starting the upgrade.
 
-        line_count = 0
-        previous_line_count = 0
+        The log holds the whole day's upgrades, an earlier upgrade of the same sensor included,
+        so only the lines appended after this belong to the upgrade being followed."""
+        self._log = LogTail(self.url)
+        self._log.seek_to_end()
+
+    def run(self):
+        try:
+            self._follow_upgrade()
+        except LogTailError as exc:
+            self._logger.debug(f"unable to load upgrade log: {exc}")
+            self.signals.exception.emit("Error loading page.")
+        except requests.exceptions.ConnectTimeout as exc:
+            self._logger.exception("ConnectionTimeout while performing firmware upgrade.", exc_info=exc)
+            self.signals.exception.emit("Connection timed out.")
+        except requests.exceptions.ConnectionError as exc:
+            self._logger.exception("ConnectionError while performing firmware upgrade.", exc_info=exc)
+            self.signals.exception.emit("Connection error.")
+
+    def _follow_upgrade(self):
+        if self._log is None:
+            self._logger.debug("upgrade log was not followed from before the upgrade, following it from now")
+            self.follow_log_from_end()
+        log = self._log
+
+        # the upgrade session begins at the first appended line naming the sensor
+        try:
+            lines = wait_until(lambda: self._current_session(log.read_new_lines()),
+                               lwt.TimeOut.WAIT_FOR_COLLECTOR_TO_START_UPDATING_LOG_FILE.value,
+                               lwt.TimeOut.UPGRADE_LOG_LOAD_INTERVAL.value)
+            session_started = True
+        except WaitTimeout:
+            self._logger.debug(f"upgrade log does not name {self.serial_number} yet, following it anyway")
+            lines, session_started = [], False
 
         while True:
-            try:
-                page = requests.get(self.url, timeout=lwt.TimeOut.URL_REQUEST.value)
-                if page.status_code != 200:
-                    self.signals.exception.emit("Error loading page.")
-                    return
-                html = page.text.split('\n')
-
-                # work from the bottom of the log file up so that we are only working
-                # with the current upgrade session data
-                html.reverse()
-            except requests.exceptions.ConnectTimeout as exc:
-                self._logger.exception("ConnectionTimeout while performing firmware upgrade.", exc_info=exc)
-                self.signals.exception.emit("Connection timed out.")
-                return
-            except requests.exceptions.ConnectionError as exc:
-                self._logger.exception("ConnectionError while performing firmware upgrade.", exc_info=exc)
-                self.signals.exception.emit("Connection error.")
-                return
-
-            for line in html:
-                line_count += self._update_line_count(line)
-
-                # Only evaluate the current upgrade session
-                # ignore everything else in the file
-                if self.serial_number in line:
-                    break
+            if not session_started:
+                lines = self._current_session(lines)
+                session_started = bool(lines)
+
+            lines_read_count = 0
+            for line in lines:
+                lines_read_count += self._update_line_count(line)
 
                 if lwt.UPGRADE_FAILURE_TEXT in line:
                     self.signals.upgrade_failed_to_enter_program_mode.emit()
@@ -70,16 +181,21 @@ class UpgradeWorker(QRunnable):
                     self.signals.upgrade_successful.emit(self.serial_number)
                     return
 
-            lines_read_count = line_count - previous_line_count
-            if line_count > previous_line_count:
-                previous_line_count += lines_read_count
-
             self.signals.upgrade_progress.emit(lines_read_count)
 
-            line_count = 0
-
             sleep(lwt.TimeOut.UPGRADE_LOG_LOAD_INTERVAL.value)
 
+            with trace.span("upgrade log poll", "worker", serial_number=self.serial_number):
+                lines = log.read_new_lines()
+
+    def _current_session(self, lines: List[str]) -> List[str]:
+        """Drops the lines preceding the first one naming the sensor."""
+        for index, line in enumerate(lines):
+            if self.serial_number in line:
+                return lines[index:]
+
+        return []
+
     @staticmethod
     def _update_line_count(line):
         for _trigger_word in _trigger_words:
@@ -1,15 +1,67 @@
+import argparse
 import sys
 
-from PyQt6.QtCore import QSettings
-from PyQt6.QtWidgets import QApplication
+from PyQt6.QtCore import QCoreApplication, QSettings
 
-import LWTest.patchexceptionhook as patch
-from LWTest.__main__ import main
 from LWTest.config.app import logging, settings
+from LWTest.utilities import trace
+
+_CONFIG_PATH = r"LWTest/resources/config/config.txt"
+
+
+def _parse_args(argv):
+    parser = argparse.ArgumentParser(description="Test Medium Voltage Power Line Sensors.")
+    parser.add_argument("--batch", metavar="RECORD", nargs="+",
+                        help="run full ATP cycles for the test records without the GUI, in parallel")
+    parser.add_argument("--collector", metavar="ADDRESS", nargs="+", default=[],
+                        help="collector address for each test record, in the same order")
+    parser.add_argument("--voltage", choices=("high", "low"),
+                        help="test voltage to assume when the readings can not determine it")
+    parser.add_argument("--room-temperature", type=float, default=21.7)
+    parser.add_argument("--no-persistence", action="store_true", help="skip the persistence check")
+    # DEBUG and server=... are picked up by settings.load, TRACE turns on timing spans
+    args, _ = parser.parse_known_args(argv[1:])
+    return args
+
+
+def run_batch(args) -> int:
+    from LWTest.batch import run_batches
+    from LWTest.web.interface import sessionpool
+
+    app = QCoreApplication(sys.argv)
+    settings.load(app.arguments(), QSettings(), _CONFIG_PATH)
+    logging.initialize()
+    trace.enable("TRACE" in sys.argv)
+
+    results = run_batches(args.batch, args.collector, voltage=args.voltage,
+                          room_temperature=args.room_temperature, check_persistence=not args.no_persistence)
+    sessionpool.close()
+    for record, success in results.items():
+        print(f"{record}: {'passed' if success else 'failed'}")
+
+    if trace_path := trace.save():
+        print(f"trace saved to '{trace_path}'\n{trace.summary()}")
+
+    return 0 if all(results.values()) else 1
+
+
+def run_gui():
+    from PyQt6.QtWidgets import QApplication
+
+    import LWTest.patchexceptionhook as patch
+    from LWTest.__main__ import main
 
-if __name__ == '__main__':
     patch.patch_exception_hook()
     app = QApplication(sys.argv)
-    settings.load(sys.argv, QSettings(), r"LWTest/resources/config/config.txt")
+    settings.load(sys.argv, QSettings(), _CONFIG_PATH)
     logging.initialize()
+    trace.enable("TRACE" in sys.argv)
     main(app)
+
+
+if __name__ == '__main__':
+    arguments = _parse_args(sys.argv)
+    if arguments.batch:
+        sys.exit(run_batch(arguments))
+
+    run_gui()
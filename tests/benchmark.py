@@ -0,0 +1,265 @@
+# benchmark.py
+"""Times the collector I/O paths end to end against the mock collector.
+
+Every operation runs 'runs' times, reporting p50/p95 latency and the requests the collector served.
+A baseline saved with --save-baseline is compared on later runs, a p50 slower by more than
+--threshold or any extra request fails the run, so a speedup, once made, stays made.
+
+    python -m tests.benchmark --runs 20 --latency 0.01 --save-baseline
+    python -m tests.benchmark --runs 20 --latency 0.01
+
+Operations that still drive a browser need Chrome, they are skipped when it can not be started.
+"""
+import argparse
+import json
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+from selenium.common.exceptions import WebDriverException
+
+from LWTest.collector.configure import phaseangle, raw
+from LWTest.collector.configure.serial import SerialNumberForm
+from LWTest.collector.read.electric import DataReader
+from LWTest.collector.read.persistence import PersistenceComparator
+from LWTest.collector.session import CollectorURLs
+from LWTest.sensor import SensorLog
+from LWTest.spreadsheet import spreadsheet
+from LWTest.utilities import file_utils, misc
+from LWTest.web.interface.browser import create_headless_browser
+from LWTest.web.interface.httpdriver import HTTPDriver
+from LWTest.web.interface.page import Page, Submit
+from LWTest.workers import link
+from tests.mock.collector import CollectorConfig, MockCollector
+
+_MASTER = Path(__file__).parent.parent / "LWTest/resources/testrecord/ATR-PRD Master.xlsm"
+_PASSWORD = "password"
+
+DEFAULT_RUNS = 10
+DEFAULT_LATENCY = 0.01  # a response time typical of a collector on the bench network
+DEFAULT_THRESHOLD = 0.25
+
+
+class Skip(Exception):
+    pass
+
+
+@dataclass
+class Measurement:
+    name: str
+    runs: int
+    p50: float  # seconds
+    p95: float
+    requests: float  # per run
+
+
+class BenchmarkContext:
+    """What the operations share: the mock collector, its URLs, the drivers and a scratch directory."""
+
+    def __init__(self, collector: MockCollector):
+        self.collector = collector
+        self.urls = CollectorURLs.for_host(collector.base_url)
+        self.http_driver = HTTPDriver()
+        self.directory = Path(tempfile.mkdtemp(prefix="lwtest-benchmark-"))
+        self.sensor_log = SensorLog()
+        self.sensor_log.create_all(tuple(collector.state.serial_numbers))
+        self._browser = None
+        self._browser_error: Optional[str] = None
+
+    @property
+    def browser(self):
+        if self._browser is None and self._browser_error is None:
+            try:
+                self._browser = create_headless_browser()
+            except (WebDriverException, OSError, TypeError) as e:
+                self._browser_error = str(e).splitlines()[0] if str(e) else type(e).__name__
+
+        if self._browser is None:
+            raise Skip(f"no browser: {self._browser_error}")
+
+        return self._browser
+
+    def close(self):
+        if self._browser:
+            self._browser.quit()
+        self.http_driver.quit()
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+
+# -- operations ---
+
+
+def _readings(context: BenchmarkContext):
+    reader = DataReader(context.urls.sensor_data, context.urls.raw_configuration, lambda: DataReader.LOW_RANGE)
+    # noinspection PyUnresolvedReferences
+    reader.readings.connect(context.sensor_log.save)
+    reader.read(context.http_driver)
+
+
+def _serial_number_configuration(context: BenchmarkContext):
+    serial_numbers = misc.ensure_six_numbers(context.sensor_log.get_serial_numbers_as_list())
+    SerialNumberForm(serial_numbers, _PASSWORD, context.urls.configuration).configure()
+
+
+def _advanced_configuration(context: BenchmarkContext):
+    # after the warm up run this is a re-run on a configured collector
+    raw.update_advanced_configuration(_PASSWORD, context.urls.temperature, context.urls.raw_configuration,
+                                      context.urls.voltage_ride_through)
+
+
+def _phase_angle_configuration(context: BenchmarkContext):
+    phaseangle.configure_phase_angle(context.urls.configuration, context.browser, Page,
+                                     Submit.create_submit_button_for_phase_angle(_PASSWORD))
+
+
+def _link_check(context: BenchmarkContext):
+    serial_numbers = context.sensor_log.get_serial_numbers_as_tuple()
+    link.SerialNumberUpdateVerifier(serial_numbers, context.urls.modem_status).verify()
+    link.ModemStatusPoller(context.urls.modem_status).poll(serial_numbers)
+
+
+def _persistence(context: BenchmarkContext):
+    saved = tuple(("0.02525", "1.50000", "0.0") for _ in context.sensor_log.get_serial_numbers_as_tuple())
+    PersistenceComparator().compare(saved, context.urls.raw_configuration, context.http_driver)
+
+
+def _spreadsheet_save(context: BenchmarkContext):
+    path = context.directory / "ATR-PRD#-benchmark.xlsm"
+    if not path.exists():
+        shutil.copy(_MASTER, path)
+
+    with spreadsheet.XMLTestRecord(str(path)) as record:
+        record.enter_serial_numbers(context.sensor_log.get_serial_numbers_as_tuple())
+        record.save_test_results(spreadsheet.package_test_results(context.sensor_log),
+                                 (context.sensor_log.room_temperature, (), ()))
+        record.record_log_files_attached()
+
+
+def _log_download(context: BenchmarkContext):
+    path = context.directory / "logfiles.zip"
+    if not (result := file_utils.download_log_files(path, url=context.urls.log_files)).success:
+        raise RuntimeError(result.error)
+    path.unlink()
+
+
+OPERATIONS: Dict[str, Callable[[BenchmarkContext], None]] = {
+    "readings": _readings,
+    "serial number configuration": _serial_number_configuration,
+    "advanced configuration": _advanced_configuration,
+    "phase angle configuration": _phase_angle_configuration,
+    "link check": _link_check,
+    "persistence": _persistence,
+    "spreadsheet save": _spreadsheet_save,
+    "log download": _log_download,
+}
+
+
+# -- running and reporting ---
+
+
+def _percentile(samples: List[float], percent: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, round(percent / 100 * (len(ordered) - 1)))]
+
+
+def measure(context: BenchmarkContext, name: str, runs: int) -> Measurement:
+    operation = OPERATIONS[name]
+    operation(context)  # warm up, connections and first-use imports are not what is measured
+
+    timings = []
+    context.collector.reset_request_counts()
+    for _ in range(runs):
+        start = time.perf_counter()
+        operation(context)
+        timings.append(time.perf_counter() - start)
+
+    return Measurement(name, runs, statistics.median(timings), _percentile(timings, 95),
+                       context.collector.request_count() / runs)
+
+
+def run(runs: int = DEFAULT_RUNS, config: Optional[CollectorConfig] = None,
+        names: Optional[List[str]] = None) -> Dict[str, Optional[Measurement]]:
+    """Returns a measurement per operation, None for the ones that were skipped."""
+    results = {}
+    with MockCollector(config or CollectorConfig(latency=DEFAULT_LATENCY, test_voltage="low")) as collector:
+        context = BenchmarkContext(collector)
+        try:
+            for name in names or OPERATIONS:
+                try:
+                    results[name] = measure(context, name, runs)
+                except Skip as e:
+                    print(f"skipped {name}: {e}", file=sys.stderr)
+                    results[name] = None
+        finally:
+            context.close()
+
+    return results
+
+
+def compare(results: Dict[str, Optional[Measurement]], baseline: Dict[str, dict], threshold: float) -> List[str]:
+    """Returns a description of every regression against the baseline."""
+    regressions = []
+    for name, measurement in results.items():
+        if measurement is None or name not in baseline:
+            continue
+
+        before = Measurement(**baseline[name])
+        if measurement.p50 > before.p50 * (1 + threshold):
+            regressions.append(f"{name}: p50 {before.p50 * 1000:.1f} ms -> {measurement.p50 * 1000:.1f} ms")
+        if measurement.requests > before.requests:
+            regressions.append(f"{name}: {before.requests:g} -> {measurement.requests:g} requests per run")
+
+    return regressions
+
+
+def report(results: Dict[str, Optional[Measurement]]) -> str:
+    lines = [f"{'operation':<30}{'p50 ms':>10}{'p95 ms':>10}{'requests':>10}"]
+    for name, measurement in results.items():
+        if measurement is None:
+            lines.append(f"{name:<30}{'skipped':>10}")
+        else:
+            lines.append(f"{name:<30}{measurement.p50 * 1000:>10.1f}{measurement.p95 * 1000:>10.1f}"
+                         f"{measurement.requests:>10g}")
+
+    return "\n".join(lines)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark LWTest's collector I/O against the mock collector.")
+    parser.add_argument("--runs", type=int, default=DEFAULT_RUNS)
+    parser.add_argument("--latency", type=float, default=DEFAULT_LATENCY, help="seconds added to every response")
+    parser.add_argument("--sensors", type=int, choices=(3, 6), default=6)
+    parser.add_argument("--operation", action="append", choices=list(OPERATIONS), dest="operations")
+    parser.add_argument("--baseline", type=Path, default=Path(".benchmark-baseline.json"))
+    parser.add_argument("--save-baseline", action="store_true")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="fraction a p50 may grow over the baseline before failing")
+    args = parser.parse_args(argv)
+
+    config = CollectorConfig(sensor_count=args.sensors, latency=args.latency, test_voltage="low")
+    results = run(args.runs, config, args.operations)
+    print(report(results))
+
+    measured = {name: asdict(measurement) for name, measurement in results.items() if measurement}
+    if args.save_baseline:
+        args.baseline.write_text(json.dumps(measured, indent=2))
+        print(f"saved baseline to '{args.baseline}'")
+        return 0
+
+    if not args.baseline.exists():
+        return 0
+
+    if regressions := compare(results, json.loads(args.baseline.read_text()), args.threshold):
+        print("regressions:\n  " + "\n  ".join(regressions))
+        return 1
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,534 @@
+# collector.py
+"""A stand-in collector web server for offline testing and benchmarking.
+
+Serves the pages LWTest reads and submits, at both the mock paths in debug_urls (localhost:6969)
+and the real collector's index.php paths, so CollectorURLs.for_host(server.base_url) works too.
+Latency, sensor count (3 or 6), link timing and the test voltage are configurable.
+
+    python -m tests.mock.collector --port 6969 --sensors 3 --latency 0.05 --link-delay 5
+"""
+import argparse
+import datetime
+import io
+import random
+import threading
+import time
+import zipfile
+from collections import Counter
+from dataclasses import dataclass
+from email.utils import formatdate
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+from LWTest.constants.lwt_constants import constants as lwt
+
+_PHASE_LETTERS = "ABCDEF"
+_SESSION_COOKIE = "ci_session"
+
+# default advanced configuration values, one per sensor, by form field prefix
+_ADVANCED_FIELDS = (
+    ("scaleCurrent", "0.02525"), ("scaleVoltage", "1.50000"), ("scaleRawTemp", "0.0029"),
+    ("offsetRawTemp", "-65.52"), ("correctionAngle", "0.0"), ("correctionVoltageScale", "120"),
+    ("fault10k", "0.65019"), ("fault25k", "2.6"),
+)
+
+# voltage, current, power factor, lead/lag, real power (kW) by test voltage
+_READINGS = {
+    "high": ("13,800.0", "120.1", "0.9990", "Lag", "1,655.8"),
+    "low": ("7,200.0", "60.0", "0.9990", "Lag", "431.6"),
+}
+
+
+@dataclass
+class CollectorConfig:
+    sensor_count: int = 6
+    latency: float = 0.0  # seconds added to every response
+    link_delay: float = 0.0  # seconds after configuration before the first sensor links
+    link_interval: float = 0.0  # seconds between successive sensors linking
+    test_voltage: str = "high"  # "high" or "low"
+    require_login: bool = False
+    login_in_place: bool = False  # serve the login form with a 200 instead of redirecting to /login
+    upgrade_line_interval: float = 0.05
+    log_zip_size: int = 256 * 1024
+    firmware_version: str = lwt.LATEST_FIRMWARE_VERSION_NUMBER
+
+
+class CollectorState:
+    """What a collector remembers, shared by every request handler thread."""
+
+    def __init__(self, config: CollectorConfig):
+        self.config = config
+        self.lock = threading.Lock()
+        self.requests: Counter = Counter()  # (method, route) -> count
+        self.serial_numbers: List[str] = [f"98000{index + 1:02d}" for index in range(config.sensor_count)]
+        self.configuration_fields = self.serial_numbers + [""] * (6 - config.sensor_count)  # as the form shows them
+        self.configured_at = time.monotonic()
+        self.advanced: Dict[str, List[str]] = {
+            name: [value] * config.sensor_count for name, value in _ADVANCED_FIELDS
+        }
+        # a collector that already holds LWTest's constants
+        self.temperature = ["-0.00012"] * 6 + ["0"] * 18
+        self.calibration_factor = "0.0305327"
+        self.forms: Dict[str, Dict[str, str]] = {}  # last submission by route
+        self.date_offset = datetime.timedelta()
+        self.upgrade_log = bytearray()
+        self.log_zip = _create_log_zip(config.log_zip_size)
+        self.sessions = set()
+
+    def linked(self, phase: int) -> bool:
+        config = self.config
+        return time.monotonic() - self.configured_at >= config.link_delay + phase * config.link_interval
+
+    def configure(self, serial_numbers: List[str]) -> None:
+        with self.lock:
+            self.configuration_fields = serial_numbers
+            self.serial_numbers = serial_numbers[:self.config.sensor_count]
+            # re-configured sensors have to link again
+            self.configured_at = time.monotonic()
+
+    def start_upgrade(self, serial_number: str) -> None:
+        lines = [f"Updating sensor {serial_number}", "Entering program mode", "Erasing flash", "Beginning transfer"]
+        lines += [f"Seg# {segment} transfer ok" for segment in range(1, 6)]
+        lines += ["Last segment sent", lwt.UPGRADE_SUCCESS_TEXT]
+
+        def append_lines():
+            for line in lines:
+                time.sleep(self.config.upgrade_line_interval)
+                with self.lock:
+                    self.upgrade_log += f"{line}\n".encode()
+
+        threading.Thread(target=append_lines, daemon=True).start()
+
+
+class _Handler(BaseHTTPRequestHandler):
+    server: "_Server"
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def log_message(self, format_, *args):
+        pass
+
+    def do_GET(self):
+        self._dispatch("GET")
+
+    def do_POST(self):
+        self._dispatch("POST")
+
+    def _dispatch(self, method: str):
+        state = self.server.state
+        route = self.server.route(self.path)
+        with state.lock:
+            state.requests[(method, route)] += 1
+
+        if state.config.latency:
+            time.sleep(state.config.latency)
+
+        form = {}
+        if method == "POST":
+            body = self.rfile.read(int(self.headers.get("Content-Length", 0))).decode()
+            form = {name: values[-1] for name, values in parse_qs(body, keep_blank_values=True).items()}
+
+        if route is None:
+            self._send(404, b"not found", "text/plain")
+            return
+
+        if state.config.require_login and route != "login" and not self._logged_in():
+            # like the collector, send anyone not logged in (or whose session expired) to the login page
+            if state.config.login_in_place:
+                self._get_login(form)
+            else:
+                self._send(303, b"", "text/plain", {"Location": "/login"})
+            return
+
+        handler: Callable[[Dict[str, str]], Optional[Tuple]] = getattr(self, f"_{method.lower()}_{route}", None)
+        if handler is None:
+            self._send(405, b"method not allowed", "text/plain")
+            return
+
+        if method == "POST":
+            with state.lock:
+                state.forms[route] = form
+
+        handler(form)
+
+    # -- pages ---
+
+    def _get_sensordata(self, _):
+        self._send_html(_sensor_data_page(self.server.state))
+
+    def _get_rawconfig(self, _):
+        self._send_html(_raw_configuration_page(self.server.state))
+
+    def _post_rawconfig(self, form):
+        state = self.server.state
+        with state.lock:
+            for name, values in state.advanced.items():
+                for index in range(len(values)):
+                    if (value := form.get(f"{name}{_PHASE_LETTERS[index]}")) is not None:
+                        values[index] = value
+        self._get_rawconfig(form)
+
+    def _get_modemstatus(self, _):
+        self._send(200, _modem_status_page(self.server.state).encode(), "text/html")
+
+    def _get_configuration(self, _):
+        self._send_html(_configuration_page(self.server.state))
+
+    def _post_configuration(self, form):
+        state = self.server.state
+        serial_numbers = [form.get(f"serial_num_{letter}", "") for letter in _PHASE_LETTERS]
+        if any(serial_numbers):
+            state.configure(serial_numbers)
+        with state.lock:
+            for index in range(len(state.advanced["correctionAngle"])):
+                if (angle := form.get(f"correction_angle_{_PHASE_LETTERS[index]}")) is not None:
+                    state.advanced["correctionAngle"][index] = angle
+        self._get_configuration(form)
+
+    def _get_softwareupgrade(self, _):
+        self._send_html(_software_upgrade_page(self.server.state))
+
+    def _post_softwareupgrade(self, form):
+        state = self.server.state
+        serial_number = form.get("unit") or state.serial_numbers[0]
+        state.start_upgrade(serial_number)
+        self._get_softwareupgrade(form)
+
+    def _get_upgradelog(self, _):
+        with self.server.state.lock:
+            content = bytes(self.server.state.upgrade_log)
+        self._send_ranged(content, "text/plain")
+
+    def _get_logfiles(self, _):
+        self._send_ranged(self.server.state.log_zip, "application/zip")
+
+    def _get_dateandtime(self, _):
+        self._send_html(_date_time_page(self.server.state))
+
+    def _post_dateandtime(self, form):
+        state = self.server.state
+        try:
+            date = datetime.datetime.strptime(form.get("datetime", ""), "%Y-%m-%d %H:%M:%S")
+        except ValueError:
+            pass
+        else:
+            with state.lock:
+                state.date_offset = date - datetime.datetime.now()
+        self._get_dateandtime(form)
+
+    def _get_temperaturescale(self, _):
+        self._send_html(_temperature_page(self.server.state))
+
+    def _post_temperaturescale(self, form):
+        state = self.server.state
+        with state.lock:
+            for index in range(len(state.temperature)):
+                state.temperature[index] = form.get(f"temperature{index}", state.temperature[index])
+        self._get_temperaturescale(form)
+
+    def _get_voltageridethrough(self, _):
+        self._send_html(_voltage_ride_through_page(self.server.state))
+
+    def _post_voltageridethrough(self, form):
+        state = self.server.state
+        with state.lock:
+            state.calibration_factor = form.get("calibration_factor", state.calibration_factor)
+        self._get_voltageridethrough(form)
+
+    def _get_calibrate(self, _):
+        self._send_html(_simple_page("Calibrate", "<select><option>Phase 1</option></select>"))
+
+    def _get_faultcurrent(self, _):
+        self._send_html(_simple_page("Fault Current", "<div id='placeholder'></div>"))
+
+    def _get_home(self, _):
+        self._send_html(_simple_page("Collector", "<p>Medium voltage sensor collector</p>"))
+
+    def _get_login(self, _):
+        self._send_html(_login_page())
+
+    def _post_login(self, form):
+        if not form.get("username"):
+            self._get_login(form)
+            return
+
+        session = f"{random.getrandbits(64):016x}"
+        with self.server.state.lock:
+            self.server.state.sessions.add(session)
+        self._send(303, b"", "text/plain", {"Location": "/", "Set-Cookie": f"{_SESSION_COOKIE}={session}; Path=/"})
+
+    # -- responses ---
+
+    def _logged_in(self) -> bool:
+        for cookie in self.headers.get("Cookie", "").split(";"):
+            name, _, value = cookie.strip().partition("=")
+            if name == _SESSION_COOKIE and value in self.server.state.sessions:
+                return True
+        return False
+
+    def _send_html(self, body: str):
+        self._send(200, body.encode(), "text/html; charset=utf-8")
+
+    def _send_ranged(self, content: bytes, content_type: str):
+        range_ = self.headers.get("Range", "")
+        if not range_.startswith("bytes="):
+            self._send(200, content, content_type, {"Accept-Ranges": "bytes"})
+            return
+
+        start_text, _, end_text = range_[len("bytes="):].partition("-")
+        start = int(start_text or 0)
+        end = min(int(end_text), len(content) - 1) if end_text else len(content) - 1
+        if start >= len(content):
+            self._send(416, b"", content_type, {"Content-Range": f"bytes */{len(content)}"})
+            return
+
+        self._send(206, content[start:end + 1], content_type,
+                   {"Accept-Ranges": "bytes", "Content-Range": f"bytes {start}-{end}/{len(content)}"})
+
+    def _send(self, status: int, body: bytes, content_type: str, headers: Optional[Dict[str, str]] = None):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("Date", formatdate(usegmt=True))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+
+# route by path, the mock collector paths first and the real collector's after
+_ROUTES = {
+    "/sensordata": "sensordata", "/index.php/main/sensordata": "sensordata",
+    "/rawconfig": "rawconfig", "/index.php/main/test": "rawconfig",
+    "/modemstatus": "modemstatus", "/index.php/main/modem_status": "modemstatus",
+    "/configuration": "configuration", "/index.php/main/configuration": "configuration",
+    "/softwareupgrade": "softwareupgrade", "/index.php/upgrade": "softwareupgrade",
+    "/date_and_time": "dateandtime", "/index.php/upgrade/date_and_time": "dateandtime",
+    "/temperaturescale": "temperaturescale", "/index.php/main/Temperature": "temperaturescale",
+    "/voltageridethrough": "voltageridethrough", "/index.php/snow_ctrl/config": "voltageridethrough",
+    "/calibrate": "calibrate", "/index.php/main/calibrate": "calibrate",
+    "/faultcurrent": "faultcurrent", "/index.php/main/viewdata/fault_current": "faultcurrent",
+    "/static/logfiles.zip": "logfiles", "/downloadLogs.php": "logfiles",
+    "/upgradelog": "upgradelog",
+    "/login": "login",
+    "/": "home", "/index.php": "home",
+}
+
+
+class _Server(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address, state: CollectorState):
+        self.state = state
+        self.routes = dict(_ROUTES)
+        super().__init__(address, _Handler)
+
+    def route(self, path: str) -> Optional[str]:
+        path = urlsplit(path).path.rstrip("/") or "/"
+        # the real collector names its upgrade log by date, index.php/log_viewer/view/<date>_UPDATER.txt
+        if path.startswith("/index.php/log_viewer/view/"):
+            return "upgradelog"
+
+        return self.routes.get(path)
+
+
+class MockCollector:
+    """Runs the stand-in collector on a background thread, port 0 picks a free port.
+
+        with MockCollector(CollectorConfig(sensor_count=3)) as collector:
+            urls = CollectorURLs.for_host(collector.base_url)
+    """
+
+    def __init__(self, config: Optional[CollectorConfig] = None, host: str = "127.0.0.1", port: int = 0):
+        self.state = CollectorState(config or CollectorConfig())
+        self._server = _Server((host, port), self.state)
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    @property
+    def upgrade_log_url(self) -> str:
+        return f"{self.base_url}/upgradelog"
+
+    def request_count(self, route: Optional[str] = None, method: Optional[str] = None) -> int:
+        with self.state.lock:
+            return sum(count for (method_, route_), count in self.state.requests.items()
+                       if (route is None or route_ == route) and (method is None or method_ == method))
+
+    def reset_request_counts(self) -> None:
+        with self.state.lock:
+            self.state.requests.clear()
+
+    def start(self) -> "MockCollector":
+        self._thread = threading.Thread(target=self._server.serve_forever, args=(0.05,),
+                                        name="mock-collector", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+        if self._thread:
+            self._thread.join()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *_):
+        self.stop()
+
+
+# -- page builders ---
+
+
+def _document(title: str, body: str) -> str:
+    return f"<!DOCTYPE html><html><head><title>{title}</title></head><body>{body}</body></html>"
+
+
+def _simple_page(title: str, content: str) -> str:
+    return _document(title, f"<div id='maindiv'><h3>{title}</h3>{content}</div>")
+
+
+def _phase_header(count: int) -> str:
+    cells = "".join(f"<div class='tcell'>Phase {index + 1}</div>" for index in range(count))
+    return f"<div class='thead'><div class='tlabel'></div>{cells}</div>"
+
+
+def _sensor_data_page(state: CollectorState) -> str:
+    count = state.config.sensor_count
+    voltage, current, power_factor, lead_lag, real_power = _READINGS[state.config.test_voltage]
+    rows = (("Voltage", voltage), ("Current", current), ("Power Factor", power_factor),
+            ("Lead/Lag", lead_lag), ("Real Power", real_power), ("Temperature", "28.5"))
+
+    def row(label, value):
+        cells = "".join(f"<div class='tcellShort'>{value if state.linked(index) else lwt.NO_DATA}</div>"
+                        for index in range(count))
+        return f"<div class='trow'><div class='tlabel'>{label}</div>{cells}</div>"
+
+    last = "".join(f"<div class='tcellShort' id='last_{index + 1}'>1s</div>" for index in range(count))
+    body = "".join(row(label, value) for label, value in rows)
+    return _document("Sensor Data", f"<h3>Auto Update</h3><div id='data'>{_phase_header(count)}{body}"
+                                    f"<div class='trow'><div class='tlabel'>Last Update</div>{last}</div></div>")
+
+
+def _raw_configuration_page(state: CollectorState) -> str:
+    rows = []
+    for name, values in state.advanced.items():
+        cells = "".join(f"<div class='tcell'><input type='number' name='{name}{_PHASE_LETTERS[index]}' "
+                        f"value='{value}'></div>" for index, value in enumerate(values))
+        rows.append(f"<div class='trow'><div class='tlabel'>{name}</div>{cells}</div>")
+
+    form = (f"<form method='post'>{_phase_header(state.config.sensor_count)}{''.join(rows)}"
+            "<div id='password'><div><input type='password' name='password'>"
+            "<input type='submit' value='Save'></div></div></form>")
+    return _document("Raw Configuration", f"<div id='maindiv'>{form}</div>")
+
+
+def _modem_status_page(state: CollectorState) -> str:
+    lines = [f"{serial}  {serial}  {serial}  -{45 + index}  0  0"
+             for index, serial in enumerate(state.serial_numbers) if serial and state.linked(index)]
+    return _document("Modem Status", "<pre>\n" + "\n".join(lines) + "\n</pre>")
+
+
+def _configuration_page(state: CollectorState) -> str:
+    # laid out to match the xpaths in LWTest.constants.dom
+    def column_inputs(prefix, values):
+        return "".join(f"<div><input type='text' name='{prefix}{_PHASE_LETTERS[index]}' value='{value}'></div>"
+                       for index, value in enumerate(values))
+
+    serial_numbers = state.configuration_fields
+    angles = state.advanced["correctionAngle"] + [""] * (6 - len(state.advanced["correctionAngle"]))
+    form = ("<form method='post'><div>"
+            f"<div></div><div><div>Serial</div><div></div>{column_inputs('serial_num_', serial_numbers)}</div>"
+            "<div></div>"
+            f"<div><div>Angle</div><div></div>{column_inputs('correction_angle_', angles)}</div>"
+            "</div><div></div>"
+            "<div><div></div><div><div>Frequency</div><div></div>"
+            "<div><input type='radio' name='frequency' value='60' checked></div></div></div>"
+            "<input type='checkbox' id='singlephase' name='singlephase' value='1'>"
+            "<div id='password'><div><input type='password' name='password'>"
+            "<input type='submit' id='saveconfig' value='Save'></div></div></form>")
+    return _document("Configuration", f"<div id='maindiv'>{form}</div>")
+
+
+def _software_upgrade_page(state: CollectorState) -> str:
+    rows = "".join(f"<div class='trow'><div class='tcell'>{serial}</div>"
+                   f"<div class='tcell'>{state.config.firmware_version}</div>"
+                   f"<div class='tselect'><input type='radio' name='unit' value='{serial}'></div></div>"
+                   for serial in state.serial_numbers)
+    form = (f"<form method='post'><div class='thead'><div class='tcell'>Unit</div></div>{rows}"
+            "<p><input type='file' name='firmware'></p><p><input type='password' name='password'></p>"
+            "<input type='submit' value='Upgrade'></form>")
+    return _document("Software Upgrade", f"<div id='maindiv'>{form}</div>")
+
+
+def _date_time_page(state: CollectorState) -> str:
+    now = datetime.datetime.now() + state.date_offset
+    form = ("<form method='post'><input type='text' name='datetime'><input type='password' name='password'>"
+            "<input type='submit' value='Update'></form>")
+    return _document("Date and Time", f"<div id='maindiv'><div>Date and Time</div><div>{now:%c}\n</div>{form}</div>")
+
+
+def _temperature_page(state: CollectorState) -> str:
+    inputs = "".join(f"<input type='text' name='temperature{index}' value='{value}'>"
+                     for index, value in enumerate(state.temperature))
+    form = (f"<form method='post'>{inputs}<input type='password' name='password'><br>"
+            "<input type='submit' value='Save'></form>")
+    return _document("Temperature", f"<div id='maindiv'>{form}</div>")
+
+
+def _voltage_ride_through_page(state: CollectorState) -> str:
+    rows = "".join("<div></div>" for _ in range(5))
+    form = (f"<form method='post'><div>{rows}<div><div>Calibration Factor</div>"
+            f"<div><input type='text' name='calibration_factor' value='{state.calibration_factor}'></div></div></div>"
+            "<h4>Settings</h4><h4><input type='password' name='password'>"
+            "<input type='submit' value='Save'></h4></form>")
+    return _document("Voltage Ride Through", f"<div id='maindiv'>{form}</div>")
+
+
+def _login_page() -> str:
+    form = ("<form method='post' action='/login'><p><input type='text' id='username' name='username'></p>"
+            "<p><input type='password' id='password' name='password'></p><p><input type='submit'></p></form>")
+    return _document("Login", f"<div><h1>Login</h1><div>{form}</div></div>")
+
+
+def _create_log_zip(size: int) -> bytes:
+    buffer = io.BytesIO()
+    generator = random.Random(0)
+    with zipfile.ZipFile(buffer, "w", zipfile.ZIP_STORED) as archive:
+        archive.writestr("collector.log", bytes(generator.getrandbits(8) for _ in range(size)))
+    return buffer.getvalue()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Stand-in collector for LWTest.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=6969)
+    parser.add_argument("--sensors", type=int, choices=(3, 6), default=6)
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--link-delay", type=float, default=0.0)
+    parser.add_argument("--link-interval", type=float, default=0.0)
+    parser.add_argument("--voltage", choices=("high", "low"), default="high")
+    parser.add_argument("--require-login", action="store_true")
+    parser.add_argument("--login-in-place", action="store_true")
+    args = parser.parse_args()
+
+    config = CollectorConfig(sensor_count=args.sensors, latency=args.latency, link_delay=args.link_delay,
+                             link_interval=args.link_interval, test_voltage=args.voltage,
+                             require_login=args.require_login, login_in_place=args.login_in_place)
+    collector = MockCollector(config, args.host, args.port)
+    print(f"mock collector serving at {collector.base_url}")
+    collector.start()
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        collector.stop()
+
+
+if __name__ == '__main__':
+    main()
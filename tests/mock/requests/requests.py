@@ -2,6 +2,8 @@ import copy
 import random
 from typing import Optional
 
+from tests.mock.requests import exceptions  # noqa: F401 -- mirrors requests.exceptions
+
 _MAX_LINES_TO_ADD = 1
 
 
@@ -26,6 +28,10 @@ class _Page:
         self._add_tail_clutter(copy_of_text)
         return "".join(copy_of_text)
 
+    @property
+    def content(self):
+        return self.text.encode()
+
     @property
     def status_code(self):
         return self._simulated_status_code
@@ -53,7 +59,9 @@ def _setup_page(contents: str):
     _page = _Page(contents)
 
 
-def get(url: str, timeout=0) -> _Page:
+# noinspection PyUnusedLocal
+def get(url: str, timeout=0, headers=None) -> _Page:
+    # Range headers are ignored, the same as a server that does not support them
     if _page is None:
         _setup_page(url)
 
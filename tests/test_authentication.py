@@ -0,0 +1,119 @@
+from unittest import TestCase
+from unittest.mock import patch
+from urllib.parse import urlsplit
+
+import requests
+
+from LWTest.web.interface import authentication
+from LWTest.web.interface.authentication import Credentials, SessionManager
+from tests.mock.collector import CollectorConfig, MockCollector
+
+
+class _Browser:
+    """Stands in for webdriver.Chrome: follows redirects and sends only the cookies it was given."""
+    def __init__(self):
+        self.cookies = {}
+        self.current_url = "data:,"
+        self.page_source = ""
+
+    def get(self, url: str) -> None:
+        response = requests.get(url, cookies=self.cookies, timeout=5)
+        self.current_url, self.page_source = response.url, response.text
+
+    def find_elements_by_css_selector(self, selector: str) -> list:
+        assert selector == authentication.LOGIN_FORM_SELECTOR
+        return ["username"] if "id='username'" in self.page_source else []
+
+    def add_cookie(self, cookie: dict) -> None:
+        assert urlsplit(self.current_url).scheme == "http", "cookies need a page on the collector's site"
+        self.cookies[cookie["name"]] = cookie["value"]
+
+    def get_cookies(self) -> list:
+        return [{"name": name, "value": value, "domain": urlsplit(self.current_url).hostname}
+                for name, value in self.cookies.items()]
+
+    def log_in(self, base_url: str) -> None:
+        """Logs in through the login form, as Page does when no login can be made over HTTP."""
+        response = requests.post(f"{base_url}/login", data={"username": "admin", "password": "admin password"},
+                                 allow_redirects=False, timeout=5)
+        self.cookies.update(response.cookies.get_dict())
+        self.get(f"{base_url}/sensordata")
+
+
+class TestSessionManager(TestCase):
+    def setUp(self) -> None:
+        self.collector = MockCollector(CollectorConfig(require_login=True)).start()
+        self.url = f"{self.collector.base_url}/sensordata"
+        self.manager = SessionManager()
+        self.sessions = [requests.Session(), requests.Session()]
+
+        patcher = patch.object(authentication, "credentials", lambda: Credentials("admin", "admin password"))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def tearDown(self) -> None:
+        for session in self.sessions:
+            session.close()
+        self.collector.stop()
+
+    def test_logs_in_once_for_every_client(self):
+        for session in self.sessions:
+            self.assertIn("Auto Update", self.manager.get(self.url, session).text)
+
+        browser = _Browser()
+        self.manager.browser_get(browser, self.url)
+
+        self.assertEqual(self.url, browser.current_url)
+        self.assertEqual(1, self.collector.request_count("login", "POST"))
+
+    def test_logs_in_again_once_the_session_expires(self):
+        self.manager.get(self.url, self.sessions[0])
+        self.collector.state.sessions.clear()
+
+        self.assertIn("Auto Update", self.manager.get(self.url, self.sessions[1]).text)
+        self.assertIn("Auto Update", self.manager.get(self.url, self.sessions[0]).text)
+        self.assertEqual(2, self.collector.request_count("login", "POST"))
+
+    def test_rejected_login(self):
+        with patch.object(authentication, "credentials", lambda: Credentials(None, None)):
+            with self.assertRaises(authentication.LoginError):
+                self.manager.get(self.url, self.sessions[0])
+
+    def test_browser_left_on_the_login_page_when_the_login_fails(self):
+        browser = _Browser()
+        with patch.object(authentication, "credentials", lambda: Credentials(None, None)):
+            self.assertFalse(self.manager.browser_get(browser, self.url))
+
+        self.assertTrue(authentication.is_login_url(browser.current_url))
+
+    def test_login_form_served_in_place(self):
+        self.collector.state.config.login_in_place = True
+
+        self.assertIn("Auto Update", self.manager.get(self.url, self.sessions[0]).text)
+        browser = _Browser()
+        self.assertTrue(self.manager.browser_get(browser, self.url))
+        self.assertIn("Auto Update", browser.page_source)
+        self.assertEqual(1, self.collector.request_count("login", "POST"))
+
+    def test_browser_login_is_shared(self):
+        browser = _Browser()
+        browser.log_in(self.collector.base_url)
+        self.manager.adopt_browser_login(browser, self.url)
+
+        self.assertIn("Auto Update", self.manager.get(self.url, self.sessions[0]).text)
+        other_browser = _Browser()
+        other_browser.get(self.collector.base_url)
+        self.assertTrue(self.manager.browser_get(other_browser, self.url))
+        self.assertEqual(1, self.collector.request_count("login", "POST"))
+
+    def test_browsers_are_forgotten(self):
+        browser = _Browser()
+        self.manager.browser_get(browser, self.url)
+        self.assertEqual(1, len(self.manager._browsers))
+
+        del browser
+        self.assertEqual(0, len(self.manager._browsers))
+
+    def test_is_login_page(self):
+        self.assertTrue(authentication.is_login_page('<p><input type="text" id="username" name="username"></p>'))
+        self.assertFalse(authentication.is_login_page('<div id="password"><input name="password"></div>'))
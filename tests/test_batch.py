@@ -0,0 +1,55 @@
+import shutil
+import tempfile
+from pathlib import Path
+from unittest import TestCase
+
+import openpyxl
+
+from LWTest.batch import BatchRun
+from LWTest.collector.read.electric import DataReader
+from LWTest.collector.session import CollectorSession, CollectorURLs
+from LWTest.spreadsheet import constants, spreadsheet
+from tests.mock.collector import CollectorConfig, MockCollector
+
+_MASTER = Path(__file__).parent.parent / "LWTest/resources/testrecord/ATR-PRD Master.xlsm"
+
+
+class TestBatchRun(TestCase):
+    def test_steps_in_order(self):
+        run = BatchRun("record.xlsm")
+        self.assertEqual(["configure", "link check", "readings", "persistence", "save"],
+                         [name for name, _ in run.steps])
+
+    def test_persistence_can_be_skipped(self):
+        run = BatchRun("record.xlsm", check_persistence=False)
+        self.assertNotIn("persistence", [name for name, _ in run.steps])
+
+    def test_undetermined_voltage(self):
+        self.assertEqual("QUIT", BatchRun("record.xlsm")._resolve_undetermined_range())
+        self.assertEqual(DataReader.LOW_RANGE, BatchRun("record.xlsm", voltage="low")._resolve_undetermined_range())
+
+
+class TestBatchRunAgainstMockCollector(TestCase):
+    def setUp(self) -> None:
+        self.collector = MockCollector(CollectorConfig(sensor_count=3)).start()
+        self.directory = tempfile.mkdtemp()
+        self.path = str(Path(self.directory) / "ATR-PRD#-SN9800001-SN9800002-SN9800003.xlsm")
+        shutil.copy(_MASTER, self.path)
+        spreadsheet.create_test_record(("9800001", "9800002", "9800003"), self.path)
+
+    def tearDown(self) -> None:
+        self.collector.stop()
+        shutil.rmtree(self.directory)
+
+    def test_record_is_configured_read_and_written(self):
+        session = CollectorSession(self.path, CollectorURLs.for_host(self.collector.base_url), "password")
+
+        self.assertTrue(BatchRun(self.path, session, check_persistence=False).run())
+
+        # serial numbers and correction angles, both without a browser
+        self.assertEqual(2, self.collector.request_count("configuration", "POST"))
+        self.assertEqual(["25.8"] * 3, self.collector.state.advanced["correctionAngle"])
+        worksheet = openpyxl.load_workbook(self.path, keep_vba=True)[constants.WORKSHEET_NAME]
+        self.assertIsNotNone(worksheet[constants.phases_cells[0][0]].value)
+        self.assertEqual("Yes", worksheet["C45"].value)
+        self.assertTrue((Path(self.directory) / "logfiles-SN9800001-SN9800002-SN9800003.zip").exists())
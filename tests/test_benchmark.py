@@ -0,0 +1,79 @@
+from unittest import TestCase
+
+from tests import benchmark
+from tests.mock.collector import CollectorConfig, MockCollector
+
+# requests each operation may make of the collector, lower them as the I/O paths get cheaper
+_REQUEST_BUDGETS = {
+    "readings": 2,
+    "serial number configuration": 3,
+    "advanced configuration": 3,
+    "phase angle configuration": 2,  # load the Configuration page, post it
+    "link check": 2,
+    "persistence": 1,
+    "spreadsheet save": 0,
+    "log download": 1,
+}
+
+
+class TestRequestBudgets(TestCase):
+    """One run of each benchmark operation against the mock collector, checking only its request count.
+
+    Operations that need Chrome are reported as skipped when it can not be started."""
+
+    @classmethod
+    def setUpClass(cls) -> None:
+        cls.collector = MockCollector(CollectorConfig(sensor_count=3, test_voltage="low")).start()
+        cls.context = benchmark.BenchmarkContext(cls.collector)
+
+    @classmethod
+    def tearDownClass(cls) -> None:
+        cls.context.close()
+        cls.collector.stop()
+
+    def _check(self, name: str):
+        try:
+            measurement = benchmark.measure(self.context, name, 1)
+        except benchmark.Skip as e:
+            self.skipTest(f"{name}: {e}")
+
+        self.assertEqual(_REQUEST_BUDGETS[name], measurement.requests)
+
+    def test_every_operation_has_a_budget(self):
+        self.assertEqual(sorted(benchmark.OPERATIONS), sorted(_REQUEST_BUDGETS))
+
+    def test_readings(self):
+        self._check("readings")
+
+    def test_serial_number_configuration(self):
+        self._check("serial number configuration")
+
+    def test_advanced_configuration(self):
+        self._check("advanced configuration")
+
+    def test_phase_angle_configuration(self):
+        self._check("phase angle configuration")
+
+    def test_link_check(self):
+        self._check("link check")
+
+    def test_persistence(self):
+        self._check("persistence")
+
+    def test_spreadsheet_save(self):
+        self._check("spreadsheet save")
+
+    def test_log_download(self):
+        self._check("log download")
+
+
+class TestBenchmark(TestCase):
+    def test_regressions(self):
+        baseline = {"readings": {"name": "readings", "runs": 10, "p50": 0.010, "p95": 0.012, "requests": 2}}
+        self.assertEqual([], benchmark.compare(
+            {"readings": benchmark.Measurement("readings", 10, 0.012, 0.015, 2)}, baseline, 0.25
+        ))
+        self.assertEqual(2, len(benchmark.compare(
+            {"readings": benchmark.Measurement("readings", 10, 0.013, 0.015, 3)}, baseline, 0.25
+        )))
+        self.assertEqual([], benchmark.compare({"readings": None}, baseline, 0.25))
@@ -0,0 +1,102 @@
+from unittest import TestCase
+from unittest.mock import patch
+
+from LWTest.collector.configure import raw
+from LWTest.collector.configure.serial import SerialNumberForm
+from LWTest.collector.session import CollectorURLs
+from LWTest.web.interface import authentication, form
+from LWTest.web.interface.authentication import Credentials
+from tests.mock.collector import CollectorConfig, MockCollector
+
+_SERIAL_NUMBERS = ("1234567", "1234568", "1234569", "0", "0", "0")
+
+
+class TestSerialNumberForm(TestCase):
+    def setUp(self) -> None:
+        self.collector = MockCollector(CollectorConfig(sensor_count=6)).start()
+        self.urls = CollectorURLs.for_host(self.collector.base_url)
+
+    def tearDown(self) -> None:
+        self.collector.stop()
+
+    def test_configures_with_one_post(self):
+        self.collector.state.advanced["correctionAngle"][0] = "25.8"
+
+        SerialNumberForm(_SERIAL_NUMBERS, "secret", self.urls.configuration).configure()
+
+        posted = self.collector.state.forms["configuration"]
+        self.assertEqual(list(_SERIAL_NUMBERS), [posted[f"serial_num_{phase}"] for phase in "ABCDEF"])
+        self.assertEqual(("60", "secret"), (posted["frequency"], posted["password"]))
+        self.assertNotIn("singlephase", posted)
+        # the fields LWTest does not set go back as they were
+        self.assertEqual("25.8", posted["correction_angle_A"])
+        self.assertEqual(1, self.collector.request_count("configuration", "POST"))
+
+    def test_logs_in_when_asked(self):
+        self.collector.state.config.require_login = True
+        with patch.object(authentication, "credentials", lambda: Credentials("admin", "admin password")):
+            SerialNumberForm(_SERIAL_NUMBERS, "secret", self.urls.configuration).configure()
+
+        self.assertEqual("admin", self.collector.state.forms["login"]["username"])
+
+    def test_unsaved_serial_numbers_raise(self):
+        configurator = SerialNumberForm(_SERIAL_NUMBERS, "secret", self.urls.configuration)
+        with patch.object(self.collector.state, "configure"), patch.object(configurator, "SAVE_TIMEOUT", 0.2):
+            self.assertRaises(form.FormError, configurator.configure)
+
+    def test_unexpected_form_raises(self):
+        configurator = SerialNumberForm(_SERIAL_NUMBERS[:3], "secret", self.urls.configuration)
+        self.assertRaises(form.FormError, configurator.configure)
+        self.assertEqual(0, self.collector.request_count("configuration", "POST"))
+
+    def test_unreachable_collector(self):
+        configurator = SerialNumberForm(_SERIAL_NUMBERS, "secret", "http://127.0.0.1:9/configuration")
+        self.assertRaises(form.FormError, configurator.configure)
+
+
+class TestForm(TestCase):
+    def test_parse(self):
+        page = """<form method="post" action="save"><input name="a" value="1"><input type="checkbox" name="b">
+                  <input type="checkbox" name="c" value="x" checked><select name="d"><option value="1">1</option>
+                  <option value="2" selected>2</option></select><input type="password" name="pw">
+                  <input type="submit" name="go" value="Save"></form>"""
+        parsed = form.Form.parse(page, "http://collector/index.php/main/configuration")
+
+        self.assertEqual("http://collector/index.php/main/save", parsed.action)
+        self.assertEqual({"a": "1", "c": "x", "d": "2", "pw": ""}, parsed.fields)
+        self.assertEqual("pw", parsed.password_field)
+        self.assertEqual(("go", "Save"), parsed.data[-1])
+
+
+class TestUpdateAdvancedConfiguration(TestCase):
+    def setUp(self) -> None:
+        self.collector = MockCollector(CollectorConfig(sensor_count=3)).start()
+        self.urls = CollectorURLs.for_host(self.collector.base_url)
+
+    def tearDown(self) -> None:
+        self.collector.stop()
+
+    def _update(self):
+        return raw.update_advanced_configuration("secret", self.urls.temperature, self.urls.raw_configuration,
+                                                 self.urls.voltage_ride_through)
+
+    def test_configured_collector_is_left_alone(self):
+        self.assertEqual(0, self._update())
+        self.assertEqual(0, self.collector.request_count(method="POST"))
+
+    def test_only_pages_with_changes_are_submitted(self):
+        state = self.collector.state
+        state.advanced["fault10k"][1] = "0.7"
+        state.advanced["correctionAngle"][2] = "0"  # the same number as "0.0"
+        state.calibration_factor = "1.0"
+
+        self.assertEqual(2, self._update())
+
+        self.assertEqual(0, self.collector.request_count("temperaturescale", "POST"))
+        self.assertEqual("0.65019", state.advanced["fault10k"][1])
+        self.assertEqual("0.0305327", state.calibration_factor)
+        self.assertEqual("secret", state.forms["voltageridethrough"]["password"])
+        # a submitted page is read back until it shows the new values
+        self.assertEqual(2, self.collector.request_count("rawconfig", "GET"))
+        self.assertEqual(1, self.collector.request_count("temperaturescale", "GET"))
+        self.assertEqual(0, self._update())
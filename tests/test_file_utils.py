@@ -0,0 +1,97 @@
+import io
+import shutil
+import tempfile
+import zipfile
+from pathlib import Path
+from unittest import TestCase
+from unittest.mock import patch
+
+import requests
+
+from LWTest.utilities import file_utils
+
+
+def _zip_bytes() -> bytes:
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w") as archive:
+        archive.writestr("watchdog.log", "x" * 200_000)
+    return buffer.getvalue()
+
+
+class _Response:
+    def __init__(self, status_code, body: bytes, drop_after=None):
+        self.status_code = status_code
+        self.headers = {"Content-Length": str(len(body))}
+        self._body = body
+        self._drop_after = drop_after
+
+    def iter_content(self, chunk_size):
+        for start in range(0, len(self._body), chunk_size):
+            if self._drop_after is not None and start >= self._drop_after:
+                raise requests.exceptions.ConnectionError("connection dropped")
+            yield self._body[start:start + chunk_size]
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise requests.exceptions.HTTPError(str(self.status_code))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *_):
+        return False
+
+
+class TestDownloadLogFiles(TestCase):
+    def setUp(self) -> None:
+        self.directory = tempfile.mkdtemp()
+        self.path = Path(self.directory) / "logfiles-SN9800001.zip"
+        self.body = _zip_bytes()
+        self.requested_ranges = []
+
+    def tearDown(self) -> None:
+        shutil.rmtree(self.directory)
+
+    def _get(self, responses):
+        def get(_url, headers=None, **_):
+            range_ = (headers or {}).get("Range")
+            self.requested_ranges.append(range_)
+            return responses.pop(0)(range_)
+        return get
+
+    def test_resumes_after_a_drop(self):
+        responses = [
+            lambda _: _Response(200, self.body, drop_after=file_utils._CHUNK_SIZE),
+            lambda range_: _Response(206, self.body[int(range_[6:-1]):]),
+        ]
+        reports = []
+        with patch.object(file_utils.sessionpool, "get", self._get(responses)), \
+                patch.object(file_utils.time, "sleep") as sleep:
+            result = file_utils.download_log_files(self.path, reports.append)
+
+        self.assertTrue(result.success)
+        self.assertEqual(self.body, self.path.read_bytes())
+        self.assertEqual([None, f"bytes={file_utils._CHUNK_SIZE}-"], self.requested_ranges)
+        self.assertEqual(len(self.body), reports[-1].bytes_received)
+        self.assertFalse(self.path.with_name(self.path.name + ".part").exists())
+        sleep.assert_called_once_with(file_utils._RETRY_BACKOFF)
+
+    def test_backs_off_between_attempts(self):
+        def drop(_):
+            raise requests.exceptions.ConnectionError("connection refused")
+
+        with patch.object(file_utils.sessionpool, "get", self._get([drop] * file_utils._DOWNLOAD_ATTEMPTS)), \
+                patch.object(file_utils.time, "sleep") as sleep:
+            result = file_utils.download_log_files(self.path)
+
+        self.assertFalse(result.success)
+        self.assertEqual([file_utils._RETRY_BACKOFF, file_utils._RETRY_BACKOFF * 2],
+                         [call.args[0] for call in sleep.call_args_list])
+
+    def test_rejects_a_corrupt_zip(self):
+        responses = [lambda _: _Response(200, b"not a zip file")]
+        with patch.object(file_utils.sessionpool, "get", self._get(responses)):
+            result = file_utils.download_log_files(self.path)
+
+        self.assertFalse(result.success)
+        self.assertFalse(self.path.exists())
@@ -0,0 +1,67 @@
+from unittest import TestCase
+
+from selenium.webdriver.common.by import By
+
+import LWTest.web.interface.httpdriver as httpdriver
+from LWTest.collector.common.constants import ADVANCED_CONFIG_SELECTOR, READING_SELECTOR
+
+_SENSOR_DATA_PAGE = """
+<html><body><h3>Auto Update</h3>
+<div id="data">
+    <div class="trow"><div class="tcellShort">7,200.1</div><div class="tcellShort">7,199.8</div></div>
+    <div class="trow"><div class="tcellShort"><span>60</span>.01</div><div class="tcellShort" id="last_1">12s</div></div>
+</div>
+<form>
+    <div class="tcell"><input type="number" name="scaleCurrentA" value="0.02525"></div>
+    <div class="tcell"><input type='number' name='scaleCurrentB' value=0.02526 /></div>
+    <div class="tcell"><span><input type="number" name="nested" value="1"></span></div>
+</form>
+</body></html>
+"""
+
+
+class TestCSSSelector(TestCase):
+    def setUp(self) -> None:
+        self.document = httpdriver.parse_html(_SENSOR_DATA_PAGE)
+
+    def test_reading_selector(self):
+        elements = httpdriver.select(self.document, READING_SELECTOR)
+        self.assertEqual(["7,200.1", "7,199.8", "60.01"], [e.get_attribute("textContent") for e in elements])
+
+    def test_advanced_config_selector(self):
+        elements = httpdriver.select(self.document, ADVANCED_CONFIG_SELECTOR)
+        self.assertEqual(["0.02525", "0.02526"], [e.get_attribute("value") for e in elements])
+
+    def test_attribute_prefix_selector(self):
+        elements = httpdriver.select(self.document, "input[type='number'][name^='scaleCurrent']")
+        self.assertEqual(["scaleCurrentA", "scaleCurrentB"], [e.get_attribute("name") for e in elements])
+
+    def test_descendant_selector(self):
+        self.assertEqual(3, len(httpdriver.select(self.document, "form input")))
+
+    def test_unsupported_selector(self):
+        self.assertRaises(ValueError, httpdriver.CSSSelector, "div:first-child")
+
+
+class _Browser:
+    """Stands in for webdriver.Chrome, answering every locator with the url it has loaded."""
+    def __init__(self):
+        self.current_url = ""
+
+    def get(self, url: str) -> None:
+        self.current_url = url
+
+    def find_elements(self, by: str, value: str) -> list:
+        return [(self.current_url, by, value)]
+
+
+class TestHTTPDriver(TestCase):
+    def test_other_locators_fall_back_to_the_browser(self):
+        browser = _Browser()
+        driver = httpdriver.HTTPDriver(fallback=lambda: browser)
+        driver.current_url = "http://collector/sensordata"
+
+        self.assertEqual([("http://collector/sensordata", By.XPATH, "//h3")], driver.find_elements(By.XPATH, "//h3"))
+
+    def test_other_locators_without_a_browser(self):
+        self.assertRaises(NotImplementedError, httpdriver.HTTPDriver().find_elements, By.XPATH, "//h3")
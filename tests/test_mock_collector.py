@@ -0,0 +1,93 @@
+import time
+from unittest import TestCase
+
+import requests
+
+from LWTest.collector.common.constants import ReadingType
+from LWTest.collector.read.electric import DataReader
+from LWTest.collector.read.operational import FirmwareVersionReader
+from LWTest.collector.read.persistence import PersistenceComparator
+from LWTest.collector.session import CollectorURLs
+from LWTest.web.interface.httpdriver import HTTPDriver
+from LWTest.workers import link
+from tests.mock.collector import CollectorConfig, MockCollector
+
+
+class TestMockCollector(TestCase):
+    def setUp(self) -> None:
+        self.collector = MockCollector(CollectorConfig(sensor_count=3, test_voltage="low")).start()
+        self.urls = CollectorURLs.for_host(self.collector.base_url)
+        self.driver = HTTPDriver()
+
+    def tearDown(self) -> None:
+        self.driver.quit()
+        self.collector.stop()
+
+    def test_low_voltage_readings(self):
+        received = {}
+        reader = DataReader(self.urls.sensor_data, self.urls.raw_configuration)
+        # noinspection PyUnresolvedReferences
+        reader.readings.connect(lambda values, kind: received.update({kind: values}))
+        reader.read(self.driver)
+
+        self.assertEqual(("7200.0",) * 3, received[ReadingType.LOW_VOLTAGE])
+        self.assertEqual(("431600",) * 3, received[ReadingType.LOW_REAL_POWER])
+        self.assertEqual(("0.0",) * 3, received[ReadingType.CORRECTION_ANGLE])
+        self.assertEqual(("28.5",) * 3, received[ReadingType.TEMPERATURE])
+
+    def test_persistence(self):
+        results = []
+        comparator = PersistenceComparator()
+        # noinspection PyUnresolvedReferences
+        comparator.persisted.connect(lambda values, _: results.append(values))
+        saved = (("0.02525", "1.50000", "0.0"), ("0.02525", "1.50000", "0.0"), ("0.02525", "1.50000", "1.0"))
+        comparator.compare(saved, self.urls.raw_configuration, self.driver)
+
+        self.assertEqual([("Pass", "Pass", "Fail")], results)
+
+    def test_firmware_version(self):
+        versions = []
+        reader = FirmwareVersionReader(self.urls.software_upgrade)
+        # noinspection PyUnresolvedReferences
+        reader.update.connect(lambda phase, version: versions.append((phase, version)))
+        reader.read(2, self.driver)
+
+        self.assertEqual([(2, self.collector.state.config.firmware_version)], versions)
+
+    def test_sensors_link_after_configuration(self):
+        self.collector.state.config.link_delay = 0.2
+        serial_numbers = ("1234567", "1234568", "1234569")
+        form = {f"serial_num_{letter}": serial for letter, serial in zip("ABC", serial_numbers)}
+        requests.post(self.urls.configuration, data=form, timeout=5)
+
+        polls = []
+        poller = link.ModemStatusPoller(self.urls.modem_status)
+        # noinspection PyUnresolvedReferences
+        poller.polled.connect(polls.append)
+        poller.poll(serial_numbers)
+        time.sleep(0.3)
+        poller.poll(serial_numbers)
+
+        self.assertEqual({serial: "NA" for serial in serial_numbers}, polls[0])
+        self.assertEqual({"1234567": "-45", "1234568": "-46", "1234569": "-47"}, polls[1])
+        self.assertEqual(2, self.collector.request_count("modemstatus"))
+
+    def test_upgrade_log_ranges(self):
+        self.collector.state.config.upgrade_line_interval = 0.0
+        requests.post(self.urls.software_upgrade, data={"unit": "9800001"}, timeout=5)
+        time.sleep(0.2)
+
+        log = requests.get(self.urls.upgrade_log, timeout=5).content
+        self.assertTrue(log.rstrip().endswith(b"Program Checksum is 0x3d07"))
+
+        tail = requests.get(self.urls.upgrade_log, headers={"Range": "bytes=10-"}, timeout=5)
+        self.assertEqual(206, tail.status_code)
+        self.assertEqual(log[10:], tail.content)
+
+    def test_login_required(self):
+        self.collector.state.config.require_login = True
+        self.assertTrue(requests.get(self.urls.sensor_data, timeout=5).url.endswith("/login"))
+
+        with requests.Session() as session:
+            session.post(f"{self.collector.base_url}/login", data={"username": "user", "password": "pw"}, timeout=5)
+            self.assertIn("Auto Update", session.get(self.urls.sensor_data, timeout=5).text)
@@ -1,9 +1,8 @@
-from collections import namedtuple
 from unittest import TestCase
 
-import LWTest.collector.read.operational as collector_read
+import LWTest.collector.common.helpers as helpers
 
-from LWTest.collector.read.operational import DataReader
+from LWTest.collector.read.electric import DataReader
 
 
 class Element:
@@ -19,17 +18,8 @@ class TestDataReader(TestCase):
         self.data_reader = DataReader("", "")
 
     def test__scrape_readings(self):
-        class TextContentElement(Element):
-            """contents are retrieved using element.get_attribute('textContent')"""
-            pass
-
-        elements = [
-            TextContentElement("Charles"),
-            TextContentElement("Domenic"),
-            TextContentElement("Cognato"),
-            TextContentElement("Jr.")
-        ]
-        content = self.data_reader._scrape_readings(elements, "textContent", 0, len(elements))
+        values = ["Charles", "Domenic", "Cognato", "Jr."]
+        content = self.data_reader._scrape_readings(values, 0, len(values))
         self.assertEqual(["Charles", "Domenic", "Cognato", "Jr."], content, "Not equal")
 
     def test__massage_real_power_readings(self):
@@ -38,16 +28,12 @@ class TestDataReader(TestCase):
         self.assertEqual(["1490400", "1491500", "1489300"], massaged_readings, "Not equal")
 
     def test__extract_advanced_readings(self):
-        class ValueElement(Element):
-            """values are retrieved using element.get_attribute('value')"""
-            pass
-
         readings = [
-            ValueElement("0.02525"), ValueElement("0.02526"), ValueElement("0.02527"),
-            ValueElement("1.50000"), ValueElement("1.51010"), ValueElement("1.52020"),
-            ValueElement("Filler"), ValueElement("Filler"), ValueElement("Filler"),
-            ValueElement("Filler"), ValueElement("Filler"), ValueElement("Filler"),
-            ValueElement("0.0"), ValueElement("1.1"), ValueElement("2.2")
+            "0.02525", "0.02526", "0.02527",
+            "1.50000", "1.51010", "1.52020",
+            "Filler", "Filler", "Filler",
+            "Filler", "Filler", "Filler",
+            "0.0", "1.1", "2.2"
         ]
 
         expected = [
@@ -59,14 +45,23 @@ class TestDataReader(TestCase):
 
 
 class TestStandAloneFunctions(TestCase):
-    Driver = namedtuple("Driver", "page_source")
-
-    def setUp(self) -> None:
-        self.driver_6_column = self.Driver(page_source="Phase 4")
-        self.driver_3_column = self.Driver(page_source="No Phase info here.")
-
-    def test__get_columns_is_6(self):
-        self.assertEqual(6, collector_read._get_columns(self.driver_6_column))
-
-    def test__get_columns_is_3(self):
-        self.assertEqual(3, collector_read._get_columns(self.driver_3_column))
+    def test_get_attribute_values_uses_one_script_call(self):
+        class ScriptDriver:
+            def __init__(self):
+                self.calls = []
+
+            def execute_script(self, script, *args):
+                self.calls.append(args)
+                return ["1", "2", "3"]
+
+        driver = ScriptDriver()
+        self.assertEqual(["1", "2", "3"], helpers.get_attribute_values("div.tcellShort", "textContent", driver))
+        self.assertEqual([("div.tcellShort", "textContent")], driver.calls)
+
+    def test_get_attribute_values_without_script_support(self):
+        class ParsedDriver:
+            @staticmethod
+            def find_elements_by_css_selector(_):
+                return [Element("0.02525"), Element("1.50000")]
+
+        self.assertEqual(["0.02525", "1.50000"], helpers.get_attribute_values("input", "value", ParsedDriver()))
@@ -1,6 +1,7 @@
 from unittest import TestCase
 
 import LWTest.sensor as sensor
+from LWTest.collector.common.constants import ReadingType
 
 
 class TestSensorLogGetSensorByPhase(TestCase):
@@ -22,3 +23,60 @@ class TestSensorLogGetSensorByPhase(TestCase):
     def test_get_sensor_by_phase__raise_assertion_error(self):
         phase = 7
         self.assertRaises(AssertionError, self.sensor_log.get_sensor_by_phase, phase)
+
+
+class TestSensorLogChanges(TestCase):
+    def setUp(self) -> None:
+        self.sensor_log = sensor.SensorLog()
+        self.sensor_log.create_all(("9800001", "9800002"))
+        self.notifications = []
+        self.sensor_log.sensors_changed.connect(self.notifications.append)
+
+    def test_save_announces_the_change(self):
+        self.sensor_log.save("-50", ReadingType.RSSI, "9800001")
+        self.assertEqual([(sensor.SensorChange("9800001", "rssi", "NA", "-50"),)], self.notifications)
+
+    def test_transaction_coalesces_changes(self):
+        with self.sensor_log.transaction():
+            self.sensor_log.save("-50", ReadingType.RSSI, "9800001")
+            self.sensor_log.save("-45", ReadingType.RSSI, "9800001")
+            self.sensor_log.save("-60", ReadingType.RSSI, "9800002")
+            self.assertEqual([], self.notifications)
+
+        self.assertEqual([(sensor.SensorChange("9800001", "rssi", "NA", "-45"),
+                           sensor.SensorChange("9800002", "rssi", "NA", "-60"))], self.notifications)
+
+    def test_unchanged_values_are_not_announced(self):
+        with self.sensor_log.transaction():
+            self.sensor_log.save("-50", ReadingType.RSSI, "9800001")
+            self.sensor_log.save("NA", ReadingType.RSSI, "9800001")
+
+        self.sensor_log.save("NA", ReadingType.RSSI, "9800002")
+        self.assertEqual([], self.notifications)
+
+
+class TestSensor(TestCase):
+    def setUp(self) -> None:
+        self.unit = sensor.Sensor(0, "9800001")
+
+    def test_numeric_reading_is_parsed_once_set(self):
+        self.unit.high_voltage = "7,200.1"
+        self.assertEqual("7,200.1", self.unit.high_voltage)
+        self.assertEqual(7200.1, self.unit.value("high_voltage"))
+
+    def test_unparsable_reading_is_missing(self):
+        self.assertIs(sensor.MISSING, self.unit.value("rssi"))
+        self.unit.temperature = "---"
+        self.assertIs(sensor.MISSING, self.unit.parsed("temperature"))
+
+    def test_text_reading_is_not_parsed(self):
+        self.unit.firmware_version = "0x75"
+        self.assertEqual("0x75", self.unit.parsed("firmware_version"))
+
+    def test_linked(self):
+        self.assertFalse(self.unit.linked)
+        self.unit.rssi = "-50"
+        self.assertTrue(self.unit.linked)
+
+    def test_slotted(self):
+        self.assertRaises(AttributeError, setattr, self.unit, "unknown", "NA")
@@ -0,0 +1,44 @@
+import threading
+from unittest import TestCase
+
+from LWTest.collector.session import CollectorSession, CollectorURLs, SessionScheduler
+
+
+class TestCollectorURLs(TestCase):
+    def test_for_host(self):
+        urls = CollectorURLs.for_host("192.168.3.1")
+        self.assertEqual("http://192.168.3.1/index.php/main/sensordata", urls.sensor_data)
+        self.assertEqual("http://192.168.3.1/downloadLogs.php", urls.log_files)
+
+    def test_for_host_keeps_scheme_and_port(self):
+        urls = CollectorURLs.for_host("http://localhost:6970/")
+        self.assertEqual("http://localhost:6970/index.php/main/modem_status", urls.modem_status)
+
+
+class TestSessionScheduler(TestCase):
+    def setUp(self) -> None:
+        self.sessions = [CollectorSession(name, CollectorURLs.for_host(f"192.168.{index}.1"))
+                         for index, name in enumerate(("bench 1", "bench 2", "bench 3"))]
+
+    def tearDown(self) -> None:
+        for session in self.sessions:
+            session.close()
+
+    def test_sessions_run_in_parallel(self):
+        # every job waits for the others, so this only finishes if they all run at once
+        barrier = threading.Barrier(len(self.sessions), timeout=5)
+        results = SessionScheduler().run(self.sessions, lambda session: (barrier.wait(), session.urls.date_time)[1])
+        self.assertEqual("http://192.168.1.1/index.php/upgrade/date_and_time", results["bench 2"])
+
+    def test_failed_session_does_not_stop_the_others(self):
+        def job(session):
+            if session.name == "bench 1":
+                raise RuntimeError("collector unreachable")
+            return True
+
+        self.assertEqual({"bench 1": None, "bench 2": True, "bench 3": True},
+                         SessionScheduler().run(self.sessions, job))
+
+    def test_duplicate_names_are_rejected(self):
+        self.sessions.append(CollectorSession("bench 2", CollectorURLs.for_host("192.168.4.1")))
+        self.assertRaises(ValueError, SessionScheduler().run, self.sessions, lambda session: True)
@@ -0,0 +1,30 @@
+from unittest import TestCase
+
+from LWTest.web.interface.sessionpool import SessionPool
+from tests.mock.collector import MockCollector
+
+
+class TestSessionPool(TestCase):
+    def setUp(self) -> None:
+        self.collector = MockCollector().start()
+        self.pool = SessionPool()
+
+    def tearDown(self) -> None:
+        self.pool.close()
+        self.collector.stop()
+
+    def test_one_session_per_host(self):
+        url = f"{self.collector.base_url}/modemstatus"
+        self.assertIs(self.pool.session(url), self.pool.session(f"{self.collector.base_url}/sensordata"))
+        self.assertIsNot(self.pool.session(url), self.pool.session("http://192.168.3.1/index.php/main/test"))
+
+    def test_connections_are_reused(self):
+        url = f"{self.collector.base_url}/modemstatus"
+        ports = set()
+        for _ in range(3):
+            response = self.pool.get(url, stream=True)
+            ports.add(response.raw.connection.sock.getsockname()[1])
+            response.content  # noqa -- reading the body returns the connection to the pool
+
+        self.assertEqual(1, len(ports))
+        self.assertEqual(3, self.collector.request_count("modemstatus"))
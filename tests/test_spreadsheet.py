@@ -0,0 +1,85 @@
+import datetime
+import shutil
+import tempfile
+import zipfile
+from pathlib import Path
+from unittest import TestCase
+
+import openpyxl
+
+from LWTest.spreadsheet import constants, spreadsheet, xmlpatch
+
+_MASTER = Path(__file__).parent.parent / "LWTest/resources/testrecord/ATR-PRD Master.xlsm"
+
+
+class TestXMLTestRecord(TestCase):
+    def setUp(self) -> None:
+        self.directory = tempfile.mkdtemp()
+        self.path = str(Path(self.directory) / "ATR-PRD#-SN9800001.xlsm")
+        shutil.copy(_MASTER, self.path)
+
+    def tearDown(self) -> None:
+        shutil.rmtree(self.directory)
+
+    def _save(self):
+        data_sets = [list(zip(constants.phases_cells[0], ["13,800.10", "120.01", "0.9999", "1490400"] + ["NA"] * 14))]
+        references = ("21.7", ("13800", "120.0", "1.0", "1490000"), ("7200", "60.0", "1.0", "388000"))
+        with spreadsheet.XMLTestRecord(self.path) as record:
+            record.enter_serial_numbers(("9800001",))
+            record.save_test_results(data_sets, references)
+            record.record_log_files_attached()
+
+    def test_values_are_written(self):
+        self._save()
+
+        worksheet = openpyxl.load_workbook(self.path, keep_vba=True)[constants.WORKSHEET_NAME]
+        self.assertEqual(9800001, worksheet["D4"].value)
+        self.assertEqual(13800.1, worksheet["E22"].value)
+        self.assertEqual(1490400, worksheet["E25"].value)
+        self.assertEqual(13800.0, worksheet["D22"].value)
+        self.assertEqual("Yes", worksheet["C45"].value)
+        self.assertEqual(datetime.date.today(), worksheet[constants.test_date].value.date())
+        self.assertTrue(worksheet.protection.sheet)
+        self.assertEqual("CA9C", worksheet.protection.password)
+
+    def test_other_members_are_untouched(self):
+        with zipfile.ZipFile(_MASTER) as before:
+            original = {name: before.read(name) for name in before.namelist()}
+
+        self._save()
+
+        with zipfile.ZipFile(self.path) as after:
+            self.assertEqual(list(original), after.namelist())
+            changed = [name for name in original if after.read(name) != original[name]]
+        self.assertEqual(["xl/workbook.xml", "xl/worksheets/sheet2.xml"], changed)
+
+    def test_formulas_are_recalculated_on_load(self):
+        with zipfile.ZipFile(_MASTER) as before:
+            self.assertIn("<v>Untested</v>", before.read("xl/worksheets/sheet2.xml").decode("utf-8"))
+
+        self._save()
+
+        with zipfile.ZipFile(self.path) as after:
+            workbook = after.read("xl/workbook.xml").decode("utf-8")
+        self.assertIn('<calcPr calcId="144525" fullCalcOnLoad="1"/>', workbook)
+
+    def test_calc_pr_is_added_when_missing(self):
+        xml = '<workbook><sheets><sheet name="a"/></sheets><definedNames/></workbook>'
+        self.assertEqual(
+            '<workbook><sheets><sheet name="a"/></sheets><definedNames/><calcPr fullCalcOnLoad="1"/></workbook>',
+            xmlpatch.force_full_calculation(xml)
+        )
+
+    def test_missing_workbook_raises(self):
+        with self.assertRaises(FileNotFoundError):
+            spreadsheet.get_serial_numbers(str(Path(self.directory) / "missing.xlsm"))
+
+    def test_cells_are_kept_in_order(self):
+        xml = '<worksheet><sheetData><row r="2"><c r="B2" s="3"/><c r="D2"><v>1</v></c></row></sheetData></worksheet>'
+        patched = xmlpatch.patch_sheet_xml(xml, {"C2": "x", "A1": 1.5, "D2": None})
+        self.assertEqual(
+            '<worksheet><sheetData><row r="1"><c r="A1"><v>1.5</v></c></row>'
+            '<row r="2"><c r="B2" s="3"/><c r="C2" t="inlineStr"><is><t xml:space="preserve">x</t></is></c>'
+            '<c r="D2"/></row></sheetData></worksheet>',
+            patched
+        )
@@ -0,0 +1,74 @@
+from unittest import TestCase
+
+from PyQt6.QtCore import Qt
+
+import LWTest.sensor as sensor
+from LWTest.sensor import MISSING
+from LWTest.collector.common.constants import ReadingType
+from LWTest.constants.lwt_constants.sensor_table_columns import TableColumn as tc
+from LWTest.gui.main_window.tablemodelview import SensorTableModel, ValidationEngine
+
+
+class TestSensorTableModel(TestCase):
+    def setUp(self) -> None:
+        self.sensor_log = sensor.SensorLog()
+        self.sensor_log.create_all(("9800001", "9800002", "9800003"))
+        self.model = SensorTableModel(self.sensor_log, rows=6)
+        self.changed = []
+        self.model.dataChanged.connect(lambda top_left, _, __: self.changed.append((top_left.row(),
+                                                                                   top_left.column())))
+
+    def test_sensor_change_announces_only_its_cell(self):
+        self.sensor_log.save("-50", ReadingType.RSSI, "9800002")
+        self.assertEqual([(1, tc.RSSI.value)], self.changed)
+        self.assertEqual("-50", self.model.index(1, tc.RSSI.value).data())
+
+    def test_refresh_without_changes_is_silent(self):
+        self.model.refresh()
+        self.assertEqual([], self.changed)
+
+    def test_rows_without_a_sensor(self):
+        self.assertEqual(6, self.model.rowCount())
+        self.assertEqual("", self.model.index(4, tc.SERIAL_NUMBER.value).data())
+        self.assertEqual("---", self.model.index(4, tc.RSSI.value).data())
+
+    def test_out_of_tolerance_reading_is_highlighted(self):
+        self.sensor_log.save("-90", ReadingType.RSSI, "9800001")
+        self.assertIsNotNone(self.model.index(0, tc.RSSI.value).data(Qt.ItemDataRole.BackgroundRole))
+
+    def test_temperature_reference_re_evaluates_only_the_temperature_column(self):
+        with self.sensor_log.transaction():
+            self.sensor_log.save("-50", ReadingType.RSSI, "9800001")
+            self.sensor_log.save("40.0", ReadingType.TEMPERATURE, "9800001")
+        self.changed.clear()
+
+        self.sensor_log.room_temperature = 40.0
+        self.assertEqual([(0, tc.TEMPERATURE.value)], self.changed)
+
+    def test_reset_rows(self):
+        resets = []
+        self.model.modelReset.connect(lambda: resets.append(True))
+        self.sensor_log.create_all(("9800004",))
+
+        self.model.reset_rows(1)
+
+        self.assertEqual([True], resets)
+        self.assertEqual(1, self.model.rowCount())
+        self.assertEqual("9800004", self.model.index(0, tc.SERIAL_NUMBER.value).data())
+
+
+class TestValidationEngine(TestCase):
+    def setUp(self) -> None:
+        self.engine = ValidationEngine(21.7)
+
+    def test_validate_column(self):
+        self.assertEqual(["IN", "OUT", "NA"], self.engine.validate_column(tc.RSSI.value, [-50.0, -90.0, MISSING]))
+
+    def test_unchecked_column(self):
+        self.assertEqual(["NA", "NA"], self.engine.validate_column(tc.SERIAL_NUMBER.value, ["9800001", "9800002"]))
+
+    def test_temperature_limits_follow_the_reference(self):
+        self.assertEqual("OUT", self.engine.validate(tc.TEMPERATURE.value, 40.0))
+        self.assertTrue(self.engine.set_temperature_reference(40.0))
+        self.assertEqual("IN", self.engine.validate(tc.TEMPERATURE.value, 40.0))
+        self.assertFalse(self.engine.set_temperature_reference(40.0))
@@ -0,0 +1,92 @@
+from unittest import TestCase
+
+from LWTest.collector.configure.serial import SerialNumberForm
+from LWTest.collector.session import CollectorSession, CollectorURLs
+from LWTest.collector.state import topology
+from LWTest.web.interface.httpdriver import HTTPDriver, parse_html, select
+from tests.mock.collector import CollectorConfig, MockCollector
+
+
+def _header(*labels):
+    cells = "".join(f"<div class='tcell'>{label}</div>" for label in labels)
+    body = "<div class='trow'><div class='tcell'>Phase</div></div>"  # a cell outside the header
+    return f"<div class='thead'><div class='tlabel'></div>{cells}</div>{body}"
+
+
+class PageDriver:
+    def __init__(self, url, source):
+        self.current_url = url
+        self._document = parse_html(source)
+
+    def find_elements_by_css_selector(self, selector):
+        return select(self._document, selector)
+
+
+class ScriptDriver:
+    def __init__(self, url, headers):
+        self.current_url = url
+        self.headers = headers
+        self.calls = 0
+
+    def execute_script(self, _, selector):
+        self.calls += 1
+        assert selector == topology.PHASE_HEADER_SELECTOR
+        return self.headers
+
+
+class TestPhaseCount(TestCase):
+    URL = "http://collector/index.php/main/sensordata"
+
+    def tearDown(self) -> None:
+        topology.invalidate(self.URL)
+
+    def test_six_phases(self):
+        self.assertEqual(6, topology.phase_count(PageDriver(self.URL, _header(*(f"Phase {n}" for n in range(1, 7))))))
+
+    def test_three_phases(self):
+        self.assertEqual(3, topology.phase_count(PageDriver(self.URL, _header("Phase 1", "Phase 2", "Phase 3"))))
+
+    def test_only_header_cells_are_counted(self):
+        # "Phase 4" in the page text, not in a column header
+        source = _header("Phase 1", "Phase 2", "Phase 3") + "<p>Phase 4 offline</p>"
+        self.assertEqual(3, topology.phase_count(PageDriver(self.URL, source)))
+
+    def test_detected_once_per_collector(self):
+        driver = ScriptDriver(self.URL, 6)
+        self.assertEqual(6, topology.phase_count(driver))
+        self.assertEqual(6, topology.phase_count(PageDriver(self.URL + "?page=2", _header("Phase 1"))))
+        self.assertEqual(6, topology.phase_count(driver))
+        self.assertEqual(1, driver.calls)
+
+    def test_page_without_phases_is_not_cached(self):
+        self.assertEqual(3, topology.phase_count(PageDriver(self.URL, "")))
+        self.assertEqual(6, topology.phase_count(ScriptDriver(self.URL, 6)))
+
+    def test_new_session_invalidates(self):
+        self.assertEqual(6, topology.phase_count(ScriptDriver(self.URL, 6)))
+        CollectorSession("bench", CollectorURLs.for_host("http://collector"))
+        self.assertEqual(3, topology.phase_count(ScriptDriver(self.URL, 3)))
+
+
+class TestInvalidation(TestCase):
+    def setUp(self) -> None:
+        self.collector = MockCollector(CollectorConfig(sensor_count=3)).start()
+        self.urls = CollectorURLs.for_host(self.collector.base_url)
+        self.driver = HTTPDriver()
+
+    def tearDown(self) -> None:
+        topology.invalidate(self.urls.sensor_data)
+        self.collector.stop()
+
+    def test_serial_number_configuration_invalidates(self):
+        self.driver.get(self.urls.sensor_data)
+        self.assertEqual(3, topology.phase_count(self.driver))
+
+        self.collector.state.config.sensor_count = 6
+        self.driver.get(self.urls.sensor_data)
+        self.assertEqual(3, topology.phase_count(self.driver))
+
+        serial_numbers = ("1234567", "1234568", "1234569", "1234570", "1234571", "1234572")
+        SerialNumberForm(serial_numbers, "secret", self.urls.configuration).configure()
+        self.driver.get(self.urls.sensor_data)
+        self.assertEqual(6, topology.phase_count(self.driver))
@@ -0,0 +1,62 @@
+import json
+import tempfile
+import threading
+from pathlib import Path
+from unittest import TestCase
+
+from LWTest.utilities import trace
+
+
+class TestTrace(TestCase):
+    def setUp(self) -> None:
+        trace.reset()
+        trace.enable()
+
+    def tearDown(self) -> None:
+        trace.enable(False)
+        trace.reset()
+
+    def test_disabled_spans_are_not_recorded(self):
+        trace.enable(False)
+        with trace.span("page load", "http"):
+            pass
+        self.assertEqual([], trace.events())
+
+    def test_span_and_decorator(self):
+        @trace.traced("scrape", "dom")
+        def scrape():
+            return 42
+
+        with trace.span("page load", "http", url="http://collector"):
+            self.assertEqual(42, scrape())
+
+        scrape_event, page_event = trace.events()
+        self.assertEqual(("scrape", "dom", "X"), (scrape_event["name"], scrape_event["cat"], scrape_event["ph"]))
+        self.assertEqual({"url": "http://collector"}, page_event["args"])
+        self.assertGreaterEqual(page_event["dur"], scrape_event["dur"])
+
+    def test_sessions_get_their_own_process(self):
+        def bench():
+            with trace.session("bench 2"), trace.span("readings", "collector"):
+                pass
+
+        thread = threading.Thread(target=bench)
+        thread.start()
+        thread.join()
+        with trace.span("readings", "collector"):
+            pass
+
+        self.assertEqual(2, len({event["pid"] for event in trace.events()}))
+
+    def test_export(self):
+        with trace.span("spreadsheet save", "spreadsheet"):
+            pass
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = trace.save(Path(directory))
+            document = json.loads(path.read_text())
+
+        names = [event["name"] for event in document["traceEvents"]]
+        self.assertIn("process_name", names)
+        self.assertIn("spreadsheet save", names)
+        self.assertIn("spreadsheet save", trace.summary())
@@ -0,0 +1,124 @@
+from types import SimpleNamespace
+from unittest import TestCase
+from unittest.mock import patch
+
+import LWTest.workers.upgrade as upgrade
+from tests.mock.collector import CollectorConfig, MockCollector
+
+
+class _Server:
+    """Serves a growing log, honoring Range requests only when asked to."""
+
+    def __init__(self, supports_range: bool, reports_length: bool = True):
+        self.supports_range = supports_range
+        self.reports_length = reports_length
+        self.log = b""
+        self.requested_ranges = []
+
+    def get(self, _url, timeout=0, headers=None):
+        range_ = (headers or {}).get("Range")
+        self.requested_ranges.append(range_)
+        if range_ and self.supports_range:
+            start = int(range_[len("bytes="):-1])
+            if start >= len(self.log):
+                headers = {"Content-Range": f"bytes */{len(self.log)}"} if self.reports_length else {}
+                return SimpleNamespace(status_code=416, content=b"", headers=headers)
+            return SimpleNamespace(status_code=206, content=self.log[start:])
+
+        return SimpleNamespace(status_code=200, content=self.log)
+
+
+class TestLogTail(TestCase):
+    def _follow(self, server):
+        with patch.object(upgrade, "_get", server.get):
+            tail = upgrade.LogTail("url")
+            server.log = b"old session\nUpdating 9800001\nerasing"
+            first = tail.read_new_lines()
+            server.log += b" segment 1\ntransfer seg#1\n"
+            second = tail.read_new_lines()
+            third = tail.read_new_lines()
+        return first, second, third
+
+    def test_range_requests(self):
+        server = _Server(supports_range=True)
+        first, second, third = self._follow(server)
+
+        self.assertEqual(["old session", "Updating 9800001"], first)
+        self.assertEqual(["erasing segment 1", "transfer seg#1"], second)
+        self.assertEqual([], third)
+        self.assertEqual([None, "bytes=29-", "bytes=62-"], server.requested_ranges)
+
+    def test_falls_back_to_suffix_diff(self):
+        server = _Server(supports_range=False)
+        first, second, third = self._follow(server)
+
+        self.assertEqual(["old session", "Updating 9800001"], first)
+        self.assertEqual(["erasing segment 1", "transfer seg#1"], second)
+        self.assertEqual([], third)
+        self.assertEqual([None, "bytes=29-", None], server.requested_ranges)
+
+    def test_server_stops_honoring_range(self):
+        server = _Server(supports_range=True)
+        with patch.object(upgrade, "_get", server.get):
+            tail = upgrade.LogTail("url")
+            server.log = b"one\ntwo\n"
+            self.assertEqual(["one", "two"], tail.read_new_lines())
+            server.log += b"three\n"
+            self.assertEqual(["three"], tail.read_new_lines())
+            server.supports_range = False
+            server.log += b"four\n"
+            self.assertEqual(["four"], tail.read_new_lines())
+
+    def test_seek_to_end(self):
+        server = _Server(supports_range=True)
+        server.log = b"earlier session\n"
+        with patch.object(upgrade, "_get", server.get):
+            tail = upgrade.LogTail("url")
+            tail.seek_to_end()
+            server.log += b"Updating 9800001\n"
+            self.assertEqual(["Updating 9800001"], tail.read_new_lines())
+
+    def _truncate(self, server):
+        with patch.object(upgrade, "_get", server.get):
+            tail = upgrade.LogTail("url")
+            server.log = b"yesterday's session\nLast segment sent\n"
+            tail.read_new_lines()
+            server.log = b"Updating 9800001\n"
+            return tail.read_new_lines()
+
+    def test_truncated_log_is_read_from_start(self):
+        server = _Server(supports_range=True)
+        self.assertEqual(["Updating 9800001"], self._truncate(server))
+        self.assertEqual([None, "bytes=38-", None], server.requested_ranges)
+
+    def test_truncated_log_without_content_range(self):
+        server = _Server(supports_range=True, reports_length=False)
+        self.assertEqual(["Updating 9800001"], self._truncate(server))
+        self.assertEqual([None, "bytes=38-", None, None], server.requested_ranges)
+
+    def test_error_status(self):
+        with patch.object(upgrade, "_get", lambda *a, **k: SimpleNamespace(status_code=500)):
+            self.assertRaises(upgrade.LogTailError, upgrade.LogTail("url").read_new_lines)
+
+
+class TestUpgradeWorker(TestCase):
+    def setUp(self) -> None:
+        self.collector = MockCollector(CollectorConfig(sensor_count=3, upgrade_line_interval=0.01)).start()
+
+    def tearDown(self) -> None:
+        self.collector.stop()
+
+    def test_earlier_session_is_ignored(self):
+        # the sensor was upgraded earlier in the day and failed
+        with self.collector.state.lock:
+            self.collector.state.upgrade_log += b"Updating sensor 9800001\nFailed to enter program mode\n"
+        worker = upgrade.UpgradeWorker("9800001", self.collector.upgrade_log_url)
+        results = []
+        worker.signals.upgrade_successful.connect(lambda serial_number: results.append("success"))
+        worker.signals.upgrade_failed_to_enter_program_mode.connect(lambda: results.append("failure"))
+
+        worker.follow_log_from_end()
+        self.collector.state.start_upgrade("9800001")
+        worker.run()
+
+        self.assertEqual(["success"], results)
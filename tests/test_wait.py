@@ -0,0 +1,37 @@
+import time
+from unittest import TestCase
+
+from LWTest.collector.state import probes
+from LWTest.utilities.wait import WaitTimeout, wait_until
+from tests.mock.collector import CollectorConfig, MockCollector
+
+
+class TestWaitUntil(TestCase):
+    def test_returns_as_soon_as_the_condition_holds(self):
+        results = iter([None, 0, "ready"])
+        start = time.monotonic()
+        self.assertEqual("ready", wait_until(lambda: next(results), timeout=5, interval=0.01))
+        self.assertLess(time.monotonic() - start, 1)
+
+    def test_deadline(self):
+        self.assertRaises(WaitTimeout, wait_until, lambda: False, 0.05, 0.01)
+
+    def test_condition_is_tried_without_time_to_wait(self):
+        self.assertTrue(wait_until(lambda: True, 0))
+
+
+class TestProbes(TestCase):
+    def setUp(self) -> None:
+        self.collector = MockCollector(CollectorConfig(sensor_count=3)).start()
+
+    def tearDown(self) -> None:
+        self.collector.stop()
+
+    def test_values_persisted(self):
+        url = f"{self.collector.base_url}/rawconfig"
+        self.assertTrue(probes.values_persisted(url, {"scaleCurrentA": "0.025250"})())
+        self.assertFalse(probes.values_persisted(url, {"scaleCurrentA": "0.03"})())
+
+    def test_page_reachable(self):
+        self.assertTrue(probes.page_reachable(f"{self.collector.base_url}/rawconfig")())
+        self.assertFalse(probes.page_reachable("http://127.0.0.1:9/rawconfig", timeout=0.5)())